@@ -1,17 +1,51 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, make_response, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, make_response, send_from_directory, g, has_request_context, Response
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session as FlaskSQLAlchemySession
+from sqlalchemy import and_, bindparam, event, func, null, or_, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload, validates
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup, escape
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-from datetime import datetime, date
+from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
+from datetime import datetime, date, timedelta
 import os
 import smtplib
 import json
+import atexit
+import base64
+import time
+import logging
+import bisect
+import uuid
+import mimetypes
+import gzip
+import hashlib
+import hmac
+import csv
+import io
+import math
+import calendar
+import heapq
+import re
+import queue
+import threading
+import multiprocessing
+import shutil
+import sqlite3
 import requests
+from urllib.parse import quote
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 from functools import wraps
+from collections import OrderedDict, deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from itertools import chain, groupby
+from types import SimpleNamespace
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-change-this-in-production'
@@ -24,9 +58,140 @@ MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
+# Document Storage Configuration
+# 'local' keeps documents in UPLOAD_FOLDER; 's3' keeps them in an S3-compatible bucket shared by every app node
+app.config['DOCUMENT_STORAGE'] = os.environ.get('DOCUMENT_STORAGE', 'local')
+app.config['S3_BUCKET'] = os.environ.get('S3_BUCKET')
+app.config['S3_ENDPOINT_URL'] = os.environ.get('S3_ENDPOINT_URL')  # e.g. http://localhost:9000 for MinIO; unset for AWS
+app.config['S3_REGION'] = os.environ.get('S3_REGION', 'us-east-1')
+app.config['S3_KEY_PREFIX'] = os.environ.get('S3_KEY_PREFIX', 'documents/')
+app.config['S3_MULTIPART_CHUNK_SIZE'] = 8 * 1024 * 1024  # Bytes per part; larger uploads go up as multipart
+app.config['S3_PRESIGNED_URL_SECONDS'] = 300  # Lifetime of the direct view/download links
+
+# Audit Log Configuration
+app.config['AUDIT_FLUSH_INTERVAL'] = 1.0  # Seconds between background batch inserts
+app.config['AUDIT_BATCH_SIZE'] = 500  # Buffered entries that trigger an early flush
+app.config['AUDIT_BUFFER_LIMIT'] = 50000  # Beyond this, writers flush synchronously instead of growing the buffer
+AUDIT_REDACTED_FIELDS = {'password_hash', 'smtp_password', 'whatsapp_api_key'}
+app.config['AUDIT_PAGE_SIZE'] = 100
+AUDIT_EXCLUDED_TABLES = {'audit_log', 'data_version', 'idempotency_key'}  # Bookkeeping tables, not business data
+
+# Live Update Configuration
+# With several worker processes, set a Redis URL (e.g. redis://localhost:6379/0) so every process sees every event
+app.config['LIVE_EVENTS_BROKER_URL'] = os.environ.get('LIVE_EVENTS_BROKER_URL')
+LIVE_EVENTS_CHANNEL = 'society:live-events'
+LIVE_EVENTS_KEEPALIVE_SECONDS = 15  # Comment lines sent on idle streams so proxies keep them open
+LIVE_EVENTS_REPLAY_SIZE = 500  # Recent events per topic replayed to clients reconnecting with Last-Event-ID
+LIVE_EVENTS_QUEUE_SIZE = 1000  # Events buffered per stream before a slow client is told to reload
+LIVE_EVENTS_START = 'start'  # Resume position of a page rendered before its topic's first event
+
+# Archive Configuration
+ARCHIVE_FOLDER = 'archives'  # Compressed cold storage for closed years; back this directory up
+app.config['ARCHIVE_FOLDER'] = ARCHIVE_FOLDER
+app.config['ARCHIVE_BATCH_SIZE'] = 1000  # Rows per read page and per DELETE transaction
+app.config['ARCHIVE_PAGE_SIZE'] = 100  # Rows per page in the archive viewer
+
+# Metrics Configuration
+# /metrics is served to logged-in admins, or to scrapers sending "Authorization: Bearer <METRICS_TOKEN>".
+# Client addresses are not trusted: behind a local reverse proxy every request comes from 127.0.0.1
+app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')  # Unset: admins only
+
+# SQL Tracing Configuration
+app.config['SLOW_QUERY_THRESHOLD_MS'] = 200  # Statements slower than this go to the slow-query log
+app.config['SLOW_QUERY_LOG_FILE'] = None  # e.g. 'slow_queries.log'; None logs through the root logger only
+app.config['SQL_TRACE_HISTORY'] = 50  # Number of per-request traces kept for /admin/sql_trace
+
+# Template Caching Configuration
+JINJA_CACHE_DIR = os.path.join('cache', 'jinja')  # Compiled template bytecode, shared by all workers
+app.config['FRAGMENT_CACHE_SIZE'] = 256  # Rendered fragments kept per worker (LRU)
+
+# Static Asset Configuration
+# Built by build_assets.py; until a manifest exists, pages load the CDN copies below
+ASSET_DIST_FOLDER = os.path.join(app.static_folder, 'dist')
+ASSET_FALLBACK_URLS = {
+    'app.css': ['https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css',
+                'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
+                None],  # None = static/css/style.css, served by Flask
+    'app.js': ['https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/js/bootstrap.bundle.min.js'],
+}
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+
+# Complaint Notification Configuration
+# Alerts go to these addresses; when empty, every admin with an email address is notified
+app.config['COMPLAINT_ONCALL_EMAILS'] = []
+COMPLAINT_DIGEST_MAX_ROWS = 50  # Complaints listed per category/priority group in one digest
+
+# Complaint SLA Configuration
+app.config['COMPLAINT_SLA_HOURS'] = {'Urgent': 4, 'High': 24, 'Medium': 72, 'Low': 168}  # Target time-to-resolve
+SLA_BUCKET_HOURS = [1, 2, 4, 8, 12, 24, 48, 72, 120, 168, 336, 720]  # Histogram upper bounds; one more bucket for longer
+
+# Dues Reminder Configuration
+app.config['REMINDER_BATCH_SIZE'] = 100  # Reminders per SMTP session / HTTP session
+app.config['REMINDER_WORKERS'] = 4  # Batches sent in parallel
+app.config['REMINDER_MAX_PER_SECOND'] = 150  # Overall send rate across all workers
+REMINDER_BREAKDOWN_MONTHS = 12  # Months itemised in a reminder; older dues are summarised in one line
+
+# Announcement Broadcast Configuration
+app.config['ANNOUNCEMENT_BATCH_SIZE'] = 200  # Deliveries sent per task and recorded in one write
+app.config['ANNOUNCEMENT_SMTP_CONNECTIONS'] = 4  # Pooled SMTP sessions sending in parallel
+app.config['ANNOUNCEMENT_WHATSAPP_WORKERS'] = 4  # Pooled HTTP sessions sending in parallel
+app.config['ANNOUNCEMENT_EMAIL_PER_SECOND'] = 50
+app.config['ANNOUNCEMENT_WHATSAPP_PER_SECOND'] = 20
+ANNOUNCEMENT_LEASE_SECONDS = 300  # A broadcast not renewed for this long is treated as abandoned and resumed
+ANNOUNCEMENT_CATEGORIES = ['General', 'Meeting', 'Repair', 'Emergency']
+ANNOUNCEMENT_CHANNELS = ('smtp', 'whatsapp')
+
+# Late Fee Configuration
+app.config['LATE_FEE_RULES'] = {
+    'due_day': 10,  # Dues for a month fall due on this day of that month (on its last day if the month is shorter)
+    'grace_days': 5,  # No penalty for payments this many days past the due date
+    'flat_fee': 100.0,  # One-off charge once a due is late
+    'monthly_interest_rate': 0.015,  # Simple interest on the late principal, per 30 days
+    'max_penalty_ratio': 0.25,  # Cap as a fraction of the monthly amount (0 disables the cap)
+}
+app.config['LATE_FEE_WRITE_BATCH_SIZE'] = 10000
+
+# REST API Configuration
+app.config['API_TOKEN_MAX_AGE'] = 30 * 24 * 3600  # Seconds an API bearer token stays valid
+app.config['API_PAGE_SIZE'] = 50
+app.config['API_MAX_PAGE_SIZE'] = 500
+app.config['API_MAX_BULK_ITEMS'] = 1000  # Items per bulk create/update transaction
+
+# Idempotency Configuration
+app.config['IDEMPOTENCY_KEY_TTL'] = 24 * 3600  # Seconds a stored response can be replayed
+app.config['IDEMPOTENCY_WAIT_SECONDS'] = 10  # How long a retry waits for the original request to finish
+
+# Payment Gateway Webhook Configuration
+# Shared signing secret per gateway name in /webhooks/payments/<gateway>; gateways without a secret are rejected
+app.config['PAYMENT_WEBHOOK_SECRETS'] = {
+    gateway: secret for gateway, secret in (
+        ('razorpay', os.environ.get('RAZORPAY_WEBHOOK_SECRET')),
+        ('stripe', os.environ.get('STRIPE_WEBHOOK_SECRET')),
+        ('upi', os.environ.get('UPI_WEBHOOK_SECRET')),
+    ) if secret
+}
+app.config['PAYMENT_WEBHOOK_TOLERANCE'] = 300  # Seconds a signature timestamp may differ from now (replay window)
+app.config['PAYMENT_EVENT_BATCH_SIZE'] = 500  # Queued events read per worker query
+app.config['PAYMENT_EVENT_DEFER_SECONDS'] = 24 * 3600  # How long a refund waits for its capture before failing
+
+# Bulk Import Configuration
+IMPORT_FOLDER = 'imports'  # Uploaded import files (removed after import) and per-row error reports
+app.config['IMPORT_FOLDER'] = IMPORT_FOLDER
+app.config['IMPORT_BATCH_SIZE'] = 5000  # Rows per INSERT batch and commit
+app.config['IMPORT_HASH_WORKERS'] = os.cpu_count() or 1  # Processes hashing member login passwords
+
+# House Directory Configuration
+app.config['HOUSE_SEARCH_LIMIT'] = 10  # Typeahead matches returned by default
+app.config['HOUSE_SEARCH_MAX_LIMIT'] = 50
+
+# Response Compression Configuration
+app.config['COMPRESS_MIN_SIZE'] = 1024  # Bytes; smaller bodies are sent as-is
+app.config['COMPRESS_MIMETYPES'] = {'text/html', 'text/csv', 'text/plain', 'application/json'}
+
 # Create upload directory if it doesn't exist
 if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
+os.makedirs(IMPORT_FOLDER, exist_ok=True)
 
 # MySQL Database Configuration
 # Update these values according to your MySQL setup
@@ -36,10 +201,49 @@ DB_HOST = 'localhost'
 DB_PORT = '3306'
 DB_NAME = 'society_app'
 
-app.config['SQLALCHEMY_DATABASE_URI'] = f'mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+# DATABASE_BACKEND=sqlite runs on a single local database file instead of MySQL, for small societies on
+# low-memory hardware; a relative SQLITE_PATH is placed in the instance folder
+DATABASE_BACKEND = os.environ.get('DATABASE_BACKEND', 'mysql')
+SQLITE_PATH = os.environ.get('SQLITE_PATH', 'society.db')
+if DATABASE_BACKEND == 'sqlite':
+    default_database_uri = f'sqlite:///{SQLITE_PATH}'
+else:
+    default_database_uri = f'mysql+pymysql://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+
+# DATABASE_URL overrides both, e.g. sqlite:///bench.db for a disposable benchmark database
+app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', default_database_uri)
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-db = SQLAlchemy(app)
+# SQLite Configuration (applied to every SQLite connection)
+app.config['SQLITE_PRAGMAS'] = {
+    'journal_mode': 'WAL',  # Readers and the writer no longer block each other
+    'synchronous': 'NORMAL',  # fsync at checkpoints only; safe from corruption in WAL mode
+    'cache_size': -16000,  # Page cache per connection in KiB (16 MB)
+    'mmap_size': 64 * 1024 * 1024,  # Bytes of the file read through memory mapping
+    'temp_store': 'MEMORY',
+    'busy_timeout': 10000,  # Milliseconds a writer queues for the write lock before failing
+}
+
+# Read Replica Configuration
+# Comma-separated replica URLs; views marked @replica_reads send their SELECTs there instead of the primary
+DATABASE_REPLICA_URLS = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+app.config['SQLALCHEMY_BINDS'] = {f'replica_{n}': url for n, url in enumerate(DATABASE_REPLICA_URLS, 1)}
+app.config['REPLICA_MAX_LAG_SECONDS'] = 5  # MySQL replicas further behind than this are skipped
+app.config['REPLICA_CHECK_SECONDS'] = 2  # How long a replica's measured lag is trusted before checking again
+app.config['READ_YOUR_WRITES_SECONDS'] = 10  # A user's reads stay on the primary this long after they write
+
+class RoutingSession(FlaskSQLAlchemySession):
+    """Sends the plain SELECTs of @replica_reads views to a read replica and everything else to the primary"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_request_context() and g.get('replica_reads')
+                and getattr(clause, 'is_select', False) and getattr(clause, '_for_update_arg', None) is None):
+            engine = replica_read_engine()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+db = SQLAlchemy(app, session_options={'class_': RoutingSession})
 
 # Database Models
 class User(db.Model):
@@ -71,26 +275,54 @@ class Member(db.Model):
     age = db.Column(db.Integer, nullable=False)
     gender = db.Column(db.String(10), nullable=False)
     role = db.Column(db.String(20), nullable=False)  # Owner/Tenant
-    emergency_contact = db.Column(db.String(15), nullable=True)
+    contact_number = db.Column(db.String(15), nullable=True)  # The member's own phone; tenants get announcements on it
+    emergency_contact = db.Column(db.String(15), nullable=True)  # Next of kin, never messaged
     vehicle_number = db.Column(db.String(20), nullable=True)
     parking_slot = db.Column(db.String(20), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     house = db.relationship('House', backref=db.backref('members', lazy=True))
 
+def period_from_month_year(month_year):
+    """'YYYY-MM' -> integer period (year * 12 + month - 1); raises ValueError on malformed input"""
+    value = (month_year or '').strip()
+    if len(value) != 7 or value[4] != '-' or not value[:4].isdigit() or not value[5:].isdigit() \
+            or not 1 <= int(value[5:]) <= 12:
+        raise ValueError(f"Invalid month '{month_year}', expected YYYY-MM")
+    return int(value[:4]) * 12 + int(value[5:]) - 1
+
+def month_year_from_period(period):
+    return f"{period // 12:04d}-{period % 12 + 1:02d}"
+
+def current_period(today=None):
+    today = today or date.today()
+    return today.year * 12 + today.month - 1
+
 class Maintenance(db.Model):
+    # Per-house period ranges (ledgers, current month lookups) are index range scans. Society-wide
+    # ageing queries touch most of the table, where a sequential scan beats a period-only index.
+    __table_args__ = (db.Index('ix_maintenance_house_period', 'house_id', 'period'),)
+    
     id = db.Column(db.Integer, primary_key=True)
     house_id = db.Column(db.Integer, db.ForeignKey('house.id'), nullable=False)
-    month_year = db.Column(db.String(10), nullable=False)  # Format: YYYY-MM
+    month_year = db.Column(db.String(10), nullable=False)  # Format: YYYY-MM; display label, kept in sync with period
+    period = db.Column(db.Integer, nullable=True)  # year * 12 + month - 1; NULL only until migrate_database.py backfills it
     amount = db.Column(db.Float, nullable=False)
     paid_amount = db.Column(db.Float, default=0.0)
     payment_status = db.Column(db.String(20), default='Pending')  # Paid/Pending/Partial
     payment_date = db.Column(db.Date, nullable=True)
     receipt_number = db.Column(db.String(20), nullable=True)
     payment_method = db.Column(db.String(20), default='Cash')  # Cash/Online - for future payment gateway
+    late_fee = db.Column(db.Float, default=0.0, server_default='0')  # Maintained by apply_late_fees()
+    credited_amount = db.Column(db.Float, default=0.0, server_default='0')  # Part of paid_amount in the society fund
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     house = db.relationship('House', backref=db.backref('maintenance_records', lazy=True))
+    
+    @validates('month_year')
+    def _sync_period(self, key, month_year):
+        self.period = period_from_month_year(month_year)
+        return month_year_from_period(self.period)
 
 class Fund(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -98,12 +330,24 @@ class Fund(db.Model):
     last_updated = db.Column(db.DateTime, default=datetime.utcnow)
     
     @classmethod
-    def get_fund(cls):
-        fund = cls.query.first()
+    def get_fund(cls, for_update=False):
+        """The society fund; for_update locks its row until commit (take it after any other row locks)"""
+        if for_update:
+            # Locked once per transaction; bulk postings reuse the lock instead of re-selecting per item
+            fund = db.session.info.get('locked_fund')
+            if fund is None:
+                fund = lock_for_update(cls.query).first()
+                db.session.info['locked_fund'] = fund
+        else:
+            fund = cls.query.first()
         if not fund:
-            fund = cls(total_amount=0.0, last_updated=datetime.utcnow)
+            # Flushed, not committed: a posting creating the fund must stay one transaction. The fixed id
+            # makes a second first posting fail on the primary key instead of creating another fund row.
+            fund = cls(id=1, total_amount=0.0, last_updated=datetime.utcnow())
             db.session.add(fund)
-            db.session.commit()
+            db.session.flush()
+            if for_update:
+                db.session.info['locked_fund'] = fund  # The insert holds the new row's lock until commit
         return fund
 
 class Expense(db.Model):
@@ -150,6 +394,8 @@ class NotificationSettings(db.Model):
         return cls.query.filter_by(notification_type=notification_type, is_active=True).first()
 
 class Complaint(db.Model):
+    __table_args__ = (db.Index('ix_complaint_status_created', 'status', 'created_at'),)  # Open complaints past their SLA
+    
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=False)
@@ -162,6 +408,7 @@ class Complaint(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     resolved_at = db.Column(db.DateTime, nullable=True)
     admin_notes = db.Column(db.Text, nullable=True)
+    notified_at = db.Column(db.DateTime, nullable=True, index=True)  # Set once admins were alerted or sent a digest
     
     creator = db.relationship('User', backref=db.backref('complaints', lazy=True))
     house = db.relationship('House', backref=db.backref('complaints', lazy=True))
@@ -200,6 +447,151 @@ class Document(db.Model):
         """Check if file is PDF"""
         return self.file_extension.lower() == 'pdf'
 
+class DuesReminder(db.Model):
+    """One reminder per house, channel and reminder cycle; makes reminder runs idempotent"""
+    __table_args__ = (db.UniqueConstraint('house_id', 'cycle', 'channel', name='uq_dues_reminder_house_cycle_channel'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    house_id = db.Column(db.Integer, db.ForeignKey('house.id'), nullable=False)
+    cycle = db.Column(db.String(20), nullable=False)  # e.g. 2025-03-05 for a daily run
+    channel = db.Column(db.String(20), nullable=False)  # smtp, whatsapp
+    months_overdue = db.Column(db.Integer, nullable=False)
+    amount_due = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), nullable=False)  # Sent/Failed
+    error = db.Column(db.String(255), nullable=True)
+    sent_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    house = db.relationship('House', backref=db.backref('dues_reminders', lazy=True))
+
+class Announcement(db.Model):
+    """A notice on the society board, optionally broadcast to residents by email and WhatsApp"""
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(200), nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    category = db.Column(db.String(20), nullable=False, default='General')  # General, Meeting, Repair, Emergency
+    audience = db.Column(db.String(20), nullable=False, default='all')  # all (owners and tenants), owners
+    building_wing = db.Column(db.String(50), nullable=True)  # None for every wing
+    channels = db.Column(db.String(50), nullable=False, default='')  # Comma-separated: smtp, whatsapp
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    broadcast_status = db.Column(db.String(20), nullable=True)  # None (board only), queued, sending, completed, partial
+    broadcast_renewed_at = db.Column(db.DateTime, nullable=True)  # Lease renewed by the sender after every batch
+    broadcast_started_at = db.Column(db.DateTime, nullable=True)
+    broadcast_finished_at = db.Column(db.DateTime, nullable=True)
+
+    creator = db.relationship('User', backref=db.backref('announcements', lazy=True))
+
+    @property
+    def channel_list(self):
+        return [channel for channel in (self.channels or '').split(',') if channel]
+
+class AnnouncementDelivery(db.Model):
+    """One message of a broadcast: an announcement sent to one address on one channel"""
+    __table_args__ = (
+        db.UniqueConstraint('announcement_id', 'channel', 'recipient', name='uq_announcement_delivery_recipient'),
+        db.Index('ix_announcement_delivery_status', 'announcement_id', 'status', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    announcement_id = db.Column(db.Integer, db.ForeignKey('announcement.id'), nullable=False)
+    house_id = db.Column(db.Integer, db.ForeignKey('house.id'), nullable=True)
+    channel = db.Column(db.String(20), nullable=False)  # smtp, whatsapp
+    recipient = db.Column(db.String(100), nullable=False)  # Email address or phone number
+    status = db.Column(db.String(20), nullable=False, default='Pending')  # Pending, Sent, Failed
+    error = db.Column(db.String(255), nullable=True)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+class ComplaintSlaStat(db.Model):
+    """Complaint counters per month, category and priority, kept current as complaints change"""
+    __table_args__ = (db.UniqueConstraint('period', 'category', 'priority', name='uq_complaint_sla_stat_key'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    period = db.Column(db.Integer, nullable=False)  # year * 12 + month - 1 of the event counted
+    category = db.Column(db.String(50), nullable=False)
+    priority = db.Column(db.String(10), nullable=False)
+    opened = db.Column(db.Integer, nullable=False, default=0)  # Raised this month
+    resolved = db.Column(db.Integer, nullable=False, default=0)  # Resolved this month
+    reopened = db.Column(db.Integer, nullable=False, default=0)  # Moved back out of Resolved this month
+    breached = db.Column(db.Integer, nullable=False, default=0)  # Resolved this month after the SLA target
+    resolve_seconds = db.Column(db.Float, nullable=False, default=0.0)  # Total time-to-resolve of `resolved`
+
+class ComplaintResolutionBucket(db.Model):
+    """Histogram of time-to-resolve per month, category and priority; bucket indexes SLA_BUCKET_HOURS"""
+    __table_args__ = (
+        db.UniqueConstraint('period', 'category', 'priority', 'bucket', name='uq_complaint_resolution_bucket_key'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    period = db.Column(db.Integer, nullable=False)
+    category = db.Column(db.String(50), nullable=False)
+    priority = db.Column(db.String(10), nullable=False)
+    bucket = db.Column(db.Integer, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class AuditLog(db.Model):
+    """Append-only trail of inserts, updates and deletes, written in batches by audit_writer"""
+    __table_args__ = (
+        db.Index('ix_audit_log_entity', 'entity_type', 'entity_id', 'id'),
+        db.Index('ix_audit_log_actor', 'actor_id', 'id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(50), nullable=False)  # Table name, e.g. maintenance
+    entity_id = db.Column(db.Integer, nullable=True)  # NULL for bulk statements
+    action = db.Column(db.String(20), nullable=False)  # insert, update, delete, bulk_update, bulk_delete
+    changes = db.Column(db.Text, nullable=False)  # JSON: {field: [old, new]} or bulk statement details
+    actor_id = db.Column(db.Integer, nullable=True)  # User id; NULL for scheduled jobs and scripts
+    actor_name = db.Column(db.String(80), nullable=True)
+    source = db.Column(db.String(20), nullable=False)  # web, api, job
+    request_path = db.Column(db.String(200), nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    @property
+    def changes_dict(self):
+        return json.loads(self.changes)
+
+class IdempotencyKey(db.Model):
+    """Response of a non-repeatable POST, replayed when the same key is sent again"""
+    __table_args__ = (db.UniqueConstraint('user_id', 'key', name='uq_idempotency_key_user_key'),)
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, nullable=False)
+    key = db.Column(db.String(100), nullable=False)
+    request_hash = db.Column(db.String(64), nullable=False)  # SHA-256 of method, path and body
+    response_status = db.Column(db.Integer, nullable=True)  # NULL while the original request is running
+    response_headers = db.Column(db.Text, nullable=True)  # JSON: Location and Content-Type
+    response_body = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+class PaymentEvent(db.Model):
+    """Raw payment gateway webhook event, queued on receipt and applied by process_payment_events()"""
+    __table_args__ = (
+        db.UniqueConstraint('gateway', 'event_id', name='uq_payment_event_gateway_event'),
+        db.Index('ix_payment_event_status', 'status', 'id'),
+        db.Index('ix_payment_event_payment', 'gateway', 'payment_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    gateway = db.Column(db.String(20), nullable=False)
+    event_id = db.Column(db.String(100), nullable=False)  # Gateway's event id; duplicates are dropped on insert
+    event_type = db.Column(db.String(50), nullable=False)  # payment.captured, payment.failed, payment.refunded
+    payment_id = db.Column(db.String(100), nullable=True)  # Gateway's payment id, shared by a payment's events
+    payload = db.Column(db.Text, nullable=False)  # Raw JSON body as signed by the gateway
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending, applied, ignored, failed
+    error = db.Column(db.Text, nullable=True)
+    occurred_at = db.Column(db.DateTime, nullable=True)  # Gateway's event time
+    received_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    processed_at = db.Column(db.DateTime, nullable=True)
+
+class DataVersion(db.Model):
+    """Per-table write counter, bumped after each commit that wrote the table, in a transaction of its own.
+
+    Not atomic with the data: readers can briefly see a write under the old version, and if the
+    bump fails the table keeps its old version (and stale cached pages) until its next write.
+    """
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
 # File Upload Helper Functions
 def allowed_file(filename):
     """Check if file extension is allowed"""
@@ -225,9 +617,1095 @@ def get_file_icon(extension):
 # Make helper functions available in templates
 app.jinja_env.globals.update(get_file_icon=get_file_icon)
 
+# Document Storage
+try:
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config as BotoConfig
+    from botocore.exceptions import ClientError
+except ImportError:  # Only the local backend is available
+    boto3 = None
+
+def upload_size(file):
+    """Size of an uploaded file in bytes, found by seeking rather than reading it into memory"""
+    stream = file.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+class LocalDocumentStorage:
+    """Documents as files in one folder on this node, served by the app itself"""
+
+    backend = 'local'
+
+    def __init__(self, folder):
+        self.folder = folder
+        os.makedirs(folder, exist_ok=True)
+
+    def save(self, stream, name, content_type=None):
+        with open(os.path.join(self.folder, name), 'wb') as target:
+            shutil.copyfileobj(stream, target, 1024 * 1024)
+
+    def exists(self, name):
+        return os.path.exists(os.path.join(self.folder, name))
+
+    def delete(self, name):
+        path = os.path.join(self.folder, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def response(self, name, download_name=None, as_attachment=False):
+        return send_from_directory(self.folder, name, as_attachment=as_attachment, download_name=download_name)
+
+class S3DocumentStorage:
+    """Documents as objects in an S3-compatible bucket (AWS S3, MinIO, ...)
+
+    Uploads are streamed to the bucket in S3_MULTIPART_CHUNK_SIZE parts, and views and downloads
+    redirect the browser to a short-lived presigned URL so file bytes never pass through a worker.
+    """
+
+    backend = 's3'
+
+    def __init__(self, bucket, prefix='', endpoint_url=None, region=None, chunk_size=8 * 1024 * 1024, url_seconds=300):
+        if boto3 is None:
+            raise RuntimeError('DOCUMENT_STORAGE=s3 requires boto3 (pip install boto3)')
+        if not bucket:
+            raise RuntimeError('DOCUMENT_STORAGE=s3 requires S3_BUCKET')
+        self.bucket = bucket
+        self.prefix = prefix
+        self.url_seconds = url_seconds
+        # Credentials come from the standard AWS environment variables or instance profile
+        self.client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region,
+                                   config=BotoConfig(signature_version='s3v4', s3={'addressing_style': 'path'}))
+        self.transfer = TransferConfig(multipart_threshold=chunk_size, multipart_chunksize=chunk_size)
+
+    def key(self, name):
+        return f'{self.prefix}{name}'
+
+    def save(self, stream, name, content_type=None):
+        extra = {'ContentType': content_type or mimetypes.guess_type(name)[0] or 'application/octet-stream'}
+        self.client.upload_fileobj(stream, self.bucket, self.key(name), ExtraArgs=extra, Config=self.transfer)
+
+    def exists(self, name):
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.key(name))
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('404', 'NoSuchKey', 'NotFound'):
+                return False
+            raise
+        return True
+
+    def delete(self, name):
+        self.client.delete_object(Bucket=self.bucket, Key=self.key(name))
+
+    def response(self, name, download_name=None, as_attachment=False):
+        disposition = 'attachment' if as_attachment else 'inline'
+        if download_name:
+            disposition += f"; filename*=UTF-8''{quote(download_name)}"
+        url = self.client.generate_presigned_url('get_object', ExpiresIn=self.url_seconds, Params={
+            'Bucket': self.bucket, 'Key': self.key(name), 'ResponseContentDisposition': disposition})
+        response = redirect(url)
+        response.headers['Cache-Control'] = 'no-store'  # The link expires, so the redirect must not be reused
+        return response
+
+def get_document_storage():
+    """The configured document storage backend, created on first use"""
+    storage = app.extensions.get('document_storage')
+    if storage is None:
+        if app.config['DOCUMENT_STORAGE'] == 's3':
+            storage = S3DocumentStorage(app.config['S3_BUCKET'], app.config['S3_KEY_PREFIX'],
+                                        app.config['S3_ENDPOINT_URL'], app.config['S3_REGION'],
+                                        app.config['S3_MULTIPART_CHUNK_SIZE'], app.config['S3_PRESIGNED_URL_SECONDS'])
+        else:
+            storage = LocalDocumentStorage(app.config['UPLOAD_FOLDER'])
+        app.extensions['document_storage'] = storage
+    return storage
+
+# Metrics and Instrumentation
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+class MetricsRegistry:
+    """In-process counters and histograms rendered in Prometheus text format.
+
+    Each worker process keeps its own registry, so scrape every worker (or run a
+    single worker) when deploying behind a multi-process server.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help = {}
+        self._counters = {}
+        self._histograms = {}
+    
+    def describe(self, name, metric_type, help_text, buckets=None):
+        self._help[name] = (metric_type, help_text, buckets)
+    
+    def inc(self, name, labels, value=1):
+        key = (name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+    
+    def observe(self, name, labels, value):
+        buckets = self._help[name][2]
+        index = bisect.bisect_left(buckets, value)
+        key = (name, labels)
+        with self._lock:
+            series = self._histograms.get(key)
+            if series is None:
+                # Per-bucket counts (last slot is +Inf), running sum, observation count
+                series = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+    
+    @staticmethod
+    def _format_labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ''
+        escaped = []
+        for key, value in pairs:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            escaped.append(f'{key}="{value}"')
+        return '{' + ','.join(escaped) + '}'
+    
+    def render(self):
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: (list(series[0]), series[1], series[2]) for key, series in self._histograms.items()}
+        
+        lines = []
+        for name, (metric_type, help_text, buckets) in sorted(self._help.items()):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            if metric_type == 'counter':
+                for (series_name, labels), value in sorted(counters.items()):
+                    if series_name == name:
+                        lines.append(f'{name}{self._format_labels(labels)} {value}')
+            else:
+                for (series_name, labels), (bucket_counts, total, count) in sorted(histograms.items()):
+                    if series_name != name:
+                        continue
+                    cumulative = 0
+                    for bound, bucket_count in zip(list(buckets) + ['+Inf'], bucket_counts):
+                        cumulative += bucket_count
+                        lines.append(f'{name}_bucket{self._format_labels(labels, [("le", bound)])} {cumulative}')
+                    lines.append(f'{name}_sum{self._format_labels(labels)} {total}')
+                    lines.append(f'{name}_count{self._format_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+metrics = MetricsRegistry()
+metrics.describe('society_http_requests_total', 'counter', 'HTTP requests by endpoint, method and status code')
+metrics.describe('society_http_request_duration_seconds', 'histogram', 'HTTP request latency by endpoint and method', LATENCY_BUCKETS)
+metrics.describe('society_db_queries_per_request', 'histogram', 'Number of SQL statements executed per request', QUERY_COUNT_BUCKETS)
+metrics.describe('society_db_time_per_request_seconds', 'histogram', 'Time spent executing SQL per request', LATENCY_BUCKETS)
+metrics.describe('society_notifications_total', 'counter', 'Notification sends by channel and outcome')
+metrics.describe('society_notification_send_duration_seconds', 'histogram', 'Notification send duration by channel and outcome', LATENCY_BUCKETS)
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start_time'].pop()
+    in_request = has_request_context()
+    if in_request:
+        g.db_query_count = g.get('db_query_count', 0) + 1
+        g.db_time = g.get('db_time', 0.0) + elapsed
+    
+    duration_ms = elapsed * 1000
+    trace = g.get('sql_trace') if in_request else None
+    if trace is None and duration_ms < app.config['SLOW_QUERY_THRESHOLD_MS']:
+        return
+    
+    entry = {
+        'statement': statement,
+        'duration_ms': round(duration_ms, 3),
+        'rows': cursor.rowcount,
+        'executemany': executemany,
+        'endpoint': request.endpoint if in_request else None,
+    }
+    if trace is not None:
+        trace.append(entry)
+    if duration_ms >= app.config['SLOW_QUERY_THRESHOLD_MS']:
+        slow_query_logger.warning(json.dumps(dict(entry, path=request.path if in_request else None)))
+
+# SQL Tracing
+slow_query_logger = logging.getLogger('society.slow_queries')
+if app.config['SLOW_QUERY_LOG_FILE']:
+    slow_query_logger.addHandler(logging.FileHandler(app.config['SLOW_QUERY_LOG_FILE']))
+
+# Recent admin-requested traces, oldest evicted first
+sql_traces = OrderedDict()
+sql_traces_lock = threading.Lock()
+
+def sql_trace_requested():
+    # session flag avoids an extra query; admin_required still guards the trace view
+    if not session.get('is_admin'):
+        return False
+    return request.headers.get('X-SQL-Trace') == '1' or request.args.get('sql_trace') == '1'
+
+def summarize_sql_trace(trace):
+    """Group traced statements so repeated (N+1) queries stand out"""
+    grouped = {}
+    for entry in trace:
+        group = grouped.setdefault(entry['statement'], {'statement': entry['statement'], 'count': 0, 'total_ms': 0.0})
+        group['count'] += 1
+        group['total_ms'] = round(group['total_ms'] + entry['duration_ms'], 3)
+    return sorted(grouped.values(), key=lambda group: group['total_ms'], reverse=True)
+
+@app.before_request
+def start_request_timer():
+    g.request_start_time = time.perf_counter()
+    if sql_trace_requested():
+        g.sql_trace = []
+
+@app.after_request
+def attach_sql_trace(response):
+    trace = g.pop('sql_trace', None)
+    if trace is None:
+        return response
+    
+    trace_id = uuid.uuid4().hex[:12]
+    # Kept locally: the stored trace may already be evicted by the time the headers are set
+    total_ms = round(sum(entry['duration_ms'] for entry in trace), 3)
+    with sql_traces_lock:
+        sql_traces[trace_id] = {
+            'trace_id': trace_id,
+            'endpoint': request.endpoint,
+            'path': request.full_path,
+            'query_count': len(trace),
+            'total_ms': total_ms,
+            'queries': trace,
+            'statements': summarize_sql_trace(trace),
+        }
+        while len(sql_traces) > app.config['SQL_TRACE_HISTORY']:
+            sql_traces.popitem(last=False)
+    
+    response.headers['X-SQL-Trace-Id'] = trace_id
+    response.headers['X-SQL-Query-Count'] = str(len(trace))
+    response.headers['X-SQL-Time-Ms'] = str(total_ms)
+    return response
+
+@app.after_request
+def record_request_metrics(response):
+    start_time = g.pop('request_start_time', None)
+    if start_time is None:
+        return response
+    
+    # Unmatched URLs share one label so 404 scans cannot blow up series cardinality
+    endpoint = request.endpoint or 'unmatched'
+    labels = (('endpoint', endpoint), ('method', request.method))
+    metrics.inc('society_http_requests_total', labels + (('status', response.status_code),))
+    metrics.observe('society_http_request_duration_seconds', labels, time.perf_counter() - start_time)
+    metrics.observe('society_db_queries_per_request', (('endpoint', endpoint),), g.get('db_query_count', 0))
+    metrics.observe('society_db_time_per_request_seconds', (('endpoint', endpoint),), g.get('db_time', 0.0))
+    return response
+
+def instrument_notification(channel):
+    """Record duration and outcome of a NotificationService send returning (success, message)"""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            outcome = 'error'
+            try:
+                result = f(*args, **kwargs)
+                outcome = 'success' if result[0] else 'failure'
+                return result
+            finally:
+                labels = (('channel', channel), ('outcome', outcome))
+                metrics.inc('society_notifications_total', labels)
+                metrics.observe('society_notification_send_duration_seconds', labels, time.perf_counter() - start_time)
+        return wrapper
+    return decorator
+
+# Template and Fragment Caching
+if not os.path.exists(JINJA_CACHE_DIR):
+    os.makedirs(JINJA_CACHE_DIR)
+app.jinja_env.bytecode_cache = FileSystemBytecodeCache(JINJA_CACHE_DIR)
+
+def bump_data_versions(connection, table_names):
+    """Increment the write counters of table_names on connection's current transaction.
+
+    Session writes go through mark_data_changed instead, so the version rows are only locked for
+    a short transaction of their own after the session commits.
+    """
+    table_names = set(table_names) - {DataVersion.__tablename__}
+    if not table_names:
+        return
+    version_table = DataVersion.__table__
+    result = connection.execute(
+        version_table.update()
+        .where(version_table.c.table_name.in_(table_names))
+        .values(version=version_table.c.version + 1)
+    )
+    if result.rowcount != len(table_names):
+        existing = {row[0] for row in connection.execute(
+            version_table.select().with_only_columns(version_table.c.table_name)
+            .where(version_table.c.table_name.in_(table_names)))}
+        missing = table_names - existing
+        if missing:
+            connection.execute(version_table.insert(), [{'table_name': name, 'version': 1} for name in missing])
+    if has_request_context():
+        # Versions read earlier in this request are stale now
+        g.pop('data_versions', None)
+        g.wrote_primary = True
+
+def mark_data_changed(session, table_names):
+    """Bump the versions of table_names once session commits; Core writes on the session call this themselves"""
+    session.info.setdefault('changed_tables', set()).update(table_names)
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_tables_after_flush(session, flush_context):
+    changed_tables = {obj.__table__.name for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+                      if hasattr(obj, '__table__')}
+    if changed_tables:
+        mark_data_changed(session, changed_tables)
+
+@event.listens_for(Session, 'after_bulk_update')
+@event.listens_for(Session, 'after_bulk_delete')
+def _collect_changed_tables_after_bulk(bulk_context):
+    mark_data_changed(bulk_context.session, {bulk_context.mapper.local_table.name})
+
+@event.listens_for(Session, 'after_commit')
+def _bump_versions_after_commit(session):
+    # Bumping inside the writer's transaction held the hot per-table version row locked until commit
+    # (on MySQL, across receipts and other slow work), serialising every writer to that table
+    changed_tables = session.info.pop('changed_tables', None)
+    if not changed_tables:
+        return
+    try:
+        with db.engine.begin() as connection:
+            bump_data_versions(connection, changed_tables)
+    except SQLAlchemyError:
+        # The data is committed; cached pages of these tables stay stale until their next write
+        app.logger.exception('Could not bump data versions of %s', ', '.join(sorted(changed_tables)))
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_changed_tables(session):
+    session.info.pop('changed_tables', None)
+
+def get_data_versions():
+    """All table versions, read once per request"""
+    versions = g.get('data_versions')
+    if versions is None:
+        versions = g.data_versions = dict(db.session.query(DataVersion.table_name, DataVersion.version).all())
+    return versions
+
+class FragmentCache:
+    """LRU of rendered template fragments keyed on (fragment, table versions, vary values)"""
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+    
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+fragment_cache = FragmentCache(app.config['FRAGMENT_CACHE_SIZE'])
+
+def cached_fragment(name, *tables, vary=(), caller):
+    """Render a {% call %} block once per version of the tables it reads.
+
+    Usage: {% call cached_fragment('houses_table', 'house') %}...{% endcall %}
+    Anything else the block depends on (e.g. session values) must go in vary.
+    """
+    versions = get_data_versions() if tables else {}
+    key = (name, tuple(versions.get(table, 0) for table in tables), tuple(vary) if not isinstance(vary, str) else (vary,))
+    html = fragment_cache.get(key)
+    if html is None:
+        html = caller()
+        fragment_cache.set(key, html)
+    return Markup(html)
+
+class LazyRows:
+    """Defers a listing query until a template actually iterates it, so cached fragments skip it"""
+    def __init__(self, loader):
+        self._loader = loader
+        self._rows = None
+    
+    def _load(self):
+        if self._rows is None:
+            self._rows = self._loader()
+        return self._rows
+    
+    def __iter__(self):
+        return iter(self._load())
+    
+    def __len__(self):
+        return len(self._load())
+    
+    def __bool__(self):
+        return bool(self._load())
+
+app.jinja_env.globals.update(cached_fragment=cached_fragment)
+
+# Read Models
+class ReadModel:
+    """A read-only projection of the columns a listing or export renders.
+
+    Rows are namedtuples built straight from the result tuples, with no ORM entities, identity
+    map entries, change tracking or lazy loads, so a large page or export costs one tuple per row.
+    select() starts the query; callers add the joins, filters and ordering.
+    """
+    def __init__(self, typename, **columns):
+        self.columns = columns
+        self.row_class = namedtuple(typename, columns)
+    
+    def select(self):
+        return select(*(column.label(name) for name, column in self.columns.items()))
+    
+    def all(self, statement):
+        return list(map(self.row_class._make, db.session.execute(statement)))
+    
+    def stream(self, statement, batch_size=2000):
+        """Rows fetched batch_size at a time, for exports that write each row out once"""
+        return map(self.row_class._make, db.session.execute(statement.execution_options(yield_per=batch_size)))
+
+house_listing = ReadModel(
+    'HouseListing', id=House.id, house_number=House.house_number, building_wing=House.building_wing,
+    owner_name=House.owner_name, contact_number=House.contact_number, email=House.email,
+    number_of_occupants=House.number_of_occupants)
+
+member_listing = ReadModel(
+    'MemberListing', id=Member.id, name=Member.name, age=Member.age, gender=Member.gender, role=Member.role,
+    contact_number=Member.contact_number, emergency_contact=Member.emergency_contact, vehicle_number=Member.vehicle_number,
+    parking_slot=Member.parking_slot, house_number=House.house_number, building_wing=House.building_wing)
+
+maintenance_listing = ReadModel(
+    'MaintenanceListing', id=Maintenance.id, house_number=House.house_number, building_wing=House.building_wing,
+    month_year=Maintenance.month_year, amount=Maintenance.amount, paid_amount=Maintenance.paid_amount,
+    late_fee=Maintenance.late_fee, payment_status=Maintenance.payment_status,
+    payment_date=Maintenance.payment_date, receipt_number=Maintenance.receipt_number)
+
+expense_listing = ReadModel(
+    'ExpenseListing', id=Expense.id, expense_date=Expense.expense_date, category=Expense.category,
+    description=Expense.description, amount=Expense.amount, created_by_name=User.username)
+
+def expense_listing_query(from_date=None, to_date=None):
+    """Expenses between two optional dates, newest first, with the creating user's name"""
+    statement = expense_listing.select().select_from(Expense).outerjoin(User, Expense.created_by == User.id)
+    if from_date:
+        statement = statement.where(Expense.expense_date >= from_date)
+    if to_date:
+        statement = statement.where(Expense.expense_date <= to_date)
+    return statement.order_by(Expense.expense_date.desc())
+
+def expense_report_csv(from_date=None, to_date=None):
+    """The expense report as CSV text, written row by row from a streamed projection"""
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(['Date', 'Category', 'Description', 'Amount', 'Created By'])
+    writer.writerows((expense.expense_date, expense.category, expense.description, expense.amount, expense.created_by_name)
+                     for expense in expense_listing.stream(expense_listing_query(from_date, to_date)))
+    return output.getvalue()
+
+# House Directory
+house_directory_rows = ReadModel('HouseDirectoryEntry', id=House.id, house_number=House.house_number,
+                                 building_wing=House.building_wing, owner_name=House.owner_name)
+
+def house_label(house):
+    return f'{house.house_number} - {house.building_wing} ({house.owner_name})'
+
+class HouseDirectory:
+    """In-memory index of every house behind the form typeahead (/houses/search).
+
+    Each house is indexed by the words of its wing, number and owner name. A sorted word list
+    answers prefix matches and a trigram index answers matches inside a word. The index is rebuilt
+    from one projected query whenever the house table's data version moves, so adds, edits, deletes
+    and bulk imports by any process are picked up on the next search.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._index = None
+    
+    @staticmethod
+    def _words(text):
+        return re.findall(r'[a-z0-9]+', text.lower())
+    
+    def _build(self):
+        houses, texts, words, trigrams = {}, {}, [], {}
+        for house in house_directory_rows.all(house_directory_rows.select()):
+            houses[house.id] = house
+            house_words = set(self._words(f'{house.building_wing} {house.house_number} {house.owner_name}'))
+            # Leading spaces let ' ' + term test for a word prefix and term test for a substring
+            texts[house.id] = ' ' + ' '.join(house_words)
+            for word in house_words:
+                words.append((word, house.id))
+                for start in range(len(word) - 2):
+                    trigrams.setdefault(word[start:start + 3], set()).add(house.id)
+        words.sort()
+        ordered = sorted(houses.values(), key=lambda house: (house.building_wing, len(house.house_number), house.house_number))
+        return SimpleNamespace(houses=houses, texts=texts, words=words, trigrams=trigrams,
+                               order={house.id: position for position, house in enumerate(ordered)},
+                               numbers={house.id: ''.join(self._words(house.house_number)) for house in ordered})
+    
+    def _current(self):
+        version = get_data_versions().get(House.__tablename__, 0)
+        with self._lock:
+            if self._index is None or self._version != version:
+                self._index = self._build()
+                self._version = version
+            return self._index
+    
+    def get(self, house_id):
+        return self._current().houses.get(house_id)
+    
+    @staticmethod
+    def _prefix_range(index, term):
+        return bisect.bisect_left(index.words, (term,)), bisect.bisect_left(index.words, (term + '\uffff',))
+    
+    def _matches(self, index, term):
+        """Ids of houses with a word starting with term, or containing it when term is 3+ characters"""
+        low, high = self._prefix_range(index, term)
+        ids = {house_id for _, house_id in index.words[low:high]}
+        if len(term) >= 3:
+            postings = sorted((index.trigrams.get(term[start:start + 3], set()) for start in range(len(term) - 2)), key=len)
+            ids.update(house_id for house_id in set.intersection(*postings) if term in index.texts[house_id])
+        return ids
+    
+    def search(self, query, limit):
+        """Up to limit houses matching every word of query; exact house numbers first, then by wing and number"""
+        terms = set(self._words(query))
+        if not terms:
+            return []
+        index = self._current()
+        
+        # The term with the fewest prefix hits goes through the index; the rest only filter its result
+        def prefix_hits(term):
+            low, high = self._prefix_range(index, term)
+            return high - low, -len(term)
+        seed = min(terms, key=prefix_hits)
+        candidates = self._matches(index, seed)
+        for term in terms - {seed}:
+            needle = term if len(term) >= 3 else ' ' + term
+            candidates = [house_id for house_id in candidates if needle in index.texts[house_id]]
+        prefixes = tuple(terms)
+        
+        def rank(house_id):
+            number = index.numbers[house_id]
+            exact = 0 if number in prefixes else 1 if number.startswith(prefixes) else 2
+            return exact, index.order[house_id]
+        return [index.houses[house_id] for house_id in heapq.nsmallest(limit, candidates, key=rank)]
+
+house_directory = HouseDirectory()
+app.jinja_env.globals.update(house_label=house_label)
+
+# Read Replicas
+replica_logger = logging.getLogger('society.replicas')
+metrics.describe('society_replica_reads_total', 'counter', 'Requests of @replica_reads views by the database that served them')
+
+def mysql_replication_lag(connection):
+    """(is_replica, seconds behind the source) as reported by a MySQL replica; seconds is None while stopped"""
+    for statement, column in (('SHOW REPLICA STATUS', 'Seconds_Behind_Source'), ('SHOW SLAVE STATUS', 'Seconds_Behind_Master')):
+        try:
+            status = connection.exec_driver_sql(statement).mappings().first()
+        except SQLAlchemyError:
+            continue  # Older server without the new syntax, or no REPLICATION CLIENT privilege
+        if status is None:
+            return False, None
+        return True, status.get(column)
+    return False, None
+
+class ReplicaRouter:
+    """Hands out replicas round-robin, skipping any that lag behind the primary.
+
+    A MySQL replica is judged by its reported replication lag. Any other replica (e.g. a second
+    local database kept in sync by hand) is caught up once its data_version counters have reached
+    the primary's, the same counters that ETags and cached fragments are keyed on.
+    """
+
+    def __init__(self, keys):
+        self.keys = list(keys)
+        self._lock = threading.Lock()
+        self._next = 0
+        self._checked = {}  # key -> (monotonic time checked, healthy)
+
+    def _versions(self, connection):
+        version_table = DataVersion.__table__
+        return dict(connection.execute(select(version_table.c.table_name, version_table.c.version)).all())
+
+    def _is_healthy(self, key):
+        engine = db.engines[key]
+        try:
+            with engine.connect() as connection:
+                if engine.dialect.name == 'mysql':
+                    is_replica, lag = mysql_replication_lag(connection)
+                    if is_replica:
+                        return lag is not None and lag <= app.config['REPLICA_MAX_LAG_SECONDS']
+                replica_versions = self._versions(connection)
+            with db.engines[None].connect() as connection:
+                primary_versions = self._versions(connection)
+        except SQLAlchemyError as e:
+            replica_logger.warning('Replica %s unavailable: %s', key, e)
+            return False
+        return all(replica_versions.get(name, 0) >= version for name, version in primary_versions.items())
+
+    def healthy(self, key):
+        now = time.monotonic()
+        with self._lock:
+            checked = self._checked.get(key)
+        if checked is not None and now - checked[0] < app.config['REPLICA_CHECK_SECONDS']:
+            return checked[1]
+        healthy = self._is_healthy(key)
+        with self._lock:
+            self._checked[key] = (now, healthy)
+        return healthy
+
+    def pick(self):
+        """Key of the next caught-up replica, or None when every replica lags"""
+        for _ in range(len(self.keys)):
+            with self._lock:
+                key = self.keys[self._next % len(self.keys)]
+                self._next += 1
+            if self.healthy(key):
+                return key
+        return None
+
+replica_router = ReplicaRouter(app.config['SQLALCHEMY_BINDS'])
+
+def replica_read_engine():
+    """Engine the current @replica_reads request reads from, chosen once per request; None means the primary"""
+    if 'replica_engine' not in g:
+        key, reason = None, 'no_replicas'
+        if replica_router.keys:
+            if session.get('primary_until', 0) > time.time():
+                reason = 'read_your_writes'
+            else:
+                key = replica_router.pick()
+                reason = 'replica' if key else 'replica_lag'
+        g.replica_engine = db.engines[key] if key else None
+        metrics.inc('society_replica_reads_total', (('target', key or 'primary'), ('reason', reason)))
+    return g.replica_engine
+
+def replica_reads(f):
+    """Serve a read-only view from a read replica when one is caught up (see RoutingSession)"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.replica_reads = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+@app.after_request
+def pin_writer_to_primary(response):
+    # Every write path bumps data versions; the writer then reads from the primary for a while
+    if g.get('wrote_primary') and replica_router.keys:
+        session['primary_until'] = time.time() + app.config['READ_YOUR_WRITES_SECONDS']
+    return response
+
+# Audit Log
+def _audit_value(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+def _audit_actor():
+    """(actor_id, actor_name, source, request_path) for the code that is writing"""
+    if not has_request_context():
+        return None, None, 'job', None
+    api_user = g.get('api_user')
+    if api_user:
+        return api_user['uid'], None, 'api', request.path[:200]
+    return session.get('user_id'), session.get('username'), 'web', request.path[:200]
+
+def _audit_changes(obj, action):
+    """{field: [old, new]} for the mapped columns an insert, update or delete touches"""
+    state = db.inspect(obj)
+    changes = {}
+    for column_attr in state.mapper.column_attrs:
+        key = column_attr.key
+        if action == 'update':
+            history = state.attrs[key].history
+            if not history.has_changes():
+                continue
+            old = history.deleted[0] if history.deleted else None
+            new = history.added[0] if history.added else None
+            if old == new:
+                continue
+        else:
+            value = state.dict.get(key)
+            old, new = (None, value) if action == 'insert' else (value, None)
+        if key in AUDIT_REDACTED_FIELDS:
+            old, new = ('***' if old is not None else None), ('***' if new is not None else None)
+        changes[key] = [_audit_value(old), _audit_value(new)]
+    return changes
+
+def _pending_audit(session):
+    return session.info.setdefault('audit_pending', [])
+
+class AuditWriter:
+    """Buffers committed audit entries in memory and inserts them in batches from a background thread"""
+    def __init__(self):
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._engine = None
+    
+    def enqueue(self, entries):
+        with self._lock:
+            self._buffer.extend(entries)
+            size = len(self._buffer)
+            if self._engine is None:
+                self._engine = db.engine
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+                self._thread.start()
+        if size >= app.config['AUDIT_BUFFER_LIMIT']:
+            self.flush()  # Backpressure: never grow without bound if the database is slow
+        elif size >= app.config['AUDIT_BATCH_SIZE']:
+            self._wake.set()
+    
+    def flush(self):
+        """Insert everything buffered so far; returns the number of entries written"""
+        with self._lock:
+            entries, self._buffer = self._buffer, []
+        if not entries:
+            return 0
+        try:
+            with self._engine.begin() as connection:
+                connection.execute(AuditLog.__table__.insert(), entries)
+        except Exception:
+            logging.getLogger('society.audit').exception('Failed to write %d audit entries; will retry', len(entries))
+            with self._lock:
+                self._buffer[:0] = entries
+            return 0
+        return len(entries)
+    
+    def _run(self):
+        while True:
+            self._wake.wait(app.config['AUDIT_FLUSH_INTERVAL'])
+            self._wake.clear()
+            self.flush()
+
+audit_writer = AuditWriter()
+atexit.register(audit_writer.flush)
+
+@event.listens_for(Session, 'after_flush')
+def _collect_audit_entries(session, flush_context):
+    # Column history is still available here and new rows already have their ids
+    actor_id, actor_name, source, request_path = _audit_actor()
+    now = datetime.utcnow()
+    pending = _pending_audit(session)
+    for action, objects in (('insert', session.new), ('update', session.dirty), ('delete', session.deleted)):
+        for obj in objects:
+            table = getattr(obj, '__table__', None)
+            if table is None or table.name in AUDIT_EXCLUDED_TABLES:
+                continue
+            changes = _audit_changes(obj, action)
+            if action == 'update' and not changes:
+                continue
+            pending.append({
+                'entity_type': table.name, 'entity_id': getattr(obj, 'id', None), 'action': action,
+                'changes': json.dumps(changes, default=str), 'actor_id': actor_id, 'actor_name': actor_name,
+                'source': source, 'request_path': request_path, 'created_at': now,
+            })
+
+@event.listens_for(Session, 'after_bulk_update')
+@event.listens_for(Session, 'after_bulk_delete')
+def _collect_bulk_audit_entry(bulk_context):
+    table_name = bulk_context.mapper.local_table.name
+    if table_name in AUDIT_EXCLUDED_TABLES:
+        return
+    where = bulk_context.query.whereclause
+    details = {
+        'rows': bulk_context.result.rowcount,
+        'where': str(where) if where is not None else None,
+        'params': where.compile().params if where is not None else {},
+    }
+    values = getattr(bulk_context, 'values', None)
+    if values:
+        details['values'] = {getattr(key, 'key', str(key)): value for key, value in dict(values).items()}
+    actor_id, actor_name, source, request_path = _audit_actor()
+    _pending_audit(bulk_context.session).append({
+        'entity_type': table_name, 'entity_id': None,
+        'action': 'bulk_update' if hasattr(bulk_context, 'values') else 'bulk_delete',
+        'changes': json.dumps(details, default=str), 'actor_id': actor_id, 'actor_name': actor_name,
+        'source': source, 'request_path': request_path, 'created_at': datetime.utcnow(),
+    })
+
+@event.listens_for(Session, 'after_commit')
+def _queue_audit_entries(session):
+    entries = session.info.pop('audit_pending', None)
+    if entries:
+        audit_writer.enqueue(entries)
+
+@event.listens_for(Session, 'after_transaction_end')
+def _release_fund_lock(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('locked_fund', None)
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_audit_entries(session):
+    # Changes that never committed leave no trail
+    session.info.pop('audit_pending', None)
+
+# Live Updates
+try:
+    import redis
+except ImportError:  # Events then only reach streams served by the publishing process
+    redis = None
+
+class LiveSubscription:
+    """The queue of (event_id, name, data) behind one open event stream"""
+    def __init__(self, topic):
+        self.topic = topic
+        self.events = queue.Queue(maxsize=LIVE_EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+class EventBroker:
+    """In-process pub/sub feeding Server-Sent Event streams.
+
+    Events fan out to the subscribers of this process. With LIVE_EVENTS_BROKER_URL set they are
+    published through Redis instead, and every worker process relays them to its own subscribers.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}
+        self._recent = {}
+        self._evicted = set()  # Topics whose replay buffer has dropped events
+        self._redis = None
+        self._relaying = False
+
+    def _remote(self):
+        url = app.config['LIVE_EVENTS_BROKER_URL']
+        if not url or redis is None:
+            return None
+        with self._lock:
+            if self._redis is None:
+                self._redis = redis.Redis.from_url(url)
+            if not self._relaying:
+                self._relaying = True
+                threading.Thread(target=self._relay, name='live-events-relay', daemon=True).start()
+        return self._redis
+
+    def _relay(self):
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(LIVE_EVENTS_CHANNEL)
+                for message in pubsub.listen():
+                    self._dispatch(*json.loads(message['data']))
+            except Exception:
+                logging.getLogger('society.live_events').exception('Lost the live event broker; reconnecting')
+                time.sleep(1)
+
+    def _dispatch(self, topic, event_id, name, data):
+        with self._lock:
+            recent = self._recent.setdefault(topic, deque(maxlen=LIVE_EVENTS_REPLAY_SIZE))
+            if len(recent) == recent.maxlen:
+                self._evicted.add(topic)
+            recent.append((event_id, name, data))
+            for subscription in self._subscribers.get(topic, ()):
+                try:
+                    subscription.events.put_nowait((event_id, name, data))
+                except queue.Full:
+                    subscription.overflowed = True
+
+    def publish(self, topic, name, data):
+        event = (topic, uuid.uuid4().hex, name, data)
+        remote = self._remote()
+        if remote is not None:
+            try:
+                remote.publish(LIVE_EVENTS_CHANNEL, json.dumps(event))
+                return
+            except Exception:
+                logging.getLogger('society.live_events').exception('Could not reach the live event broker; '
+                                                                   'delivering to this process only')
+        self._dispatch(*event)
+
+    def last_event_id(self, topic):
+        """Where a page rendered now should resume its stream, so nothing published before it connects is lost"""
+        with self._lock:
+            recent = self._recent.get(topic)
+            return recent[-1][0] if recent else LIVE_EVENTS_START
+    
+    def subscribe(self, topic, last_event_id=None):
+        """(subscription, events missed since last_event_id); missed is None once that event was evicted"""
+        self._remote()
+        subscription = LiveSubscription(topic)
+        with self._lock:
+            self._subscribers.setdefault(topic, set()).add(subscription)
+            recent = list(self._recent.get(topic, ()))
+            evicted = topic in self._evicted
+        if not last_event_id:
+            return subscription, []
+        if last_event_id == LIVE_EVENTS_START:
+            return subscription, None if evicted else recent
+        event_ids = [event[0] for event in recent]
+        if last_event_id not in event_ids:
+            return subscription, None
+        return subscription, recent[event_ids.index(last_event_id) + 1:]
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.get(subscription.topic, set()).discard(subscription)
+
+live_events = EventBroker()
+
+def sse_message(event_id, name, data):
+    return f"id: {event_id}\nevent: {name}\ndata: {json.dumps(data)}\n\n"
+
+def event_stream(topic):
+    """Server-Sent Events response relaying a topic until the client disconnects.
+
+    A client that reconnects with Last-Event-ID, or first connects with ?since= set to the
+    live_events.last_event_id() its page was rendered at, first receives what it missed. When that
+    is no longer known, or the client falls too far behind, it gets a `reset` event and should reload.
+    The stream needs no request or database context, so it holds neither while open.
+    """
+    # The browser's Last-Event-ID on a reconnect is newer than the position the page was rendered at
+    subscription, missed = live_events.subscribe(topic, request.headers.get('Last-Event-ID') or request.args.get('since'))
+
+    def generate():
+        try:
+            yield "retry: 3000\n\n"
+            if missed is None:
+                yield "event: reset\ndata: {}\n\n"
+                return
+            for event in missed:
+                yield sse_message(*event)
+            while not subscription.overflowed:
+                try:
+                    event = subscription.events.get(timeout=LIVE_EVENTS_KEEPALIVE_SECONDS)
+                except queue.Empty:
+                    yield ": keepalive\n\n"  # Also how a closed connection is noticed
+                    continue
+                yield sse_message(*event)
+            yield "event: reset\ndata: {}\n\n"
+        finally:
+            live_events.unsubscribe(subscription)
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Stops nginx from buffering the stream
+    return response
+
+def publish_complaint_changes(complaint_ids):
+    """Push the freshly rendered rows of new or updated complaints to live admin complaint queues"""
+    complaints = Complaint.query.options(joinedload(Complaint.house)).filter(Complaint.id.in_(complaint_ids)).all()
+    for complaint in complaints:
+        live_events.publish('complaints', 'complaint', {
+            'id': complaint.id,
+            'status': complaint.status,
+            'html': render_template('complaint_row.html', complaint=complaint),
+        })
+
+# Static Assets
+def load_asset_manifest():
+    manifest_path = os.path.join(ASSET_DIST_FOLDER, 'manifest.json')
+    if not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+asset_manifest = load_asset_manifest()
+
+def asset_urls(name):
+    """URLs to include for a logical bundle: the fingerprinted build, or the CDN fallbacks"""
+    hashed_name = asset_manifest.get(name)
+    if hashed_name:
+        return [url_for('assets', filename=hashed_name)]
+    return [url or url_for('static', filename='css/style.css') for url in ASSET_FALLBACK_URLS.get(name, [])]
+
+app.jinja_env.globals.update(asset_urls=asset_urls)
+
+# Response Compression and Conditional GET
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CPU_COUNT = os.cpu_count() or 1
+
+def compression_levels():
+    """(gzip, brotli) levels, lowered as the 1-minute load average per CPU rises"""
+    try:
+        load = os.getloadavg()[0] / CPU_COUNT
+    except (AttributeError, OSError):
+        load = 0.0
+    if load < 0.5:
+        return 6, 5
+    if load < 1.0:
+        return 4, 3
+    return 1, 1
+
+@app.after_request
+def compress_response(response):
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in app.config['COMPRESS_MIMETYPES']):
+        return response
+    
+    body = response.get_data()
+    if len(body) < app.config['COMPRESS_MIN_SIZE']:
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    gzip_level, brotli_level = compression_levels()
+    if brotli and 'br' in request.accept_encodings:
+        response.set_data(brotli.compress(body, quality=brotli_level))
+        response.headers['Content-Encoding'] = 'br'
+    elif 'gzip' in request.accept_encodings:
+        response.set_data(gzip.compress(body, compresslevel=gzip_level))
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
+def conditional_view(*tables):
+    """Answer repeat GETs with 304 while none of the tables a read-only view renders have changed.
+
+    The weak ETag covers the endpoint, its arguments, the viewer's identity and the table
+    versions, so the view itself only runs when the page could actually differ.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            # Pending flash messages must be rendered, so those responses are never revalidated
+            if request.method != 'GET' or session.get('_flashes'):
+                return f(*args, **kwargs)
+            
+            versions = get_data_versions()
+            fingerprint = repr((
+                request.endpoint, sorted(kwargs.items()), sorted(request.args.items(multi=True)),
+                session.get('user_id'), session.get('login_type'), date.today().isoformat(),
+                [versions.get(table, 0) for table in tables],
+            ))
+            etag = hashlib.sha1(fingerprint.encode('utf-8')).hexdigest()[:20]
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
+
 # Notification Service Functions
 class NotificationService:
     @staticmethod
+    @instrument_notification('email')
     def send_email_receipt(settings, recipient_email, recipient_name, maintenance_record):
         """Send maintenance receipt via email with beautiful HTML formatting and PDF attachment"""
         try:
@@ -579,6 +2057,7 @@ class NotificationService:
             return False, f"Failed to send email: {str(e)}"
     
     @staticmethod
+    @instrument_notification('whatsapp')
     def send_whatsapp_receipt(settings, recipient_phone, recipient_name, maintenance_record):
         """Send maintenance receipt via WhatsApp"""
         try:
@@ -696,8 +2175,10 @@ Society Management
             return False, f"WhatsApp API connection failed: {str(e)}"
     
     @staticmethod
-    def send_complaint_notification(settings, admin_email, complaint, complainant_name, house_info):
-        """Send complaint notification to admin via email with HTML formatting"""
+    @instrument_notification('email')
+    def send_complaint_notification(settings, admin_email, complaint, complainant_name, house_info, server=None):
+        """Send complaint notification to admin via email with HTML formatting.
+        Pass an open `server` from open_smtp_connection to reuse it across recipients."""
         try:
             # Validate required fields
             if not settings.smtp_server or not settings.smtp_server.strip():
@@ -1020,6 +2501,10 @@ Society Management
             # Attach only HTML version
             msg.attach(MIMEText(html_body, 'html'))
             
+            if server is not None:
+                server.sendmail(settings.sender_email, admin_email, msg.as_string())
+                return True, "Complaint notification email sent successfully"
+            
             # Send email using SMTP
             server = smtplib.SMTP(smtp_server, settings.smtp_port)
             
@@ -1041,6 +2526,244 @@ Society Management
         except Exception as e:
             return False, f"Failed to send complaint notification email: {str(e)}"
     
+    @staticmethod
+    def open_smtp_connection(settings):
+        """Open and log in to the configured SMTP server so several messages can share one session"""
+        if not settings.smtp_server or not settings.smtp_server.strip():
+            raise smtplib.SMTPException("SMTP server address is required")
+        if not settings.smtp_port:
+            raise smtplib.SMTPException("SMTP port is required")
+        if not settings.smtp_username or not settings.smtp_password:
+            raise smtplib.SMTPException("SMTP username and password are required")
+        
+        server = smtplib.SMTP(settings.smtp_server.strip(), settings.smtp_port)
+        if settings.smtp_use_tls:
+            server.starttls()
+        server.login(settings.smtp_username.strip(), settings.smtp_password.strip())
+        return server
+    
+    @staticmethod
+    def notify_admins_of_complaint(settings, recipients, complaint, complainant_name, house_info):
+        """Send one complaint alert to every recipient over a single SMTP session"""
+        if not recipients:
+            return False, "No admin email addresses configured"
+        
+        try:
+            server = NotificationService.open_smtp_connection(settings)
+        except Exception as e:
+            return False, f"SMTP Connection failed: {str(e)}"
+        
+        failures = []
+        try:
+            for recipient in recipients:
+                success, message = NotificationService.send_complaint_notification(
+                    settings, recipient, complaint, complainant_name, house_info, server=server
+                )
+                if not success:
+                    failures.append(f"{recipient}: {message}")
+        finally:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                pass
+        
+        if failures:
+            return False, "; ".join(failures)
+        return True, f"Complaint notification sent to {len(recipients)} admin(s)"
+    
+    @staticmethod
+    @instrument_notification('email')
+    def send_complaint_digest(settings, recipients, complaints):
+        """Email one digest of complaints, grouped by category and priority, to every recipient"""
+        if not recipients:
+            return False, "No admin email addresses configured"
+        
+        groups = {}
+        for complaint in complaints:
+            groups.setdefault((complaint.category, complaint.priority), []).append(complaint)
+        priority_order = {'Urgent': 0, 'High': 1, 'Medium': 2, 'Low': 3}
+        
+        sections = []
+        for (category, priority), items in sorted(groups.items(), key=lambda item: (priority_order.get(item[0][1], 4), item[0][0])):
+            rows = ''.join(
+                f"<tr><td>#{c.id}</td><td>{escape(c.title)}</td>"
+                f"<td>{escape(c.house.house_number)} - {escape(c.house.building_wing)}</td>"
+                f"<td>{c.created_at.strftime('%d/%m/%Y %H:%M')}</td></tr>"
+                for c in items[:COMPLAINT_DIGEST_MAX_ROWS]
+            )
+            more = len(items) - COMPLAINT_DIGEST_MAX_ROWS
+            if more > 0:
+                rows += f"<tr><td colspan='4'>... and {more} more</td></tr>"
+            sections.append(
+                f"<h3>{escape(category.title())} &middot; {escape(priority)} ({len(items)})</h3>"
+                f"<table border='1' cellpadding='6' cellspacing='0' style='border-collapse:collapse;width:100%'>"
+                f"<tr><th>ID</th><th>Title</th><th>House</th><th>Raised</th></tr>{rows}</table>"
+            )
+        
+        html_body = f"""
+        <html>
+        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; color: #333;">
+            <h2>📋 Complaint Digest - {len(complaints)} new complaint(s)</h2>
+            {''.join(sections)}
+            <p style="color: #6c757d; font-size: 12px;">This is an automated digest from the Society Management System.
+            Please log in to the admin panel to review and take necessary action.</p>
+        </body>
+        </html>
+        """
+        
+        try:
+            server = NotificationService.open_smtp_connection(settings)
+            try:
+                for recipient in recipients:
+                    msg = MIMEMultipart()
+                    msg['From'] = settings.sender_email
+                    msg['To'] = recipient
+                    msg['Subject'] = f"📋 Complaint Digest - {len(complaints)} new complaint(s)"
+                    msg.attach(MIMEText(html_body, 'html'))
+                    server.sendmail(settings.sender_email, recipient, msg.as_string())
+            finally:
+                server.quit()
+            return True, f"Complaint digest sent to {len(recipients)} admin(s)"
+        except smtplib.SMTPException as e:
+            return False, f"SMTP Error: {str(e)}"
+        except Exception as e:
+            return False, f"Failed to send complaint digest: {str(e)}"
+    
+    @staticmethod
+    @instrument_notification('email')
+    def send_dues_reminder_email(settings, server, recipient_email, reminder):
+        """Send a consolidated dues reminder over an open SMTP session"""
+        try:
+            rows = ''.join(
+                f"<tr><td>{line['month_year']}</td><td>₹{line['amount']:.2f}</td>"
+                f"<td>₹{line['paid_amount']:.2f}</td><td><strong>₹{line['outstanding']:.2f}</strong></td></tr>"
+                for line in reminder['lines']
+            )
+            html_body = f"""
+            <html>
+            <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; color: #333;">
+                <h2>🔔 Maintenance Dues Reminder</h2>
+                <p>Dear {reminder['owner_name']},</p>
+                <p>Our records show <strong>₹{reminder['amount_due']:.2f}</strong> outstanding for
+                {reminder['house_number']} - {reminder['building_wing']} across {reminder['months_overdue']} month(s):</p>
+                <table border="1" cellpadding="6" cellspacing="0" style="border-collapse: collapse;">
+                    <tr><th>Month/Year</th><th>Amount</th><th>Paid</th><th>Outstanding</th></tr>
+                    {rows}
+                </table>
+                <p>Please clear the dues at the earliest. Ignore this reminder if you have already paid.</p>
+                <p>Best regards,<br>{settings.sender_name or 'Society Management'}</p>
+            </body>
+            </html>
+            """
+            msg = MIMEMultipart()
+            msg['From'] = settings.sender_email
+            msg['To'] = recipient_email
+            msg['Subject'] = f"🔔 Maintenance Dues Reminder - {reminder['house_number']}"
+            msg.attach(MIMEText(html_body, 'html'))
+            server.sendmail(settings.sender_email, recipient_email, msg.as_string())
+            return True, "Dues reminder email sent successfully"
+        except smtplib.SMTPException as e:
+            return False, f"SMTP Error: {str(e)}"
+        except Exception as e:
+            return False, f"Failed to send dues reminder email: {str(e)}"
+    
+    @staticmethod
+    @instrument_notification('whatsapp')
+    def send_dues_reminder_whatsapp(settings, http, recipient_phone, reminder):
+        """Send a consolidated dues reminder via WhatsApp using a pooled requests session"""
+        try:
+            lines = '\n'.join(f"• {line['month_year']}: ₹{line['outstanding']:.2f}" for line in reminder['lines'])
+            message = f"""
+*Maintenance Dues Reminder*
+
+Dear {reminder['owner_name']},
+
+*House:* {reminder['house_number']} - {reminder['building_wing']}
+*Total Outstanding:* ₹{reminder['amount_due']:.2f}
+
+{lines}
+
+Please clear the dues at the earliest. Ignore this reminder if you have already paid.
+
+Best regards,
+{settings.sender_name}
+Society Management
+            """
+            response = http.post(settings.whatsapp_api_url, json={'to': recipient_phone, 'message': message}, headers={
+                'Authorization': f'Bearer {settings.whatsapp_api_key}',
+                'Content-Type': 'application/json'
+            }, timeout=30)
+            if response.status_code == 200:
+                return True, "WhatsApp message sent successfully"
+            return False, f"WhatsApp API error: {response.status_code} - {response.text}"
+        except Exception as e:
+            return False, f"Failed to send WhatsApp message: {str(e)}"
+
+    @staticmethod
+    def render_announcement_email(settings, announcement):
+        """Render an announcement once as a complete email, minus the To header added per recipient"""
+        paragraphs = ''.join(f"<p>{escape(paragraph)}</p>" for paragraph in announcement['body'].split('\n\n'))
+        html_body = f"""
+        <html>
+        <body style="font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; color: #333;">
+            <h2>📢 {escape(announcement['title'])}</h2>
+            <p><strong>{announcement['category']}</strong> notice for {escape(announcement['audience_label'])}</p>
+            {paragraphs}
+            <p>Best regards,<br>{escape(settings.sender_name or 'Society Management')}</p>
+        </body>
+        </html>
+        """
+        msg = MIMEMultipart()
+        msg['From'] = settings.sender_email
+        msg['Subject'] = f"📢 {announcement['category']}: {announcement['title']}"
+        msg.attach(MIMEText(html_body, 'html'))
+        return msg.as_string()
+
+    @staticmethod
+    @instrument_notification('email')
+    def send_announcement_email(settings, server, recipient_email, message):
+        """Send a pre-rendered announcement over an open SMTP session.
+
+        A dropped session is raised rather than reported, so the caller can reconnect and retry.
+        """
+        try:
+            server.sendmail(settings.sender_email, recipient_email, f"To: {recipient_email}\n{message}")
+            return True, "Announcement email sent successfully"
+        except smtplib.SMTPServerDisconnected:
+            raise
+        except smtplib.SMTPException as e:
+            return False, f"SMTP Error: {str(e)}"
+        except Exception as e:
+            return False, f"Failed to send announcement email: {str(e)}"
+
+    @staticmethod
+    def render_announcement_whatsapp(settings, announcement):
+        """Render an announcement once as a WhatsApp message"""
+        return f"""
+*📢 {announcement['category']}: {announcement['title']}*
+
+{announcement['body']}
+
+Best regards,
+{settings.sender_name}
+Society Management
+        """
+
+    @staticmethod
+    @instrument_notification('whatsapp')
+    def send_announcement_whatsapp(settings, http, recipient_phone, message):
+        """Send a pre-rendered announcement via WhatsApp using a pooled requests session"""
+        try:
+            response = http.post(settings.whatsapp_api_url, json={'to': recipient_phone, 'message': message}, headers={
+                'Authorization': f'Bearer {settings.whatsapp_api_key}',
+                'Content-Type': 'application/json'
+            }, timeout=30)
+            if response.status_code == 200:
+                return True, "WhatsApp message sent successfully"
+            return False, f"WhatsApp API error: {response.status_code} - {response.text}"
+        except Exception as e:
+            return False, f"Failed to send WhatsApp message: {str(e)}"
+
     @staticmethod
     def generate_pdf_receipt(maintenance_record, sender_name):
         """Generate PDF receipt for maintenance payment"""
@@ -1169,6 +2892,1017 @@ Society Management
             print(f"Error generating PDF: {str(e)}")
             return None
 
+# Complaint Notification Fan-out
+def get_complaint_recipients():
+    """On-call addresses if configured, otherwise every admin with an email address"""
+    if app.config['COMPLAINT_ONCALL_EMAILS']:
+        return list(app.config['COMPLAINT_ONCALL_EMAILS'])
+    admin_emails = db.session.query(User.email).filter(User.is_admin == True, User.email != None, User.email != '').all()
+    return [email for (email,) in admin_emails]
+
+def claim_complaint_notifications(complaint_ids):
+    """Mark complaints notified if nobody has yet and commit; returns the ids this call claimed.
+
+    Each row is claimed on its own and kept only if this call's UPDATE changed it; a concurrent
+    claim waits on the row lock and then finds notified_at already set. Senders release the
+    claim with release_complaint_notifications() when the email fails.
+    """
+    table = Complaint.__table__
+    claimed_at = datetime.utcnow()
+    claimed_ids = [complaint_id for complaint_id in complaint_ids if db.session.execute(
+        table.update().where(table.c.id == complaint_id, table.c.notified_at.is_(None)).values(notified_at=claimed_at)
+    ).rowcount == 1]
+    mark_data_changed(db.session, [table.name])
+    db.session.commit()
+    return claimed_ids
+
+def release_complaint_notifications(complaint_ids):
+    """Undo a claim after the email failed, so the next digest retries these complaints"""
+    Complaint.query.filter(Complaint.id.in_(complaint_ids)).update({'notified_at': None}, synchronize_session=False)
+    db.session.commit()
+
+def alert_admins_of_urgent_complaint(complaint, complainant_name):
+    """Email every admin about a newly raised urgent complaint now instead of in the next digest.
+
+    The complaint is claimed first, the way the digest claims it, so a digest running during
+    the send cannot email it again. Returns (success, message); on failure the claim is released
+    and the complaint goes out with the next digest.
+    """
+    settings = NotificationSettings.get_by_type('smtp')
+    if not settings:
+        return False, "Email notifications are not configured"
+    recipients = get_complaint_recipients()
+    if not recipients:
+        return False, "No admin email addresses configured"
+    if not claim_complaint_notifications([complaint.id]):
+        return True, "Already sent in a complaint digest"
+    house_info = f"{complaint.house.house_number} - {complaint.house.building_wing}"
+    try:
+        success, message = NotificationService.notify_admins_of_complaint(
+            settings, recipients, complaint, complainant_name, house_info
+        )
+    except Exception as e:
+        success, message = False, str(e)
+    if not success:
+        release_complaint_notifications([complaint.id])
+    return success, message
+
+def send_pending_complaint_digest():
+    """Email all complaints not yet notified as one digest. Returns (success, complaint_count, message)"""
+    settings = NotificationSettings.get_by_type('smtp')
+    if not settings:
+        return False, 0, "SMTP notifications are not configured"
+    
+    pending_ids = [complaint_id for (complaint_id,) in
+                   db.session.query(Complaint.id).filter(Complaint.notified_at.is_(None)).all()]
+    if not pending_ids:
+        return True, 0, "No new complaints"
+    # End the read, so on SQLite the claim transaction takes the write lock with its first UPDATE
+    # instead of upgrading a read snapshot that an overlapping run may already have made stale
+    db.session.commit()
+    
+    # Claim the rows first so an overlapping run or urgent alert cannot send them twice
+    claimed_ids = claim_complaint_notifications(pending_ids)
+    if not claimed_ids:
+        return True, 0, "No new complaints"
+    complaints = Complaint.query.filter(Complaint.id.in_(claimed_ids)).order_by(Complaint.created_at).all()
+    
+    success, message = NotificationService.send_complaint_digest(settings, get_complaint_recipients(), complaints)
+    if not success:
+        release_complaint_notifications(claimed_ids)
+        return False, 0, message
+    return True, len(complaints), message
+
+# Complaint SLA Analytics
+COMPLAINT_PRIORITIES = ['Urgent', 'High', 'Medium', 'Low']
+
+def _sla_key(moment, category, priority):
+    return (moment.year * 12 + moment.month - 1, category, priority)
+
+def complaint_sla_increments(complaint, old_status=None, old_priority=None):
+    """Counter changes [(key, stat increments, histogram bucket or None)] for one complaint.
+
+    With old_status None the complaint is counted as newly raised in its current state;
+    otherwise as moving from old_status/old_priority to its current status and priority.
+    """
+    category, priority = complaint.category, complaint.priority
+    changes = []
+    if old_status is None:
+        changes.append((_sla_key(complaint.created_at, category, priority), {'opened': 1}, None))
+        old_status = 'Open'
+    elif old_priority != priority and old_status != 'Resolved':
+        # The open complaint now counts towards the other priority's backlog
+        changes.append((_sla_key(complaint.created_at, category, old_priority), {'opened': -1}, None))
+        changes.append((_sla_key(complaint.created_at, category, priority), {'opened': 1}, None))
+
+    if old_status != 'Resolved' and complaint.status == 'Resolved':
+        resolved_at = complaint.resolved_at or datetime.utcnow()
+        seconds = max((resolved_at - complaint.created_at).total_seconds(), 0.0)
+        hours = seconds / 3600
+        breached = hours > app.config['COMPLAINT_SLA_HOURS'].get(priority, math.inf)
+        changes.append((_sla_key(resolved_at, category, priority),
+                        {'resolved': 1, 'breached': int(breached), 'resolve_seconds': seconds},
+                        bisect.bisect_left(SLA_BUCKET_HOURS, hours)))
+    elif old_status == 'Resolved' and complaint.status != 'Resolved':
+        changes.append((_sla_key(datetime.utcnow(), category, priority), {'reopened': 1}, None))
+    return changes
+
+def _merge_sla_changes(changes, stats, buckets):
+    for key, increments, bucket in changes:
+        totals = stats.setdefault(key, {})
+        for name, value in increments.items():
+            totals[name] = totals.get(name, 0) + value
+        if bucket is not None:
+            buckets[key + (bucket,)] = buckets.get(key + (bucket,), 0) + 1
+
+def _increment_counters(connection, table, key_names, rows):
+    """Add each row's counter values to the row with the same key, creating it on first use.
+
+    One upsert per row, so concurrent transitions never lose an increment or race on the insert.
+    """
+    from sqlalchemy.dialects import mysql, postgresql, sqlite
+    for row in rows:
+        increments = [name for name in row if name not in key_names]
+        if connection.dialect.name == 'mysql':
+            statement = mysql.insert(table).values(row)
+            statement = statement.on_duplicate_key_update({name: table.c[name] + statement.inserted[name]
+                                                           for name in increments})
+        else:
+            dialect = postgresql if connection.dialect.name == 'postgresql' else sqlite
+            statement = dialect.insert(table).values(row)
+            statement = statement.on_conflict_do_update(index_elements=key_names, set_={
+                name: table.c[name] + statement.excluded[name] for name in increments})
+        connection.execute(statement)
+
+def _write_sla_changes(connection, stats, buckets, empty_tables=False):
+    stat_keys = ['period', 'category', 'priority']
+    stat_rows = [{'period': period, 'category': category, 'priority': priority, 'opened': 0, 'resolved': 0,
+                  'reopened': 0, 'breached': 0, 'resolve_seconds': 0.0, **totals}
+                 for (period, category, priority), totals in stats.items()]
+    bucket_rows = [{'period': period, 'category': category, 'priority': priority, 'bucket': bucket, 'count': count}
+                   for (period, category, priority, bucket), count in buckets.items()]
+    for table, key_names, rows in ((ComplaintSlaStat.__table__, stat_keys, stat_rows),
+                                   (ComplaintResolutionBucket.__table__, stat_keys + ['bucket'], bucket_rows)):
+        if empty_tables:
+            if rows:
+                connection.execute(table.insert(), rows)
+        else:
+            _increment_counters(connection, table, key_names, rows)
+
+@event.listens_for(Complaint.status, 'set', active_history=True)
+@event.listens_for(Complaint.priority, 'set', active_history=True)
+def _load_previous_complaint_state(target, value, oldvalue, initiator):
+    """Registered only for active_history: the old value is loaded on assignment, even on an expired complaint"""
+
+@event.listens_for(Session, 'after_flush')
+def _count_complaint_transitions(session, flush_context):
+    """Keep the SLA counters in step with every raised complaint and status or priority change"""
+    stats, buckets = {}, {}
+    for complaint in session.new:
+        if isinstance(complaint, Complaint):
+            _merge_sla_changes(complaint_sla_increments(complaint), stats, buckets)
+    for complaint in session.dirty:
+        if not isinstance(complaint, Complaint):
+            continue
+        state = db.inspect(complaint)
+        status_history, priority_history = state.attrs.status.history, state.attrs.priority.history
+        if not status_history.deleted and not priority_history.deleted:
+            continue
+        old_status = status_history.deleted[0] if status_history.deleted else complaint.status
+        old_priority = priority_history.deleted[0] if priority_history.deleted else complaint.priority
+        _merge_sla_changes(complaint_sla_increments(complaint, old_status, old_priority), stats, buckets)
+    if stats:
+        _write_sla_changes(session.connection(), stats, buckets)
+
+def rebuild_complaint_stats():
+    """Recount the SLA counters from every live and archived complaint; returns complaints counted.
+
+    Needed once for complaints raised before the counters existed, and after changing
+    COMPLAINT_SLA_HOURS, which otherwise only applies to complaints resolved from then on.
+    Reopen history is not recorded on complaints, so it is not recounted.
+    """
+    stats, buckets = {}, {}
+    counted = 0
+    live = db.session.query(Complaint.category, Complaint.priority, Complaint.status, Complaint.created_at,
+                            Complaint.resolved_at).yield_per(5000)
+    for row in live:
+        _merge_sla_changes(complaint_sla_increments(row), stats, buckets)
+        counted += 1
+    for entry in archive_parts('complaint'):
+        if entry['state'] != 'purged':
+            continue  # Its rows are still in the live table
+        for row in iter_archive_rows(entry):
+            complaint = SimpleNamespace(**row)
+            complaint.created_at = datetime.fromisoformat(row['created_at'])
+            complaint.resolved_at = row['resolved_at'] and datetime.fromisoformat(row['resolved_at'])
+            _merge_sla_changes(complaint_sla_increments(complaint), stats, buckets)
+            counted += 1
+
+    ComplaintSlaStat.query.delete(synchronize_session=False)
+    ComplaintResolutionBucket.query.delete(synchronize_session=False)
+    _write_sla_changes(db.session.connection(), stats, buckets, empty_tables=True)
+    db.session.commit()
+    return counted
+
+def histogram_percentile(counts, fraction):
+    """Hours at `fraction` of a resolution histogram, interpolated within the bucket; inf past the last bound"""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = fraction * total
+    seen = 0
+    for bucket, count in enumerate(counts):
+        if count and seen + count >= rank:
+            if bucket == len(SLA_BUCKET_HOURS):
+                return math.inf
+            lower = SLA_BUCKET_HOURS[bucket - 1] if bucket else 0
+            return lower + (SLA_BUCKET_HOURS[bucket] - lower) * (rank - seen) / count
+        seen += count
+    return math.inf
+
+def format_hours(hours):
+    if hours is None:
+        return '—'
+    if hours == math.inf:
+        return f'> {SLA_BUCKET_HOURS[-1] // 24}d'
+    return f'{hours:.1f}h' if hours < 48 else f'{hours / 24:.1f}d'
+
+def complaint_sla_summary(months=6, today=None):
+    """SLA dashboard figures read from the pre-aggregated counters.
+
+    The backlog covers all time; raised, resolved, breaches and time-to-resolve cover the last
+    `months` calendar months. Only the overdue count reads complaints, and then only open ones.
+    """
+    first_period = current_period(today) - months + 1
+    targets = app.config['COMPLAINT_SLA_HOURS']
+    groups = {}
+
+    def group(category, priority):
+        return groups.setdefault((category, priority), {
+            'category': category, 'priority': priority, 'backlog': 0, 'overdue': 0, 'opened': 0, 'resolved': 0,
+            'breached': 0, 'resolve_seconds': 0.0, 'histogram': [0] * (len(SLA_BUCKET_HOURS) + 1)})
+
+    for category, priority, backlog in db.session.query(
+            ComplaintSlaStat.category, ComplaintSlaStat.priority,
+            func.sum(ComplaintSlaStat.opened - ComplaintSlaStat.resolved + ComplaintSlaStat.reopened)
+    ).group_by(ComplaintSlaStat.category, ComplaintSlaStat.priority):
+        group(category, priority)['backlog'] = int(backlog or 0)
+
+    now = datetime.utcnow()
+    for category, priority, overdue in db.session.query(
+            Complaint.category, Complaint.priority, func.count(Complaint.id)
+    ).filter(Complaint.status.in_(['Open', 'In Progress']), or_(*[
+            and_(Complaint.priority == priority, Complaint.created_at < now - timedelta(hours=hours))
+            for priority, hours in targets.items()])
+    ).group_by(Complaint.category, Complaint.priority):
+        group(category, priority)['overdue'] = overdue
+
+    monthly = OrderedDict((period, {'month_year': month_year_from_period(period), 'opened': 0, 'resolved': 0,
+                                    'breached': 0, 'histogram': [0] * (len(SLA_BUCKET_HOURS) + 1)})
+                          for period in range(first_period + months - 1, first_period - 1, -1))
+    for stat in ComplaintSlaStat.query.filter(ComplaintSlaStat.period >= first_period):
+        for counts in (group(stat.category, stat.priority), monthly.get(stat.period)):
+            if counts is None:
+                continue  # Dated in the future by a skewed clock
+            counts['opened'] += stat.opened
+            counts['resolved'] += stat.resolved
+            counts['breached'] += stat.breached
+        group(stat.category, stat.priority)['resolve_seconds'] += stat.resolve_seconds
+    for bucket in ComplaintResolutionBucket.query.filter(ComplaintResolutionBucket.period >= first_period):
+        group(bucket.category, bucket.priority)['histogram'][bucket.bucket] += bucket.count
+        if bucket.period in monthly:
+            monthly[bucket.period]['histogram'][bucket.bucket] += bucket.count
+
+    rank = {priority: index for index, priority in enumerate(COMPLAINT_PRIORITIES)}
+    rows = sorted(groups.values(), key=lambda row: (rank.get(row['priority'], len(rank)), row['category']))
+    totals = {'backlog': 0, 'overdue': 0, 'opened': 0, 'resolved': 0, 'breached': 0,
+              'histogram': [0] * (len(SLA_BUCKET_HOURS) + 1)}
+    for row in rows:
+        for name in ('backlog', 'overdue', 'opened', 'resolved', 'breached'):
+            totals[name] += row[name]
+        totals['histogram'] = [a + b for a, b in zip(totals['histogram'], row['histogram'])]
+        row['average'] = row['resolve_seconds'] / 3600 / row['resolved'] if row['resolved'] else None
+    for counts in chain(rows, monthly.values(), [totals]):
+        counts['p50'] = histogram_percentile(counts['histogram'], 0.5)
+        counts['p90'] = histogram_percentile(counts['histogram'], 0.9)
+        counts['breach_rate'] = round(100 * counts['breached'] / counts['resolved']) if counts['resolved'] else None
+    return {'groups': rows, 'months': list(monthly.values()), 'totals': totals, 'targets': targets}
+
+# Dues Reminders
+class RateLimiter:
+    """Spaces calls evenly so that at most `per_second` happen each second, across threads"""
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+    
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+def settings_snapshot(settings):
+    """Detached copy of notification settings, safe to read from worker threads"""
+    if settings is None:
+        return None
+    return SimpleNamespace(**{column.name: getattr(settings, column.name) for column in settings.__table__.columns})
+
+def find_overdue_dues(as_of=None):
+    """Every house with Pending/Partial maintenance for months before `as_of`, with its breakdown.
+
+    Two set-based queries regardless of society size: one grouped query for the per-house
+    totals and one for the itemised rows.
+    """
+    outstanding = Maintenance.amount - func.coalesce(Maintenance.paid_amount, 0)
+    overdue = (Maintenance.payment_status.in_(['Pending', 'Partial']), Maintenance.period < current_period(as_of))
+    
+    totals = db.session.query(
+        House.id, House.house_number, House.building_wing, House.owner_name, House.email, House.contact_number,
+        func.count(Maintenance.id), func.sum(outstanding)
+    ).join(Maintenance, Maintenance.house_id == House.id).filter(*overdue).group_by(
+        House.id, House.house_number, House.building_wing, House.owner_name, House.email, House.contact_number
+    ).all()
+    
+    details = db.session.query(
+        Maintenance.house_id, Maintenance.month_year, Maintenance.amount, func.coalesce(Maintenance.paid_amount, 0)
+    ).filter(*overdue).order_by(Maintenance.house_id, Maintenance.period.desc()).all()
+    lines_by_house = {}
+    for house_id, rows in groupby(details, key=lambda row: row[0]):
+        lines = [{'month_year': month_year, 'amount': amount, 'paid_amount': paid, 'outstanding': amount - paid}
+                 for _, month_year, amount, paid in rows]
+        if len(lines) > REMINDER_BREAKDOWN_MONTHS:
+            older = lines[REMINDER_BREAKDOWN_MONTHS:]
+            lines = lines[:REMINDER_BREAKDOWN_MONTHS] + [{
+                'month_year': f"{older[-1]['month_year']} to {older[0]['month_year']}",
+                'amount': sum(line['amount'] for line in older),
+                'paid_amount': sum(line['paid_amount'] for line in older),
+                'outstanding': sum(line['outstanding'] for line in older),
+            }]
+        lines_by_house[house_id] = lines
+    
+    reminders = []
+    for house_id, house_number, building_wing, owner_name, email, contact_number, months, amount_due in totals:
+        if not amount_due or amount_due <= 0:
+            continue
+        reminders.append({
+            'house_id': house_id, 'house_number': house_number, 'building_wing': building_wing,
+            'owner_name': owner_name, 'email': email, 'contact_number': contact_number,
+            'months_overdue': months, 'amount_due': float(amount_due), 'lines': lines_by_house.get(house_id, []),
+        })
+    return reminders
+
+def _send_reminder_batch(channel, settings, batch, limiter):
+    """Send one batch over a single SMTP session or pooled HTTP session; returns result rows"""
+    results = []
+    if channel == 'smtp':
+        try:
+            connection = NotificationService.open_smtp_connection(settings)
+        except Exception as e:
+            return [(reminder, False, f"SMTP Connection failed: {str(e)}") for reminder in batch]
+        send = lambda reminder: NotificationService.send_dues_reminder_email(settings, connection, reminder['email'], reminder)
+    else:
+        connection = requests.Session()
+        send = lambda reminder: NotificationService.send_dues_reminder_whatsapp(settings, connection, reminder['contact_number'], reminder)
+    
+    try:
+        for reminder in batch:
+            limiter.wait()
+            success, message = send(reminder)
+            results.append((reminder, success, message))
+    finally:
+        try:
+            connection.quit() if channel == 'smtp' else connection.close()
+        except Exception:
+            pass
+    return results
+
+def send_dues_reminders(cycle=None, as_of=None, dry_run=False):
+    """Send one consolidated reminder per overdue house on every active channel.
+
+    A house already reminded on a channel in this cycle (default: today's date) is skipped,
+    so the job can be re-run safely. Returns a dict of counts.
+    """
+    cycle = cycle or date.today().isoformat()
+    reminders = find_overdue_dues(as_of)
+    channels = {}
+    for channel in ('smtp', 'whatsapp'):
+        settings = settings_snapshot(NotificationSettings.get_by_type(channel))
+        if settings:
+            channels[channel] = settings
+    
+    already_sent = set(db.session.query(DuesReminder.house_id, DuesReminder.channel)
+                       .filter_by(cycle=cycle, status='Sent').all())
+    stats = {'overdue_houses': len(reminders), 'sent': 0, 'failed': 0, 'skipped': 0, 'no_contact': 0}
+    work = []
+    for channel in channels:
+        contact_field = 'email' if channel == 'smtp' else 'contact_number'
+        for reminder in reminders:
+            if (reminder['house_id'], channel) in already_sent:
+                stats['skipped'] += 1
+            elif not reminder[contact_field]:
+                stats['no_contact'] += 1
+            else:
+                work.append((channel, reminder))
+    if dry_run or not work:
+        stats['pending'] = len(work)
+        return stats
+    
+    # Earlier failures in this cycle are replaced by this run's outcome
+    DuesReminder.query.filter(DuesReminder.cycle == cycle, DuesReminder.status != 'Sent').delete(synchronize_session=False)
+    db.session.commit()
+    
+    batch_size = app.config['REMINDER_BATCH_SIZE']
+    limiter = RateLimiter(app.config['REMINDER_MAX_PER_SECOND'])
+    reminder_table = DuesReminder.__table__
+    with ThreadPoolExecutor(max_workers=app.config['REMINDER_WORKERS']) as executor:
+        futures = []
+        for channel in channels:
+            channel_work = [reminder for work_channel, reminder in work if work_channel == channel]
+            for start in range(0, len(channel_work), batch_size):
+                batch = channel_work[start:start + batch_size]
+                futures.append((channel, executor.submit(_send_reminder_batch, channel, channels[channel], batch, limiter)))
+        
+        future_channels = {future: channel for channel, future in futures}
+        for future in as_completed(future_channels):
+            channel = future_channels[future]
+            now = datetime.utcnow()
+            rows = []
+            for reminder, success, message in future.result():
+                stats['sent' if success else 'failed'] += 1
+                rows.append({
+                    'house_id': reminder['house_id'], 'cycle': cycle, 'channel': channel,
+                    'months_overdue': reminder['months_overdue'], 'amount_due': reminder['amount_due'],
+                    'status': 'Sent' if success else 'Failed', 'error': None if success else message[:255],
+                    'sent_at': now,
+                })
+            # Record each batch as it finishes so a crash mid-run only repeats unfinished batches
+            if rows:
+                db.session.execute(reminder_table.insert(), rows)
+                db.session.commit()
+    return stats
+
+# Announcements
+def announcement_audience_label(audience, building_wing=None):
+    who = 'owners' if audience == 'owners' else 'all residents'
+    return f"{who} of {building_wing}" if building_wing else who
+
+def announcement_recipients(audience, building_wing=None):
+    """(house_id, email, phone) for everyone an announcement reaches, resolved in one query.
+
+    Owners are reached on their house's contact details; unless the audience is owners only,
+    tenants are also reached on their own contact number. Tenants without one are not reached
+    (their emergency contact is a different person).
+    """
+    owners = select(House.id, House.email, House.contact_number)
+    tenants = select(Member.house_id, null(), Member.contact_number).join(House, House.id == Member.house_id) \
+        .where(Member.role == 'Tenant', Member.contact_number.isnot(None))
+    if building_wing:
+        owners = owners.where(House.building_wing == building_wing)
+        tenants = tenants.where(House.building_wing == building_wing)
+    return db.session.execute(owners if audience == 'owners' else owners.union_all(tenants)).all()
+
+def queue_announcement_broadcast(announcement):
+    """Queue a broadcast of a board-only announcement, or a retry of a partly failed one.
+
+    The first broadcast resolves recipients into one Pending delivery per channel and address;
+    a retry puts the Failed deliveries back to Pending. Returns the number of deliveries queued.
+    """
+    delivery_table = AnnouncementDelivery.__table__
+    if announcement.broadcast_status == 'partial':
+        queued = db.session.execute(
+            delivery_table.update()
+            .where(delivery_table.c.announcement_id == announcement.id, delivery_table.c.status == 'Failed')
+            .values(status='Pending', error=None)
+        ).rowcount
+    else:
+        rows, seen = [], set()
+        for house_id, email, phone in announcement_recipients(announcement.audience, announcement.building_wing):
+            for channel, address in (('smtp', email), ('whatsapp', phone)):
+                address = (address or '').strip()
+                if channel not in announcement.channel_list or not address or (channel, address.lower()) in seen:
+                    continue
+                seen.add((channel, address.lower()))
+                rows.append({'announcement_id': announcement.id, 'house_id': house_id, 'channel': channel,
+                             'recipient': address, 'status': 'Pending'})
+        batch_size = app.config['ANNOUNCEMENT_BATCH_SIZE']
+        for start in range(0, len(rows), batch_size):
+            db.session.execute(delivery_table.insert(), rows[start:start + batch_size])
+        queued = len(rows)
+    announcement.broadcast_status = 'queued'
+    announcement.broadcast_finished_at = None
+    db.session.commit()
+    return queued
+
+def _claim_announcement(announcement_id):
+    """Take the broadcast lease if the announcement is queued or its previous sender stopped renewing it"""
+    table = Announcement.__table__
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        table.update()
+        .where(table.c.id == announcement_id, or_(
+            table.c.broadcast_status == 'queued',
+            and_(table.c.broadcast_status == 'sending',
+                 table.c.broadcast_renewed_at < now - timedelta(seconds=ANNOUNCEMENT_LEASE_SECONDS))))
+        .values(broadcast_status='sending', broadcast_renewed_at=now,
+                broadcast_started_at=func.coalesce(table.c.broadcast_started_at, now))
+    ).rowcount == 1
+    if claimed:
+        mark_data_changed(db.session, [table.name])
+    db.session.commit()
+    return claimed
+
+class AnnouncementSender:
+    """Sends one channel's deliveries over sessions pooled per worker thread, rate limited across threads"""
+    def __init__(self, channel, settings, message, per_second):
+        self.channel = channel
+        self.settings = settings
+        self.message = message
+        self.limiter = RateLimiter(per_second)
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            if self.channel == 'smtp':
+                connection = NotificationService.open_smtp_connection(self.settings)
+            else:
+                connection = requests.Session()
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _deliver(self, recipient):
+        if self.channel == 'smtp':
+            return NotificationService.send_announcement_email(self.settings, self._connection(), recipient, self.message)
+        return NotificationService.send_announcement_whatsapp(self.settings, self._connection(), recipient, self.message)
+
+    def send_batch(self, batch):
+        """[(delivery_id, success, message)] for a batch of (delivery_id, recipient)"""
+        results = []
+        for position, (delivery_id, recipient) in enumerate(batch):
+            self.limiter.wait()
+            try:
+                try:
+                    success, message = self._deliver(recipient)
+                except smtplib.SMTPServerDisconnected:
+                    # The server dropped an idle or overused session; reconnect once
+                    self._local.connection = None
+                    success, message = self._deliver(recipient)
+            except Exception as e:
+                # No session could be opened, so the rest of the batch would fail the same way
+                error = f"{'SMTP' if self.channel == 'smtp' else 'WhatsApp'} connection failed: {str(e)}"
+                results += [(pending_id, False, error) for pending_id, _ in batch[position:]]
+                break
+            results.append((delivery_id, success, message))
+        return results
+
+    def close(self):
+        for connection in self._connections:
+            try:
+                connection.quit() if self.channel == 'smtp' else connection.close()
+            except Exception:
+                pass
+
+def send_announcement(announcement_id):
+    """Deliver every unsent message of a queued broadcast; returns counts, or None if it was not claimable.
+
+    The message is rendered once per channel and fanned out in batches over pooled SMTP sessions
+    and throttled WhatsApp sessions, both channels in parallel. Outcomes are written per batch and
+    the lease renewed with them, so a broadcast abandoned mid-way is resumed from its unsent deliveries.
+    """
+    if not _claim_announcement(announcement_id):
+        return None
+    announcement = Announcement.query.get(announcement_id)
+    content = {
+        'title': announcement.title, 'body': announcement.body, 'category': announcement.category,
+        'audience_label': announcement_audience_label(announcement.audience, announcement.building_wing),
+    }
+    delivery_table = AnnouncementDelivery.__table__
+    announcement_table = Announcement.__table__
+    pending = db.session.execute(
+        select(delivery_table.c.id, delivery_table.c.channel, delivery_table.c.recipient)
+        .where(delivery_table.c.announcement_id == announcement_id, delivery_table.c.status != 'Sent')
+        .order_by(delivery_table.c.id)
+    ).all()
+
+    senders = {}
+    for channel, workers_key, rate_key in (('smtp', 'ANNOUNCEMENT_SMTP_CONNECTIONS', 'ANNOUNCEMENT_EMAIL_PER_SECOND'),
+                                           ('whatsapp', 'ANNOUNCEMENT_WHATSAPP_WORKERS', 'ANNOUNCEMENT_WHATSAPP_PER_SECOND')):
+        settings = settings_snapshot(NotificationSettings.get_by_type(channel))
+        if settings:
+            render = NotificationService.render_announcement_email if channel == 'smtp' \
+                else NotificationService.render_announcement_whatsapp
+            senders[channel] = (AnnouncementSender(channel, settings, render(settings, content), app.config[rate_key]),
+                                ThreadPoolExecutor(max_workers=app.config[workers_key]))
+
+    stats = {'sent': 0, 'failed': 0}
+    record_statement = delivery_table.update().where(delivery_table.c.id == bindparam('delivery_id')).values(
+        status=bindparam('new_status'), error=bindparam('new_error'), sent_at=bindparam('new_sent_at'))
+
+    def record(results):
+        now = datetime.utcnow()
+        rows = []
+        for delivery_id, success, message in results:
+            stats['sent' if success else 'failed'] += 1
+            rows.append({'delivery_id': delivery_id, 'new_status': 'Sent' if success else 'Failed',
+                         'new_error': None if success else message[:255], 'new_sent_at': now if success else None})
+        if rows:
+            db.session.execute(record_statement, rows)
+        db.session.execute(announcement_table.update().where(announcement_table.c.id == announcement_id)
+                           .values(broadcast_renewed_at=now))
+        db.session.commit()
+
+    batch_size = app.config['ANNOUNCEMENT_BATCH_SIZE']
+    try:
+        futures = []
+        for channel in ANNOUNCEMENT_CHANNELS:
+            work = [(delivery_id, recipient) for delivery_id, row_channel, recipient in pending if row_channel == channel]
+            if channel not in senders:
+                label = 'SMTP' if channel == 'smtp' else 'WhatsApp'
+                record([(delivery_id, False, f"{label} notifications are not configured") for delivery_id, _ in work])
+                continue
+            sender, executor = senders[channel]
+            futures += [executor.submit(sender.send_batch, work[start:start + batch_size])
+                        for start in range(0, len(work), batch_size)]
+        for future in as_completed(futures):
+            record(future.result())
+    finally:
+        for sender, executor in senders.values():
+            executor.shutdown(wait=True)
+            sender.close()
+
+    unsent = db.session.query(func.count(AnnouncementDelivery.id)).filter(
+        AnnouncementDelivery.announcement_id == announcement_id, AnnouncementDelivery.status != 'Sent').scalar()
+    db.session.execute(announcement_table.update().where(announcement_table.c.id == announcement_id).values(
+        broadcast_status='partial' if unsent else 'completed', broadcast_finished_at=datetime.utcnow()))
+    mark_data_changed(db.session, [announcement_table.name])
+    db.session.commit()
+    return stats
+
+def start_announcement_broadcast(announcement_id):
+    """Send a queued broadcast from a background thread of this process"""
+    def run():
+        with app.app_context():
+            try:
+                send_announcement(announcement_id)
+            except Exception:
+                # The lease lapses and `scheduled_jobs.py announcements` resumes the broadcast
+                logging.getLogger('society.announcements').exception('Broadcast of announcement %d failed', announcement_id)
+    threading.Thread(target=run, name=f'announcement-{announcement_id}', daemon=True).start()
+
+def resume_announcement_broadcasts():
+    """Send queued broadcasts and resume abandoned ones; returns {announcement_id: counts}"""
+    stale = datetime.utcnow() - timedelta(seconds=ANNOUNCEMENT_LEASE_SECONDS)
+    announcement_ids = [row[0] for row in db.session.query(Announcement.id).filter(or_(
+        Announcement.broadcast_status == 'queued',
+        and_(Announcement.broadcast_status == 'sending', Announcement.broadcast_renewed_at < stale))
+    ).order_by(Announcement.id)]
+    results = {}
+    for announcement_id in announcement_ids:
+        stats = send_announcement(announcement_id)
+        if stats is not None:
+            results[announcement_id] = stats
+    return results
+
+def announcement_progress(announcement_id):
+    """Delivery counts of a broadcast, overall and per channel, from one grouped query"""
+    progress = {'total': 0, 'Pending': 0, 'Sent': 0, 'Failed': 0, 'channels': {}}
+    for channel, status, count in db.session.query(
+            AnnouncementDelivery.channel, AnnouncementDelivery.status, func.count(AnnouncementDelivery.id)
+    ).filter(AnnouncementDelivery.announcement_id == announcement_id).group_by(
+            AnnouncementDelivery.channel, AnnouncementDelivery.status):
+        channel_progress = progress['channels'].setdefault(channel, {'total': 0, 'Pending': 0, 'Sent': 0, 'Failed': 0})
+        for counts in (progress, channel_progress):
+            counts['total'] += count
+            counts[status] += count
+    done = progress['Sent'] + progress['Failed']
+    progress['percent'] = round(100 * done / progress['total']) if progress['total'] else 0
+    return progress
+
+# Late Fees and Interest
+try:
+    import numpy as np
+except ImportError:  # The pure-Python path below computes the same penalties, only slower
+    np = None
+
+def late_fee_for_row(amount, paid_amount, payment_date, period, rules, as_of):
+    """Penalty for one ledger row; the reference implementation of compute_late_fees()
+
+    The unpaid balance accrues interest until as_of and the paid part until payment_date,
+    both counted from the end of the grace period. Any lateness also attracts the flat fee.
+    """
+    year, month = period // 12, period % 12 + 1
+    due_day = min(rules['due_day'], calendar.monthrange(year, month)[1])
+    late_from = date(year, month, due_day).toordinal() + rules['grace_days']
+    paid_amount = paid_amount or 0.0
+    open_amount = amount - paid_amount
+    days_open = max(0, as_of.toordinal() - late_from) if open_amount > 0 else 0
+    days_paid = max(0, payment_date.toordinal() - late_from) if paid_amount > 0 and payment_date else 0
+    if not days_open and not days_paid:
+        return 0.0
+    penalty = rules['flat_fee'] + rules['monthly_interest_rate'] / 30.0 * (open_amount * days_open + paid_amount * days_paid)
+    if rules['max_penalty_ratio']:
+        penalty = min(penalty, amount * rules['max_penalty_ratio'])
+    return round(penalty, 2)
+
+def late_fee_columns(rows):
+    """Columnar NumPy view of (id, house_id, period, amount, paid_amount, payment_date, late_fee) rows"""
+    return {
+        'id': np.array([row[0] for row in rows], dtype=np.int64),
+        'house_id': np.array([row[1] for row in rows], dtype=np.int64),
+        'period': np.array([row[2] for row in rows], dtype=np.int64),
+        'amount': np.array([row[3] for row in rows], dtype=np.float64),
+        'paid': np.array([row[4] or 0.0 for row in rows], dtype=np.float64),
+        # Proleptic ordinals, 0 when unpaid; far cheaper to build than datetime64 from date objects
+        'payment_day': np.array([row[5].toordinal() if row[5] else 0 for row in rows], dtype=np.int64),
+        'late_fee': np.array([row[6] or 0.0 for row in rows], dtype=np.float64),
+    }
+
+def compute_late_fees(columns, rules, as_of):
+    """Vectorized late_fee_for_row() over a whole ledger from late_fee_columns()
+
+    Results can differ from the row-by-row path by one paisa on exact half-paisa ties,
+    because np.round scales before rounding where round() is correctly rounded.
+    """
+    months = (columns['period'] - 1970 * 12).astype('datetime64[M]')
+    month_starts = months.astype('datetime64[D]').astype(np.int64)
+    # A due day past the end of a short month falls on its last day, as in late_fee_for_row()
+    month_lengths = (months + 1).astype('datetime64[D]').astype(np.int64) - month_starts
+    late_from = month_starts + np.minimum(rules['due_day'], month_lengths) + (
+        date(1970, 1, 1).toordinal() - 1 + rules['grace_days'])
+    open_amount = columns['amount'] - columns['paid']
+    
+    days_open = np.where(open_amount > 0, np.maximum(as_of.toordinal() - late_from, 0), 0)
+    paid_on_record = (columns['paid'] > 0) & (columns['payment_day'] > 0)
+    days_paid = np.where(paid_on_record, np.maximum(columns['payment_day'] - late_from, 0), 0)
+    
+    penalty = rules['flat_fee'] + rules['monthly_interest_rate'] / 30.0 * (
+        open_amount * days_open + columns['paid'] * days_paid)
+    if rules['max_penalty_ratio']:
+        penalty = np.minimum(penalty, columns['amount'] * rules['max_penalty_ratio'])
+    penalty = np.where((days_open > 0) | (days_paid > 0), penalty, 0.0)
+    return np.round(penalty, 2)
+
+def apply_late_fees(as_of=None, rules=None):
+    """Recompute late fees for every past month's dues and store the ones that changed.
+
+    The ledger is read with one query, penalised in one vectorized pass (row by row when
+    NumPy is unavailable) and written back with batched executemany UPDATEs.
+    Returns a dict of counts and timings.
+    """
+    as_of = as_of or date.today()
+    rules = {**app.config['LATE_FEE_RULES'], **(rules or {})}
+    if not 1 <= rules['due_day'] <= 31:
+        raise ValueError(f"LATE_FEE_RULES due_day must be between 1 and 31, not {rules['due_day']}")
+    table = Maintenance.__table__
+    stats = {'engine': 'numpy' if np is not None else 'python'}
+    
+    started = time.perf_counter()
+    rows = db.session.execute(select(
+        table.c.id, table.c.house_id, table.c.period, table.c.amount, table.c.paid_amount,
+        table.c.payment_date, table.c.late_fee
+    ).where(table.c.period <= current_period(as_of))).all()
+    stats['rows'] = len(rows)
+    stats['load_seconds'] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    if not rows:
+        changes = []
+    elif np is not None:
+        columns = late_fee_columns(rows)
+        fees = compute_late_fees(columns, rules, as_of)
+        changed = np.flatnonzero(np.abs(fees - columns['late_fee']) >= 0.005)
+        changes = [{'b_id': maintenance_id, 'b_fee': fee}
+                   for maintenance_id, fee in zip(columns['id'][changed].tolist(), fees[changed].tolist())]
+    else:
+        changes = []
+        for maintenance_id, _, period, amount, paid_amount, payment_date, current in rows:
+            fee = late_fee_for_row(amount, paid_amount, payment_date, period, rules, as_of)
+            if abs(fee - (current or 0.0)) >= 0.005:
+                changes.append({'b_id': maintenance_id, 'b_fee': fee})
+    stats['compute_seconds'] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    if changes:
+        statement = table.update().where(table.c.id == bindparam('b_id')).values(late_fee=bindparam('b_fee'))
+        batch_size = app.config['LATE_FEE_WRITE_BATCH_SIZE']
+        connection = db.session.connection()
+        for start in range(0, len(changes), batch_size):
+            connection.execute(statement, changes[start:start + batch_size])
+        # Core UPDATEs skip the ORM flush hooks
+        mark_data_changed(db.session, [table.name])
+    db.session.commit()
+    stats['updated'] = len(changes)
+    stats['write_seconds'] = time.perf_counter() - started
+    return stats
+
+# SQLite Deployment
+SQLITE_WRITE_STATEMENTS = ('INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'CREATE', 'DROP', 'ALTER')
+
+def sqlite_write_intent(statement):
+    """Whether a SQLite transaction opened by statement should take the write lock up front.
+
+    Write requests read before they write (users, idempotency keys, balances). In WAL mode a read
+    transaction cannot become a write transaction once another connection has committed, so the
+    transactions of POST/PATCH/DELETE requests begin IMMEDIATE and concurrent writers queue on
+    busy_timeout instead of failing mid-request. GET requests and @read_only_request views stay
+    deferred and never wait.
+    """
+    if statement.lstrip()[:7].upper().startswith(SQLITE_WRITE_STATEMENTS):
+        return True
+    return has_request_context() and request.method not in ('GET', 'HEAD', 'OPTIONS') and not g.get('read_only_request')
+
+def read_only_request(f):
+    """Mark a POST view that never writes (e.g. a password check) so it does not queue for the SQLite write lock"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g.read_only_request = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+@event.listens_for(Engine, 'connect')
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    dbapi_connection.isolation_level = None  # Transactions are begun by _begin_sqlite_transaction
+    cursor = dbapi_connection.cursor()
+    for name, value in app.config['SQLITE_PRAGMAS'].items():
+        cursor.execute(f'PRAGMA {name} = {value}')
+    cursor.close()
+
+@event.listens_for(Engine, 'begin')
+def _defer_sqlite_begin(conn):
+    if conn.dialect.name == 'sqlite':
+        conn.info['sqlite_begin_pending'] = True
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _begin_sqlite_transaction(conn, cursor, statement, parameters, context, executemany):
+    # BEGIN waits for the first statement, which tells whether the transaction starts by writing.
+    # PRAGMAs run outside it: some (synchronous, journal_mode) cannot be changed inside a transaction
+    if conn.info.get('sqlite_begin_pending') and not statement.lstrip()[:6].upper().startswith('PRAGMA'):
+        del conn.info['sqlite_begin_pending']
+        cursor.execute('BEGIN IMMEDIATE' if sqlite_write_intent(statement) else 'BEGIN')
+
+# Row Locking
+def lock_for_update(query):
+    """query with SELECT ... FOR UPDATE, reloading rows the session already holds.
+
+    SQLite has no row locks and ignores FOR UPDATE; there the transaction takes the database
+    write lock first (a no-op UPDATE) so concurrent postings still serialize instead of both
+    reading the old values.
+    """
+    if db.session.get_bind().dialect.name == 'sqlite':
+        table = query.column_descriptions[0]['entity'].__table__
+        db.session.execute(text(f'UPDATE {table.name} SET id = id WHERE 0 = 1'))
+    return query.with_for_update().populate_existing()
+
+# Maintenance Payments
+def maintenance_payment_status(paid_amount, amount):
+    if paid_amount >= amount:
+        return 'Paid'
+    if paid_amount > 0:
+        return 'Partial'
+    return 'Pending'
+
+def apply_maintenance_payment(maintenance, paid_amount, payment_method='Cash'):
+    """Record paid_amount as the total paid on a maintenance record and settle the fund with it.
+
+    Sets the payment status, date and receipt number. Once the record is fully paid, whatever
+    of its paid amount the fund does not hold yet is added to it and counted in credited_amount;
+    a correction below what was credited takes the difference back out. Returns the amount
+    credited (negative for a debit); the caller commits. Load maintenance with SELECT ... FOR UPDATE
+    so concurrent payments cannot both see the old paid_amount; the fund row is locked here, after it.
+    """
+    maintenance.paid_amount = paid_amount
+    maintenance.payment_date = date.today()
+    maintenance.payment_method = payment_method
+    maintenance.payment_status = maintenance_payment_status(paid_amount, maintenance.amount)
+    
+    if maintenance.payment_status == 'Paid' and not maintenance.receipt_number:
+        maintenance.receipt_number = f"RCP-{maintenance.id:06d}"  # Only generate receipt if not already generated
+    credited = maintenance.credited_amount or 0.0
+    # The fund holds a paid record's whole payment, including earlier partial payments
+    credit = (paid_amount if maintenance.payment_status == 'Paid' else min(credited, paid_amount)) - credited
+    if credit == 0:
+        return 0.0
+    fund = Fund.get_fund(for_update=True)
+    fund.total_amount += credit
+    fund.last_updated = datetime.utcnow()
+    maintenance.credited_amount = credited + credit
+    return credit
+
+def reverse_maintenance_payment(maintenance, refund_amount):
+    """Take a refund off a maintenance record and out of the fund as far as the fund holds it.
+
+    The fund is debited only down to what is still paid, never by more than the record's
+    credited_amount, so a refund of money that was never credited leaves the fund alone.
+    Returns the amount debited; the caller commits. Lock maintenance first, as for
+    apply_maintenance_payment.
+    """
+    maintenance.paid_amount = max(0.0, (maintenance.paid_amount or 0.0) - refund_amount)
+    maintenance.payment_status = maintenance_payment_status(maintenance.paid_amount, maintenance.amount)
+    debit = (maintenance.credited_amount or 0.0) - maintenance.paid_amount
+    if debit <= 0:
+        return 0.0
+    fund = Fund.get_fund(for_update=True)
+    fund.total_amount -= debit
+    fund.last_updated = datetime.utcnow()
+    maintenance.credited_amount -= debit
+    return debit
+
+# Idempotency Keys
+def idempotency_key():
+    """Fresh key for a form's hidden idempotency_key field, so a double submit posts once"""
+    return uuid.uuid4().hex
+
+app.jinja_env.globals.update(idempotency_key=idempotency_key)
+
+def _replay_idempotent_response(record):
+    headers = json.loads(record.response_headers or '{}')
+    if not request.path.startswith('/api/'):
+        flash('This request was already processed; showing its original result.', 'info')
+    response = make_response(record.response_body or '', record.response_status)
+    for name, value in headers.items():
+        response.headers[name] = value
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+def _idempotency_conflict(message):
+    if request.path.startswith('/api/'):
+        raise ApiError(409, message)
+    flash(message, 'error')
+    return redirect(request.referrer or url_for('dashboard'))
+
+def idempotent(f):
+    """Run a POST at most once per Idempotency-Key header (or idempotency_key form field).
+
+    The key row is inserted in the same transaction as the posting, so a concurrent duplicate
+    blocks on the unique index until the original commits and then replays its stored response.
+    Requests without a key run as before.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        key = request.headers.get('Idempotency-Key') or request.form.get('idempotency_key')
+        if request.method not in ('POST', 'PATCH') or not key:
+            return f(*args, **kwargs)
+        key = key.strip()[:100]
+        api_user = g.get('api_user')
+        user_id = api_user['uid'] if api_user else session['user_id']
+        request_hash = hashlib.sha256(b'\0'.join([request.method.encode(), request.path.encode(),
+                                                  request.get_data()])).hexdigest()
+        
+        expires_before = datetime.utcnow() - timedelta(seconds=app.config['IDEMPOTENCY_KEY_TTL'])
+        deadline = time.monotonic() + app.config['IDEMPOTENCY_WAIT_SECONDS']
+        while True:
+            record = IdempotencyKey.query.filter_by(user_id=user_id, key=key).first()
+            if record is not None and record.created_at < expires_before:
+                db.session.delete(record)  # Expired; the key may be reused
+                db.session.commit()
+                record = None
+            if record is None:
+                record = IdempotencyKey(user_id=user_id, key=key, request_hash=request_hash)
+                db.session.add(record)
+                try:
+                    db.session.flush()  # Waits here while another request holds the same key
+                    break
+                except IntegrityError:
+                    db.session.rollback()
+                    continue
+            if record.request_hash != request_hash:
+                return _idempotency_conflict('Idempotency key was already used for a different request')
+            if record.response_status is not None:
+                return _replay_idempotent_response(record)
+            if time.monotonic() > deadline:
+                return _idempotency_conflict('A request with this idempotency key is still in progress')
+            db.session.rollback()  # End the read so the next poll sees the original's commit
+            time.sleep(0.1)
+        
+        try:
+            response = make_response(f(*args, **kwargs))
+        except Exception:
+            db.session.rollback()  # Also discards the key unless the view committed its posting
+            raise
+        
+        # Keep only responses of requests that committed work; failures may be retried with the same key
+        if not db.inspect(record).persistent:
+            return response
+        if response.status_code >= 500 or not (response.is_json or 300 <= response.status_code < 400):
+            db.session.delete(record)
+        else:
+            record.response_status = response.status_code
+            record.response_headers = json.dumps({name: response.headers[name] for name in ('Location', 'Content-Type')
+                                                  if name in response.headers})
+            record.response_body = response.get_data(as_text=True)
+        db.session.commit()
+        return response
+    return decorated_function
+
 # Authentication decorator
 def login_required(f):
     @wraps(f)
@@ -1207,11 +3941,60 @@ def member_required(f):
 def index():
     return redirect(url_for('login'))
 
+@app.route('/assets/<path:filename>')
+def assets(filename):
+    # Names are content-hashed, so clients may cache them forever
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    for candidate, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if candidate in request.accept_encodings and os.path.exists(os.path.join(ASSET_DIST_FOLDER, filename + suffix)):
+            encoding = candidate
+            filename += suffix
+            break
+    
+    response = send_from_directory(ASSET_DIST_FOLDER, filename, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    response.vary.add('Accept-Encoding')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+def metrics_token_valid(header):
+    token = app.config['METRICS_TOKEN']
+    if not token or not header.startswith('Bearer '):
+        return False
+    return hmac.compare_digest(header[7:].strip().encode(), token.encode())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    # Uses the session flag rather than admin_required so scrapes cost no DB query
+    if not session.get('is_admin') and not metrics_token_valid(request.headers.get('Authorization', '')):
+        return make_response('Forbidden', 403)
+    
+    response = make_response(metrics.render())
+    response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+    return response
+
+@app.route('/admin/sql_trace')
+@app.route('/admin/sql_trace/<trace_id>')
+@admin_required
+def sql_trace(trace_id=None):
+    with sql_traces_lock:
+        if trace_id is None:
+            summaries = [{key: value for key, value in trace.items() if key not in ('queries', 'statements')}
+                         for trace in reversed(sql_traces.values())]
+            return jsonify(summaries)
+        trace = sql_traces.get(trace_id)
+    if trace is None:
+        return jsonify({'error': 'Trace not found or expired'}), 404
+    return jsonify(trace)
+
 # Document Management Routes
 @app.route('/documents')
 @admin_required
+@conditional_view('document', 'user')
 def documents():
-    documents = Document.query.order_by(Document.upload_date.desc()).all()
+    documents = LazyRows(lambda: Document.query.order_by(Document.upload_date.desc()).all())
     return render_template('documents.html', documents=documents)
 
 @app.route('/documents/upload', methods=['GET', 'POST'])
@@ -1252,13 +4035,11 @@ def upload_document():
             filename = f"{name}_{timestamp}{ext}"
             
             # Get file info
-            file_size = len(file.read())
-            file.seek(0)  # Reset file pointer
+            file_size = upload_size(file)
             file_extension = ext[1:].lower()  # Remove the dot
             
             # Save file
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
+            get_document_storage().save(file.stream, filename, file.mimetype)
             
             # Create document record
             document = Document(
@@ -1287,26 +4068,25 @@ def upload_document():
 @admin_required
 def view_document(document_id):
     document = Document.query.get_or_404(document_id)
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], document.file_name)
+    storage = get_document_storage()
     
-    if not os.path.exists(file_path):
+    if not storage.exists(document.file_name):
         flash('File not found', 'error')
         return redirect(url_for('documents'))
     
-    return send_from_directory(app.config['UPLOAD_FOLDER'], document.file_name, as_attachment=False)
+    return storage.response(document.file_name, as_attachment=False)
 
 @app.route('/documents/download/<int:document_id>')
 @admin_required
 def download_document(document_id):
     document = Document.query.get_or_404(document_id)
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], document.file_name)
+    storage = get_document_storage()
     
-    if not os.path.exists(file_path):
+    if not storage.exists(document.file_name):
         flash('File not found', 'error')
         return redirect(url_for('documents'))
     
-    return send_from_directory(app.config['UPLOAD_FOLDER'], document.file_name, 
-                              as_attachment=True, download_name=document.original_file_name)
+    return storage.response(document.file_name, as_attachment=True, download_name=document.original_file_name)
 
 @app.route('/documents/edit/<int:document_id>', methods=['GET', 'POST'])
 @admin_required
@@ -1337,10 +4117,8 @@ def edit_document(document_id):
 def delete_document(document_id):
     document = Document.query.get_or_404(document_id)
     
-    # Delete file from filesystem
-    file_path = os.path.join(app.config['UPLOAD_FOLDER'], document.file_name)
-    if os.path.exists(file_path):
-        os.remove(file_path)
+    # Delete file from storage
+    get_document_storage().delete(document.file_name)
     
     # Delete database record
     db.session.delete(document)
@@ -1653,6 +4431,7 @@ def delete_notification_settings(setting_id):
     return redirect(url_for('notifications'))
 
 @app.route('/login', methods=['GET', 'POST'])
+@read_only_request
 def login():
     if request.method == 'POST':
         username = request.form['username']
@@ -1726,16 +4505,17 @@ def dashboard():
 
 @app.route('/member/dashboard')
 @member_required
+@replica_reads
+@conditional_view('user', 'house', 'maintenance', 'complaint')
 def member_dashboard():
     user = User.query.get(session['user_id'])
     house = House.query.get(user.house_id)
     
     # Get member's maintenance records
-    maintenance_records = Maintenance.query.filter_by(house_id=user.house_id).order_by(Maintenance.month_year.desc()).all()
+    maintenance_records = Maintenance.query.filter_by(house_id=user.house_id).order_by(Maintenance.period.desc()).all()
     
     # Calculate current month dues
-    current_month = datetime.now().strftime('%Y-%m')
-    current_month_record = Maintenance.query.filter_by(house_id=user.house_id, month_year=current_month).first()
+    current_month_record = Maintenance.query.filter_by(house_id=user.house_id, period=current_period()).first()
     
     # Calculate pending dues
     pending_records = Maintenance.query.filter_by(house_id=user.house_id, payment_status='Pending').all()
@@ -1754,16 +4534,17 @@ def member_dashboard():
 
 @app.route('/member/maintenance')
 @member_required
+@replica_reads
+@conditional_view('user', 'house', 'maintenance')
 def member_maintenance():
     user = User.query.get(session['user_id'])
     house = House.query.get(user.house_id)
     
     # Get all maintenance records for this house
-    maintenance_records = Maintenance.query.filter_by(house_id=user.house_id).order_by(Maintenance.month_year.desc()).all()
+    maintenance_records = Maintenance.query.filter_by(house_id=user.house_id).order_by(Maintenance.period.desc()).all()
     
     # Calculate current month dues
-    current_month = datetime.now().strftime('%Y-%m')
-    current_month_record = Maintenance.query.filter_by(house_id=user.house_id, month_year=current_month).first()
+    current_month_record = Maintenance.query.filter_by(house_id=user.house_id, period=current_period()).first()
     
     # Calculate pending dues
     pending_records = Maintenance.query.filter_by(house_id=user.house_id, payment_status='Pending').all()
@@ -1783,6 +4564,7 @@ def member_maintenance():
 # Complaint System Routes
 @app.route('/member/complaints')
 @member_required
+@conditional_view('user', 'complaint')
 def member_complaints():
     user = User.query.get(session['user_id'])
     complaints = Complaint.query.filter_by(created_by=user.id).order_by(Complaint.created_at.desc()).all()
@@ -1816,37 +4598,19 @@ def raise_complaint():
         
         db.session.add(complaint)
         db.session.commit()
+        publish_complaint_changes([complaint.id])
         
-        # Send email notification to admin
-        try:
-            # Get active notification settings
-            notification_settings = NotificationSettings.get_active_settings()
-            
-            if notification_settings and notification_settings.notification_type == 'smtp':
-                # Get admin user with email
-                admin_user = User.query.filter_by(is_admin=True).first()
-                
-                if admin_user and admin_user.email:
-                    # Get complainant name and house info
-                    complainant_name = user.username
-                    house_info = f"{house.house_number} - {house.building_wing}"
-                    
-                    # Send email notification
-                    success, message = NotificationService.send_complaint_notification(
-                        notification_settings, admin_user.email, complaint, complainant_name, house_info
-                    )
-                    
-                    if success:
-                        flash('Complaint raised successfully! Admin has been notified via email.', 'success')
-                    else:
-                        flash(f'Complaint raised successfully, but failed to send email notification: {message}', 'warning')
-                else:
-                    flash('Complaint raised successfully, but admin email not configured for notifications.', 'warning')
-            else:
-                flash('Complaint raised successfully, but email notifications are not configured.', 'info')
-                
-        except Exception as e:
-            flash(f'Complaint raised successfully, but failed to send notification: {str(e)}', 'warning')
+        # Urgent complaints alert every admin now; the rest wait for the next digest
+        if complaint.priority != 'Urgent':
+            flash('Complaint raised successfully! The society admins will be notified in the next complaint digest.', 'success')
+            return redirect(url_for('member_complaints'))
+        
+        success, message = alert_admins_of_urgent_complaint(complaint, user.username)
+        if success:
+            flash('Complaint raised successfully! Admins have been notified via email.', 'success')
+        else:
+            flash(f'Complaint raised successfully, but failed to send email notification: {message}. '
+                  'The admins will see it in the next complaint digest.', 'warning')
         
         return redirect(url_for('member_complaints'))
     
@@ -1854,6 +4618,7 @@ def raise_complaint():
 
 @app.route('/member/profile')
 @member_required
+@conditional_view('user', 'house')
 def member_profile():
     user = User.query.get(session['user_id'])
     house = House.query.get(user.house_id)
@@ -1862,9 +4627,25 @@ def member_profile():
 # Admin Complaint Management Routes
 @app.route('/admin/complaints')
 @admin_required
+@conditional_view('complaint', 'user', 'house')
 def admin_complaints():
+    # Taken before the query, so the stream replays anything published while the page renders
+    live_event_id = live_events.last_event_id('complaints')
     complaints = Complaint.query.order_by(Complaint.created_at.desc()).all()
-    return render_template('admin_complaints.html', complaints=complaints)
+    return render_template('admin_complaints.html', complaints=complaints, live_event_id=live_event_id)
+
+@app.route('/admin/complaints/stream')
+@admin_required
+def admin_complaints_stream():
+    """New complaints and status changes for an open complaint queue, as Server-Sent Events"""
+    return event_stream('complaints')
+
+@app.route('/admin/complaints/sla')
+@admin_required
+def complaint_sla_dashboard():
+    months = min(max(request.args.get('months', 6, type=int), 1), 36)
+    return render_template('complaint_sla.html', summary=complaint_sla_summary(months), months=months,
+                           format_hours=format_hours)
 
 @app.route('/admin/complaints/<int:complaint_id>/update_status', methods=['POST'])
 @admin_required
@@ -1882,19 +4663,146 @@ def update_complaint_status(complaint_id):
             complaint.resolved_at = datetime.utcnow()
         
         db.session.commit()
+        publish_complaint_changes([complaint.id])
         flash(f'Complaint status updated to {new_status}', 'success')
     else:
         flash('Invalid status', 'error')
     
     return redirect(url_for('admin_complaints'))
 
+# Announcement Routes
+@app.route('/announcements')
+@admin_required
+def announcements():
+    announcements = Announcement.query.order_by(Announcement.created_at.desc()).all()
+    delivery_counts = {}
+    for announcement_id, status, count in db.session.query(
+            AnnouncementDelivery.announcement_id, AnnouncementDelivery.status, func.count(AnnouncementDelivery.id)
+    ).group_by(AnnouncementDelivery.announcement_id, AnnouncementDelivery.status):
+        delivery_counts.setdefault(announcement_id, {})[status] = count
+    return render_template('announcements.html', announcements=announcements, delivery_counts=delivery_counts,
+                           audience_label=announcement_audience_label)
+
+@app.route('/announcements/new', methods=['GET', 'POST'])
+@admin_required
+@idempotent
+def add_announcement():
+    wings = [row[0] for row in db.session.query(House.building_wing).distinct().order_by(House.building_wing)]
+    if request.method == 'POST':
+        title = request.form.get('title', '').strip()
+        body = request.form.get('body', '').strip()
+        category = request.form.get('category')
+        audience = request.form.get('audience')
+        channels = [channel for channel in ANNOUNCEMENT_CHANNELS if channel in request.form.getlist('channels')]
+        if not title or not body or category not in ANNOUNCEMENT_CATEGORIES or audience not in ('all', 'owners'):
+            flash('Title, message, category and audience are required', 'error')
+            return render_template('add_announcement.html', categories=ANNOUNCEMENT_CATEGORIES, wings=wings)
+
+        announcement = Announcement(
+            title=title,
+            body=body,
+            category=category,
+            audience=audience,
+            building_wing=request.form.get('building_wing') or None,
+            channels=','.join(channels),
+            created_by=session['user_id']
+        )
+        db.session.add(announcement)
+        db.session.commit()
+
+        if channels:
+            queued = queue_announcement_broadcast(announcement)
+            start_announcement_broadcast(announcement.id)
+            flash(f'Announcement posted; broadcasting {queued} message(s)', 'success')
+        else:
+            flash('Announcement posted to the notice board', 'success')
+        return redirect(url_for('announcement_detail', announcement_id=announcement.id))
+
+    return render_template('add_announcement.html', categories=ANNOUNCEMENT_CATEGORIES, wings=wings)
+
+@app.route('/announcements/<int:announcement_id>')
+@admin_required
+def announcement_detail(announcement_id):
+    announcement = Announcement.query.get_or_404(announcement_id)
+    failures = AnnouncementDelivery.query.filter_by(announcement_id=announcement.id, status='Failed') \
+        .order_by(AnnouncementDelivery.id).limit(20).all()
+    return render_template('announcement_detail.html', announcement=announcement,
+                           progress=announcement_progress(announcement.id), failures=failures,
+                           audience_label=announcement_audience_label(announcement.audience, announcement.building_wing))
+
+@app.route('/announcements/<int:announcement_id>/progress')
+@admin_required
+def announcement_broadcast_progress(announcement_id):
+    announcement = Announcement.query.get_or_404(announcement_id)
+    return jsonify(dict(announcement_progress(announcement.id), status=announcement.broadcast_status))
+
+@app.route('/announcements/<int:announcement_id>/broadcast', methods=['POST'])
+@admin_required
+def broadcast_announcement(announcement_id):
+    # Locked so a double-submitted form cannot resolve the recipients twice
+    announcement = lock_for_update(Announcement.query).filter_by(id=announcement_id).first_or_404()
+    if announcement.broadcast_status in ('queued', 'sending', 'completed'):
+        db.session.rollback()
+        flash('This announcement has already been broadcast', 'info')
+        return redirect(url_for('announcement_detail', announcement_id=announcement_id))
+
+    if announcement.broadcast_status is None:
+        channels = [channel for channel in ANNOUNCEMENT_CHANNELS if channel in request.form.getlist('channels')]
+        if not channels:
+            db.session.rollback()
+            flash('Select at least one channel to broadcast on', 'error')
+            return redirect(url_for('announcement_detail', announcement_id=announcement_id))
+        announcement.channels = ','.join(channels)
+
+    queued = queue_announcement_broadcast(announcement)
+    start_announcement_broadcast(announcement_id)
+    flash(f'Broadcasting {queued} message(s)', 'success')
+    return redirect(url_for('announcement_detail', announcement_id=announcement_id))
+
+@app.route('/announcements/delete/<int:announcement_id>', methods=['POST'])
+@admin_required
+def delete_announcement(announcement_id):
+    announcement = Announcement.query.get_or_404(announcement_id)
+    if announcement.broadcast_status in ('queued', 'sending'):
+        flash('Wait for the broadcast to finish before deleting this announcement', 'error')
+        return redirect(url_for('announcement_detail', announcement_id=announcement_id))
+
+    AnnouncementDelivery.query.filter_by(announcement_id=announcement.id).delete(synchronize_session=False)
+    db.session.delete(announcement)
+    db.session.commit()
+    flash('Announcement deleted successfully!', 'success')
+    return redirect(url_for('announcements'))
+
+@app.route('/member/announcements')
+@member_required
+@conditional_view('user', 'house', 'announcement')
+def member_announcements():
+    user = User.query.get(session['user_id'])
+    house = House.query.get(user.house_id) if user.house_id else None
+    # Society-wide notices plus those addressed to the member's own wing
+    visible = Announcement.building_wing.is_(None)
+    if house:
+        visible = or_(visible, Announcement.building_wing == house.building_wing)
+    announcements = Announcement.query.filter(visible).order_by(Announcement.created_at.desc()).all()
+    return render_template('member_announcements.html', announcements=announcements, user=user)
+
 
 @app.route('/houses')
 @admin_required
+@conditional_view('house')
 def houses():
-    houses = House.query.all()
+    houses = LazyRows(lambda: house_listing.all(house_listing.select()))
     return render_template('houses.html', houses=houses)
 
+@app.route('/houses/search')
+@admin_required
+def search_houses():
+    limit = min(request.args.get('limit', app.config['HOUSE_SEARCH_LIMIT'], type=int) or 1,
+                app.config['HOUSE_SEARCH_MAX_LIMIT'])
+    houses = house_directory.search(request.args.get('q', ''), max(limit, 1))
+    return jsonify(results=[{'id': house.id, 'house_number': house.house_number, 'building_wing': house.building_wing,
+                             'owner_name': house.owner_name, 'label': house_label(house)} for house in houses])
+
 @app.route('/houses/add', methods=['GET', 'POST'])
 @admin_required
 def add_house():
@@ -1944,8 +4852,9 @@ def delete_house(house_id):
 
 @app.route('/members')
 @admin_required
+@conditional_view('member', 'house')
 def members():
-    members = Member.query.join(House).all()
+    members = LazyRows(lambda: member_listing.all(member_listing.select().select_from(Member).join(House)))
     return render_template('members.html', members=members)
 
 @app.route('/members/add', methods=['GET', 'POST'])
@@ -1953,11 +4862,15 @@ def members():
 def add_member():
     if request.method == 'POST':
         # Get form data
-        house_id = int(request.form['house_id'])
+        house_id = request.form.get('house_id', type=int)
+        if house_directory.get(house_id) is None:
+            flash('Please pick a house from the search results', 'error')
+            return render_template('add_member.html', selected_house=None)
         name = request.form['name']
         age = int(request.form['age'])
         gender = request.form['gender']
         role = request.form['role']
+        contact_number = request.form.get('contact_number')
         emergency_contact = request.form.get('emergency_contact')
         vehicle_number = request.form.get('vehicle_number')
         parking_slot = request.form.get('parking_slot')
@@ -1973,6 +4886,7 @@ def add_member():
             age=age,
             gender=gender,
             role=role,
+            contact_number=contact_number,
             emergency_contact=emergency_contact,
             vehicle_number=vehicle_number,
             parking_slot=parking_slot
@@ -2006,8 +4920,7 @@ def add_member():
         db.session.commit()
         return redirect(url_for('members'))
     
-    houses = House.query.all()
-    return render_template('add_member.html', houses=houses)
+    return render_template('add_member.html', selected_house=None)
 
 @app.route('/members/edit/<int:member_id>', methods=['GET', 'POST'])
 @admin_required
@@ -2015,11 +4928,16 @@ def edit_member(member_id):
     member = Member.query.get_or_404(member_id)
     
     if request.method == 'POST':
-        member.house_id = int(request.form['house_id'])
+        house_id = request.form.get('house_id', type=int)
+        if house_directory.get(house_id) is None:
+            flash('Please pick a house from the search results', 'error')
+            return redirect(url_for('edit_member', member_id=member_id))
+        member.house_id = house_id
         member.name = request.form['name']
         member.age = int(request.form['age'])
         member.gender = request.form['gender']
         member.role = request.form['role']
+        member.contact_number = request.form.get('contact_number')
         member.emergency_contact = request.form.get('emergency_contact')
         member.vehicle_number = request.form.get('vehicle_number')
         member.parking_slot = request.form.get('parking_slot')
@@ -2028,8 +4946,7 @@ def edit_member(member_id):
         flash('Member updated successfully!', 'success')
         return redirect(url_for('members'))
     
-    houses = House.query.all()
-    return render_template('edit_member.html', member=member, houses=houses)
+    return render_template('edit_member.html', member=member, selected_house=house_directory.get(member.house_id))
 
 @app.route('/members/delete/<int:member_id>', methods=['POST'])
 @admin_required
@@ -2043,26 +4960,49 @@ def delete_member(member_id):
 
 @app.route('/maintenance')
 @admin_required
+@replica_reads
+@conditional_view('maintenance', 'house')
 def maintenance():
-    maintenance_records = Maintenance.query.join(House).all()
+    maintenance_records = LazyRows(lambda: maintenance_listing.all(
+        maintenance_listing.select().select_from(Maintenance).join(House)
+        .order_by(Maintenance.period.desc(), House.building_wing, House.house_number)))
     return render_template('maintenance.html', maintenance_records=maintenance_records)
 
+@app.route('/maintenance/late_fees', methods=['POST'])
+@admin_required
+def recalculate_late_fees():
+    try:
+        stats = apply_late_fees()
+        flash(f"Late fees recalculated for {stats['rows']} records ({stats['updated']} updated)", 'success')
+    except Exception as e:
+        db.session.rollback()
+        flash(f'Error recalculating late fees: {str(e)}', 'error')
+    return redirect(url_for('maintenance'))
+
 @app.route('/maintenance/add', methods=['GET', 'POST'])
 @admin_required
 def add_maintenance():
     if request.method == 'POST':
-        maintenance = Maintenance(
-            house_id=int(request.form['house_id']),
-            month_year=request.form['month_year'],
-            amount=float(request.form['amount'])
-        )
+        house_id = request.form.get('house_id', type=int)
+        selected_house = house_directory.get(house_id)
+        if selected_house is None:
+            flash('Please pick a house from the search results', 'error')
+            return render_template('add_maintenance.html', selected_house=None)
+        try:
+            maintenance = Maintenance(
+                house_id=house_id,
+                month_year=request.form['month_year'],
+                amount=float(request.form['amount'])
+            )
+        except ValueError as e:
+            flash(str(e), 'error')
+            return render_template('add_maintenance.html', selected_house=selected_house)
         db.session.add(maintenance)
         db.session.commit()
         flash('Maintenance record added successfully!', 'success')
         return redirect(url_for('maintenance'))
     
-    houses = House.query.all()
-    return render_template('add_maintenance.html', houses=houses)
+    return render_template('add_maintenance.html', selected_house=None)
 
 @app.route('/maintenance/edit/<int:maintenance_id>', methods=['GET', 'POST'])
 @admin_required
@@ -2070,28 +5010,37 @@ def edit_maintenance(maintenance_id):
     maintenance = Maintenance.query.get_or_404(maintenance_id)
     
     if request.method == 'POST':
-        maintenance.house_id = int(request.form['house_id'])
-        maintenance.month_year = request.form['month_year']
-        maintenance.amount = float(request.form['amount'])
+        house_id = request.form.get('house_id', type=int)
+        if house_directory.get(house_id) is None:
+            flash('Please pick a house from the search results', 'error')
+            return redirect(url_for('edit_maintenance', maintenance_id=maintenance_id))
+        try:
+            maintenance.house_id = house_id
+            maintenance.month_year = request.form['month_year']
+            maintenance.amount = float(request.form['amount'])
+        except ValueError as e:
+            db.session.rollback()
+            flash(str(e), 'error')
+            return redirect(url_for('edit_maintenance', maintenance_id=maintenance_id))
         
         db.session.commit()
         flash('Maintenance record updated successfully!', 'success')
         return redirect(url_for('maintenance'))
     
-    houses = House.query.all()
-    return render_template('edit_maintenance.html', maintenance=maintenance, houses=houses)
+    return render_template('edit_maintenance.html', maintenance=maintenance,
+                           selected_house=house_directory.get(maintenance.house_id))
 
 @app.route('/maintenance/delete/<int:maintenance_id>', methods=['POST'])
 @admin_required
 def delete_maintenance(maintenance_id):
-    maintenance = Maintenance.query.get_or_404(maintenance_id)
+    maintenance = lock_for_update(Maintenance.query).filter_by(id=maintenance_id).first_or_404()
     
-    # If the record was paid, we need to subtract the paid amount from the fund
-    if maintenance.payment_status == 'Paid' and maintenance.paid_amount > 0:
-        fund = Fund.get_fund()
-        fund.total_amount -= maintenance.paid_amount
+    # Whatever the record added to the fund comes back out of it
+    if maintenance.credited_amount and maintenance.credited_amount > 0:
+        fund = Fund.get_fund(for_update=True)
+        fund.total_amount -= maintenance.credited_amount
         fund.last_updated = datetime.utcnow()
-        flash(f'₹{maintenance.paid_amount:.2f} deducted from society fund due to record deletion!', 'info')
+        flash(f'₹{maintenance.credited_amount:.2f} deducted from society fund due to record deletion!', 'info')
     
     house_info = f"{maintenance.house.house_number} - {maintenance.house.building_wing}"
     month_year = maintenance.month_year
@@ -2103,37 +5052,17 @@ def delete_maintenance(maintenance_id):
 
 @app.route('/maintenance/mark_paid/<int:maintenance_id>', methods=['POST'])
 @admin_required
+@idempotent
 def mark_maintenance_paid(maintenance_id):
-    maintenance = Maintenance.query.get_or_404(maintenance_id)
+    maintenance = lock_for_update(Maintenance.query).filter_by(id=maintenance_id).first_or_404()
     paid_amount = float(request.form['paid_amount'])
     payment_method = request.form.get('payment_method', 'Cash')
     
-    # Calculate the amount being added to fund (only new payments)
-    previous_paid = maintenance.paid_amount
-    new_payment_amount = paid_amount - previous_paid
-    
-    maintenance.paid_amount = paid_amount
-    maintenance.payment_date = date.today()
-    maintenance.payment_method = payment_method
-    
-    if paid_amount >= maintenance.amount:
-        maintenance.payment_status = 'Paid'
-    elif paid_amount > 0:
-        maintenance.payment_status = 'Partial'
-    else:
-        maintenance.payment_status = 'Pending'
-    
-    # Generate receipt number and add to fund
-    if maintenance.payment_status == 'Paid':
-        if not maintenance.receipt_number:  # Only generate receipt if not already generated
-            maintenance.receipt_number = f"RCP-{maintenance.id:06d}"
-        
-        # Add payment to fund (only if it's a new payment)
-        if new_payment_amount > 0:
-            fund = Fund.get_fund()
-            fund.total_amount += new_payment_amount
-            fund.last_updated = datetime.utcnow()
-            flash(f'₹{new_payment_amount:.2f} added to society fund!', 'info')
+    fund_credit = apply_maintenance_payment(maintenance, paid_amount, payment_method)
+    if fund_credit > 0:
+        flash(f'₹{fund_credit:.2f} added to society fund!', 'info')
+    elif fund_credit < 0:
+        flash(f'₹{-fund_credit:.2f} deducted from society fund after the payment was corrected!', 'info')
     
     db.session.commit()
     
@@ -2240,12 +5169,14 @@ def funds():
 
 @app.route('/expenses')
 @admin_required
+@conditional_view('expense', 'user')
 def expenses():
     expenses = Expense.query.order_by(Expense.expense_date.desc()).all()
     return render_template('expenses.html', expenses=expenses)
 
 @app.route('/expenses/add', methods=['GET', 'POST'])
 @admin_required
+@idempotent
 def add_expense():
     if request.method == 'POST':
         category = request.form['category']
@@ -2253,8 +5184,8 @@ def add_expense():
         amount = float(request.form['amount'])
         expense_date = datetime.strptime(request.form['expense_date'], '%Y-%m-%d').date()
         
-        # Validate fund availability
-        fund = Fund.get_fund()
+        # Validate fund availability; the lock holds until commit so concurrent expenses cannot overdraw
+        fund = Fund.get_fund(for_update=True)
         if amount > fund.total_amount:
             flash('Insufficient funds! Available: ₹{:.2f}'.format(fund.total_amount), 'error')
             return render_template('add_expense.html')
@@ -2282,21 +5213,15 @@ def add_expense():
 
 @app.route('/expenses/report')
 @admin_required
+@replica_reads
+@conditional_view('expense', 'user')
 def expense_report():
     from_date = request.args.get('from_date')
     to_date = request.args.get('to_date')
     
-    query = Expense.query
-    
-    if from_date:
-        from_date_obj = datetime.strptime(from_date, '%Y-%m-%d').date()
-        query = query.filter(Expense.expense_date >= from_date_obj)
-    
-    if to_date:
-        to_date_obj = datetime.strptime(to_date, '%Y-%m-%d').date()
-        query = query.filter(Expense.expense_date <= to_date_obj)
-    
-    expenses = query.order_by(Expense.expense_date.desc()).all()
+    from_date_obj = datetime.strptime(from_date, '%Y-%m-%d').date() if from_date else None
+    to_date_obj = datetime.strptime(to_date, '%Y-%m-%d').date() if to_date else None
+    expenses = expense_listing.all(expense_listing_query(from_date_obj, to_date_obj))
     
     # Calculate totals by category
     category_totals = {}
@@ -2317,26 +5242,16 @@ def expense_report():
 
 @app.route('/expenses/download_report')
 @admin_required
+@replica_reads
 def download_expense_report():
     from_date = request.args.get('from_date')
     to_date = request.args.get('to_date')
     
-    query = Expense.query
-    
-    if from_date:
-        from_date_obj = datetime.strptime(from_date, '%Y-%m-%d').date()
-        query = query.filter(Expense.expense_date >= from_date_obj)
-    
-    if to_date:
-        to_date_obj = datetime.strptime(to_date, '%Y-%m-%d').date()
-        query = query.filter(Expense.expense_date <= to_date_obj)
-    
-    expenses = query.order_by(Expense.expense_date.desc()).all()
+    from_date_obj = datetime.strptime(from_date, '%Y-%m-%d').date() if from_date else None
+    to_date_obj = datetime.strptime(to_date, '%Y-%m-%d').date() if to_date else None
     
     # Generate CSV content
-    csv_content = "Date,Category,Description,Amount,Created By\n"
-    for expense in expenses:
-        csv_content += f"{expense.expense_date},{expense.category},{expense.description},{expense.amount},{expense.creator.username}\n"
+    csv_content = expense_report_csv(from_date_obj, to_date_obj)
     
     # Create response
     response = make_response(csv_content)
@@ -2345,6 +5260,1093 @@ def download_expense_report():
     
     return response
 
+# REST API (v1)
+class ApiError(Exception):
+    """Raised by /api/v1 handlers; rendered as a JSON error body and rolls back the transaction"""
+    def __init__(self, status, message, **details):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.details = details
+
+@app.errorhandler(ApiError)
+def handle_api_error(error):
+    db.session.rollback()
+    return jsonify(error=error.message, **error.details), error.status
+
+api_token_serializer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='api-token')
+
+def issue_api_token(user, login_type):
+    """Signed, self-contained bearer token; verifying it needs no session or database lookup"""
+    return api_token_serializer.dumps({
+        'uid': user.id,
+        'admin': login_type == 'admin',
+        'house': user.house_id if login_type == 'member' else None,
+    })
+
+def api_auth_required(admin=False):
+    """Authenticate the bearer token into g.api_user; admin=True rejects member tokens"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            header = request.headers.get('Authorization', '')
+            if not header.startswith('Bearer '):
+                raise ApiError(401, 'Missing bearer token')
+            try:
+                claims = api_token_serializer.loads(header[7:].strip(), max_age=app.config['API_TOKEN_MAX_AGE'])
+            except SignatureExpired:
+                raise ApiError(401, 'Token expired')
+            except BadSignature:
+                raise ApiError(401, 'Invalid token')
+            if admin and not claims['admin']:
+                raise ApiError(403, 'Admin access required')
+            g.api_user = claims
+            return f(*args, **kwargs)
+        return decorated_function
+    return decorator
+
+def _encode_cursor(last_id):
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    try:
+        return int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise ApiError(400, 'Invalid cursor')
+
+def _coerce_api_value(column, value):
+    """Validate a JSON value against a column and convert it to the column's Python type"""
+    if value is None:
+        if not column.nullable:
+            raise ValueError(f"'{column.name}' cannot be null")
+        return None
+    python_type = column.type.python_type
+    if python_type is bool:
+        if not isinstance(value, bool):
+            raise ValueError(f"'{column.name}' must be a boolean")
+    elif python_type is int:
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"'{column.name}' must be an integer")
+    elif python_type is float:
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"'{column.name}' must be a number")
+        value = float(value)
+    elif python_type in (date, datetime):
+        try:
+            value = python_type.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"'{column.name}' must be an ISO 8601 {'datetime' if python_type is datetime else 'date'}")
+    else:
+        if not isinstance(value, str):
+            raise ValueError(f"'{column.name}' must be a string")
+        value = value.strip()
+        if getattr(column.type, 'length', None) and len(value) > column.type.length:
+            raise ValueError(f"'{column.name}' must be at most {column.type.length} characters")
+    return value
+
+class ApiResource:
+    """How one model is exposed under /api/v1/<name>.
+
+    member_scope(claims) returns the filter limiting a member token to its own rows; resources
+    without one are admin-only. prepare(obj, values, claims, created) runs before values are
+    assigned and may pop values it applies itself (for side effects such as fund updates).
+    after_commit(objects, claims, created) runs once a bulk write has committed.
+    """
+    def __init__(self, model, fields, creatable=(), updatable=(), filters=(), member_scope=None,
+                 member_creatable=(), owner_values=None, prepare=None, after_commit=None):
+        self.model = model
+        self.columns = {name: model.__table__.c[name] for name in fields}
+        self.creatable = set(creatable)
+        self.updatable = set(updatable)
+        self.filters = filters
+        self.member_scope = member_scope
+        self.member_creatable = set(member_creatable)
+        self.owner_values = owner_values or (lambda claims: {})
+        self.prepare = prepare
+        self.after_commit = after_commit
+    
+    def scope(self, claims):
+        if claims['admin']:
+            return []
+        if self.member_scope is None:
+            raise ApiError(403, 'Admin access required')
+        return [self.member_scope(claims)]
+    
+    def select_columns(self, fields_param):
+        """Columns for a sparse fieldset; id is always included"""
+        if not fields_param:
+            return list(self.columns.values())
+        names = [name.strip() for name in fields_param.split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.columns]
+        if unknown:
+            raise ApiError(400, f"Unknown field(s): {', '.join(unknown)}", fields=sorted(self.columns))
+        return [self.columns['id']] + [self.columns[name] for name in dict.fromkeys(names) if name != 'id']
+
+def _serialize_rows(columns, rows):
+    names = [column.name for column in columns]
+    temporal = [index for index, column in enumerate(columns) if column.type.python_type in (date, datetime)]
+    items = []
+    for row in rows:
+        item = dict(zip(names, row))
+        for index in temporal:
+            if row[index] is not None:
+                item[names[index]] = row[index].isoformat()
+        items.append(item)
+    return items
+
+def _serialize_objects(columns, objects):
+    return _serialize_rows(columns, [tuple(getattr(obj, column.name) for column in columns) for obj in objects])
+
+def _prepare_maintenance(maintenance, values, claims, created):
+    amount_changed = 'amount' in values
+    if amount_changed:
+        maintenance.amount = values.pop('amount')
+    if 'paid_amount' in values:
+        paid_amount = values.pop('paid_amount')
+        if paid_amount < 0:
+            raise ValueError("'paid_amount' cannot be negative")
+        if paid_amount > maintenance.amount:
+            raise ValueError(f"'paid_amount' cannot exceed the amount of ₹{maintenance.amount:.2f}")
+    else:
+        paid_amount = maintenance.paid_amount or 0.0
+        if paid_amount > maintenance.amount:
+            raise ValueError(f"'amount' cannot be less than the ₹{paid_amount:.2f} already paid")
+    if paid_amount != (maintenance.paid_amount or 0.0):
+        apply_maintenance_payment(maintenance, paid_amount, values.pop('payment_method', maintenance.payment_method))
+    elif amount_changed and not created:
+        # The same payment may now settle the bill, or no longer does
+        status = maintenance_payment_status(paid_amount, maintenance.amount)
+        if status == 'Paid' and maintenance.payment_status != 'Paid':
+            apply_maintenance_payment(maintenance, paid_amount, maintenance.payment_method)
+        maintenance.payment_status = status
+
+def _prepare_expense(expense, values, claims, created):
+    if created:
+        if values['amount'] <= 0:
+            raise ValueError("'amount' must be positive")
+        fund = Fund.get_fund(for_update=True)
+        if values['amount'] > fund.total_amount:
+            raise ApiError(409, f"Insufficient funds! Available: ₹{fund.total_amount:.2f}")
+        fund.total_amount -= values['amount']
+        fund.last_updated = datetime.utcnow()
+
+def _prepare_complaint(complaint, values, claims, created):
+    if 'priority' in values and values['priority'] not in ('Low', 'Medium', 'High', 'Urgent'):
+        raise ValueError("'priority' must be one of Low, Medium, High, Urgent")
+    if 'status' in values:
+        if values['status'] not in ('Open', 'In Progress', 'Resolved'):
+            raise ValueError("'status' must be one of Open, In Progress, Resolved")
+        complaint.updated_at = datetime.utcnow()
+        if values['status'] == 'Resolved':
+            complaint.resolved_at = datetime.utcnow()
+
+def _complaints_committed(complaints, claims, created):
+    """Complaints written through the API reach live complaint queues; newly raised urgent ones alert admins"""
+    publish_complaint_changes([complaint.id for complaint in complaints])
+    if created:
+        for complaint in complaints:
+            if complaint.priority == 'Urgent':
+                alert_admins_of_urgent_complaint(complaint, complaint.creator.username)
+
+API_RESOURCES = {
+    'houses': ApiResource(
+        House,
+        fields=('id', 'house_number', 'building_wing', 'owner_name', 'contact_number', 'email',
+                'number_of_occupants', 'created_at'),
+        creatable=('house_number', 'building_wing', 'owner_name', 'contact_number', 'email', 'number_of_occupants'),
+        updatable=('house_number', 'building_wing', 'owner_name', 'contact_number', 'email', 'number_of_occupants'),
+        filters=('house_number', 'building_wing'),
+        member_scope=lambda claims: House.id == claims['house'],
+    ),
+    'members': ApiResource(
+        Member,
+        fields=('id', 'house_id', 'name', 'age', 'gender', 'role', 'contact_number', 'emergency_contact',
+                'vehicle_number', 'parking_slot', 'created_at'),
+        creatable=('house_id', 'name', 'age', 'gender', 'role', 'contact_number', 'emergency_contact', 'vehicle_number',
+                   'parking_slot'),
+        updatable=('house_id', 'name', 'age', 'gender', 'role', 'contact_number', 'emergency_contact', 'vehicle_number',
+                   'parking_slot'),
+        filters=('house_id', 'role', 'vehicle_number', 'parking_slot'),
+        member_scope=lambda claims: Member.house_id == claims['house'],
+    ),
+    'maintenance': ApiResource(
+        Maintenance,
+        fields=('id', 'house_id', 'month_year', 'period', 'amount', 'paid_amount', 'payment_status', 'payment_date',
+                'receipt_number', 'payment_method', 'late_fee', 'created_at'),
+        creatable=('house_id', 'month_year', 'amount'),
+        updatable=('amount', 'paid_amount', 'payment_method'),
+        filters=('house_id', 'period', 'payment_status'),
+        member_scope=lambda claims: Maintenance.house_id == claims['house'],
+        prepare=_prepare_maintenance,
+    ),
+    'complaints': ApiResource(
+        Complaint,
+        fields=('id', 'title', 'description', 'category', 'status', 'priority', 'created_by', 'house_id',
+                'created_at', 'updated_at', 'resolved_at', 'admin_notes'),
+        creatable=('title', 'description', 'category', 'priority', 'house_id'),
+        updatable=('status', 'priority', 'admin_notes'),
+        filters=('status', 'priority', 'category', 'house_id'),
+        member_scope=lambda claims: Complaint.created_by == claims['uid'],
+        member_creatable=('title', 'description', 'category', 'priority'),
+        owner_values=lambda claims: {'created_by': claims['uid'], **({} if claims['admin'] else {'house_id': claims['house']})},
+        prepare=_prepare_complaint,
+        after_commit=_complaints_committed,
+    ),
+    'expenses': ApiResource(
+        Expense,
+        fields=('id', 'category', 'description', 'amount', 'expense_date', 'created_at', 'created_by'),
+        creatable=('category', 'description', 'amount', 'expense_date'),
+        updatable=('category', 'description', 'expense_date'),
+        filters=('category', 'expense_date'),
+        owner_values=lambda claims: {'created_by': claims['uid']},
+        prepare=_prepare_expense,
+    ),
+    'documents': ApiResource(
+        Document,
+        fields=('id', 'title', 'description', 'document_type', 'original_file_name', 'file_size', 'file_extension',
+                'upload_date', 'uploaded_by'),
+        filters=('document_type', 'file_extension'),
+    ),
+}
+
+def get_api_resource(name):
+    resource = API_RESOURCES.get(name)
+    if resource is None:
+        raise ApiError(404, f"Unknown resource '{name}'", resources=sorted(API_RESOURCES))
+    return resource
+
+def _bulk_items():
+    payload = request.get_json(silent=True)
+    items = payload.get('items') if isinstance(payload, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ApiError(400, "Request body must be a JSON object with a non-empty 'items' list")
+    if len(items) > app.config['API_MAX_BULK_ITEMS']:
+        raise ApiError(413, f"At most {app.config['API_MAX_BULK_ITEMS']} items per request")
+    return items
+
+def _commit_bulk(resource, objects, created):
+    """Commit a bulk write as one transaction and return the written rows, serialized"""
+    try:
+        db.session.flush()
+        # Serialized before commit so expired attributes are not reloaded row by row
+        data = _serialize_objects(list(resource.columns.values()), objects)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        raise ApiError(409, f"Constraint violation: {e.orig}")
+    if resource.after_commit:
+        resource.after_commit(objects, g.api_user, created)
+    return data
+
+@app.route('/api/v1/auth/token', methods=['POST'])
+@read_only_request
+def api_token():
+    credentials = request.get_json(silent=True) or request.form
+    username = credentials.get('username', '')
+    password = credentials.get('password', '')
+    login_type = credentials.get('login_type', 'member')
+    
+    user = User.query.filter_by(username=username).first()
+    if not user or not check_password_hash(user.password_hash, password):
+        raise ApiError(401, 'Invalid username or password')
+    if (login_type == 'admin' and not user.is_admin) or (login_type == 'member' and not user.is_member) \
+            or login_type not in ('admin', 'member'):
+        raise ApiError(403, f'Invalid login type. Please select {login_type} login.')
+    return jsonify(token=issue_api_token(user, login_type), token_type='Bearer',
+                   expires_in=app.config['API_TOKEN_MAX_AGE'], login_type=login_type,
+                   user={'id': user.id, 'username': user.username, 'house_id': user.house_id})
+
+@app.route('/api/v1/<resource_name>')
+@api_auth_required()
+def api_list(resource_name):
+    resource = get_api_resource(resource_name)
+    columns = resource.select_columns(request.args.get('fields'))
+    id_column = resource.columns['id']
+    try:
+        limit = int(request.args.get('limit', app.config['API_PAGE_SIZE']))
+    except ValueError:
+        raise ApiError(400, "'limit' must be an integer")
+    limit = max(1, min(limit, app.config['API_MAX_PAGE_SIZE']))
+    
+    query = select(*columns).where(*resource.scope(g.api_user))
+    for name in resource.filters:
+        if name in request.args:
+            column = resource.columns[name]
+            raw = request.args[name]
+            try:
+                value = int(raw) if column.type.python_type is int else _coerce_api_value(column, raw)
+            except ValueError:
+                raise ApiError(400, f"Invalid value for filter '{name}'")
+            query = query.where(column == value)
+    if request.args.get('cursor'):
+        query = query.where(id_column > _decode_cursor(request.args['cursor']))
+    
+    # Keyset pagination: fetch one extra row to know whether another page exists
+    rows = db.session.execute(query.order_by(id_column).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return jsonify(data=_serialize_rows(columns, rows),
+                   next_cursor=_encode_cursor(rows[-1][0]) if has_more else None)
+
+@app.route('/api/v1/<resource_name>/<int:item_id>')
+@api_auth_required()
+def api_detail(resource_name, item_id):
+    resource = get_api_resource(resource_name)
+    columns = resource.select_columns(request.args.get('fields'))
+    row = db.session.execute(
+        select(*columns).where(resource.columns['id'] == item_id, *resource.scope(g.api_user))
+    ).first()
+    if row is None:
+        raise ApiError(404, f"{resource_name} {item_id} not found")
+    return jsonify(data=_serialize_rows(columns, [row])[0])
+
+@app.route('/api/v1/<resource_name>/bulk', methods=['POST'])
+@api_auth_required()
+@idempotent
+def api_bulk_create(resource_name):
+    """Create every item or none of them"""
+    resource = get_api_resource(resource_name)
+    claims = g.api_user
+    resource.scope(claims)
+    allowed = resource.creatable if claims['admin'] else resource.member_creatable
+    if not allowed:
+        raise ApiError(403, f"{resource_name} cannot be created through the API with this token")
+    owner_values = resource.owner_values(claims)
+    required = {name for name in allowed if name not in owner_values
+                and not resource.columns[name].nullable and resource.columns[name].default is None}
+    
+    objects = []
+    for index, item in enumerate(_bulk_items()):
+        if not isinstance(item, dict):
+            raise ApiError(400, 'Each item must be a JSON object', index=index)
+        unknown = set(item) - allowed
+        missing = required - set(item)
+        if unknown or missing:
+            problems = ([f"unknown or read-only field(s): {', '.join(sorted(unknown))}"] if unknown else []) + \
+                       ([f"missing field(s): {', '.join(sorted(missing))}"] if missing else [])
+            raise ApiError(400, '; '.join(problems), index=index)
+        try:
+            values = {name: _coerce_api_value(resource.columns[name], value) for name, value in item.items()}
+            values.update(owner_values)
+            obj = resource.model()
+            if resource.prepare:
+                resource.prepare(obj, values, claims, True)
+            for name, value in values.items():
+                setattr(obj, name, value)
+        except ValueError as e:
+            raise ApiError(400, str(e), index=index)
+        except ApiError as e:
+            e.details.setdefault('index', index)
+            raise
+        db.session.add(obj)
+        objects.append(obj)
+    
+    return jsonify(data=_commit_bulk(resource, objects, True)), 201
+
+@app.route('/api/v1/<resource_name>/bulk', methods=['PATCH'])
+@api_auth_required(admin=True)
+@idempotent
+def api_bulk_update(resource_name):
+    """Update every item or none of them; each item names its id"""
+    resource = get_api_resource(resource_name)
+    if not resource.updatable:
+        raise ApiError(403, f"{resource_name} cannot be updated through the API")
+    items = _bulk_items()
+    ids = []
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or isinstance(item.get('id'), bool) or not isinstance(item.get('id'), int):
+            raise ApiError(400, "Each item must be a JSON object with an integer 'id'", index=index)
+        ids.append(item['id'])
+    if len(set(ids)) != len(ids):
+        raise ApiError(400, 'Each id may appear only once per request')
+    
+    # One query loads and locks every target row, in id order so overlapping bulk updates cannot deadlock
+    model = resource.model
+    objects = {obj.id: obj for obj in lock_for_update(model.query).filter(model.id.in_(ids)).order_by(model.id).all()}
+    for index, item in enumerate(items):
+        obj = objects.get(item['id'])
+        if obj is None:
+            raise ApiError(404, f"{resource_name} {item['id']} not found", index=index)
+        unknown = set(item) - resource.updatable - {'id'}
+        if unknown:
+            raise ApiError(400, f"unknown or read-only field(s): {', '.join(sorted(unknown))}", index=index)
+        try:
+            values = {name: _coerce_api_value(resource.columns[name], value)
+                      for name, value in item.items() if name != 'id'}
+            if resource.prepare:
+                resource.prepare(obj, values, g.api_user, False)
+            for name, value in values.items():
+                setattr(obj, name, value)
+        except ValueError as e:
+            raise ApiError(400, str(e), index=index)
+        except ApiError as e:
+            e.details.setdefault('index', index)
+            raise
+    
+    return jsonify(data=_commit_bulk(resource, [objects[item_id] for item_id in ids], False))
+
+# Payment Gateway Webhooks
+def sign_webhook(secret, body, timestamp=None):
+    """X-Webhook-Signature value for body: t=<unix time>,v1=<HMAC-SHA256 of "t." + body>"""
+    timestamp = int(time.time()) if timestamp is None else timestamp
+    digest = hmac.new(secret.encode(), f'{timestamp}.'.encode() + body, hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={digest}'
+
+def verify_webhook_signature(secret, body, header):
+    try:
+        parts = dict(part.split('=', 1) for part in header.split(','))
+        timestamp = int(parts['t'])
+    except (KeyError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > app.config['PAYMENT_WEBHOOK_TOLERANCE']:
+        return False
+    return hmac.compare_digest(sign_webhook(secret, body, timestamp), header.strip())
+
+@app.route('/webhooks/payments/<gateway>', methods=['POST'])
+def payment_webhook(gateway):
+    """Verify and queue a gateway event in one insert; process_payment_events() applies it later"""
+    secret = app.config['PAYMENT_WEBHOOK_SECRETS'].get(gateway)
+    if not secret:
+        return jsonify(error=f"Unknown gateway '{gateway}'"), 404
+    body = request.get_data()
+    if not verify_webhook_signature(secret, body, request.headers.get('X-Webhook-Signature', '')):
+        return jsonify(error='Invalid signature'), 401
+    try:
+        event = json.loads(body)
+        data = event.get('data') or {}
+        values = {
+            'gateway': gateway, 'event_id': str(event['id'])[:100], 'event_type': str(event['type'])[:50],
+            'payment_id': str(data['payment_id'])[:100] if data.get('payment_id') else None,
+            'payload': body.decode(), 'status': 'pending',
+            'occurred_at': datetime.utcfromtimestamp(event['created']) if event.get('created') else None,
+            'received_at': datetime.utcnow(),
+        }
+    except (AttributeError, KeyError, TypeError, ValueError, OverflowError, OSError):  # The last two: 'created' out of range
+        return jsonify(error='Malformed event'), 400
+    
+    try:
+        db.session.execute(PaymentEvent.__table__.insert(), [values])
+        db.session.commit()
+    except IntegrityError:
+        # Gateways redeliver until they see a 2xx; the first copy is already queued
+        db.session.rollback()
+        return jsonify(status='duplicate')
+    return jsonify(status='queued')
+
+def _applied_payment_event(event, event_type):
+    return PaymentEvent.query.filter_by(gateway=event.gateway, payment_id=event.payment_id,
+                                        event_type=event_type, status='applied').first()
+
+def _process_payment_event(event_pk):
+    """Apply one queued event in its own transaction; returns applied, ignored, failed, deferred or skipped"""
+    event = lock_for_update(PaymentEvent.query).filter_by(id=event_pk).first()
+    if event is None or event.status != 'pending':
+        db.session.rollback()  # Another worker got there first
+        return 'skipped'
+    
+    outcome, error = 'applied', None
+    try:
+        data = json.loads(event.payload).get('data') or {}
+        if event.event_type not in ('payment.captured', 'payment.refunded'):
+            outcome = 'ignored'  # e.g. payment.failed: nothing reaches the ledger
+        elif not event.payment_id:
+            outcome, error = 'failed', 'Event has no payment_id'
+        else:
+            maintenance = lock_for_update(Maintenance.query).filter_by(id=int(data['maintenance_id'])).first()
+            amount = float(data['amount'])
+            if maintenance is None:
+                outcome, error = 'failed', f"Maintenance record {data['maintenance_id']} not found"
+            elif amount <= 0:
+                outcome, error = 'failed', 'Amount must be positive'
+            elif event.event_type == 'payment.captured':
+                # Checked under the maintenance lock: gateways may resend a capture under a new event id
+                due = maintenance.amount - (maintenance.paid_amount or 0.0)
+                if _applied_payment_event(event, 'payment.captured'):
+                    outcome, error = 'ignored', 'Payment already captured'
+                elif amount > due:
+                    # Left for an admin to refund at the gateway; the ledger only takes what is owed
+                    outcome, error = 'failed', f'Capture of ₹{amount:.2f} exceeds the ₹{max(0.0, due):.2f} still due'
+                else:
+                    apply_maintenance_payment(maintenance, (maintenance.paid_amount or 0.0) + amount,
+                                              str(data.get('method') or 'Online')[:20])
+            elif _applied_payment_event(event, 'payment.refunded'):
+                outcome, error = 'ignored', 'Payment already refunded'
+            elif not _applied_payment_event(event, 'payment.captured'):
+                # Out of order: the capture has not arrived (or been applied) yet
+                if event.received_at > datetime.utcnow() - timedelta(seconds=app.config['PAYMENT_EVENT_DEFER_SECONDS']):
+                    db.session.rollback()
+                    return 'deferred'
+                outcome, error = 'failed', 'Refund for a payment that was never captured'
+            else:
+                reverse_maintenance_payment(maintenance, amount)
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        db.session.rollback()
+        event = lock_for_update(PaymentEvent.query).filter_by(id=event_pk).first()
+        outcome, error = 'failed', f'Malformed event data: {e}'
+    
+    event.status = outcome
+    event.error = error
+    event.processed_at = datetime.utcnow()
+    db.session.commit()
+    return outcome
+
+def process_payment_events():
+    """Apply every queued webhook event to maintenance records and the fund.
+
+    Events are applied at most once each (the event row is locked and must still be pending),
+    and a payment's capture at most once even if the gateway resends it under another event id.
+    Refunds that arrive before their capture are retried on later passes. Returns counts by outcome.
+    """
+    stats = {'applied': 0, 'ignored': 0, 'failed': 0, 'deferred': 0, 'skipped': 0, 'passes': 0}
+    batch_size = app.config['PAYMENT_EVENT_BATCH_SIZE']
+    while True:
+        stats['passes'] += 1
+        stats['deferred'] = 0
+        progress = 0
+        last_id = 0
+        while True:
+            event_ids = db.session.execute(
+                select(PaymentEvent.id).where(PaymentEvent.status == 'pending', PaymentEvent.id > last_id)
+                .order_by(PaymentEvent.id).limit(batch_size)
+            ).scalars().all()
+            db.session.commit()
+            if not event_ids:
+                break
+            for event_pk in event_ids:
+                outcome = _process_payment_event(event_pk)
+                stats[outcome] += 1
+                progress += outcome not in ('deferred', 'skipped')
+            last_id = event_ids[-1]
+        # Another pass only helps if this one applied something a deferred refund may be waiting for
+        if not progress or not stats['deferred']:
+            return stats
+
+# Bulk Import
+try:
+    import openpyxl
+except ImportError:  # CSV imports work without it
+    openpyxl = None
+
+IMPORT_KINDS = {
+    'houses': {
+        'required': ('building_wing', 'house_number', 'owner_name', 'contact_number'),
+        'optional': ('email', 'number_of_occupants'),
+    },
+    'members': {
+        'required': ('building_wing', 'house_number', 'name', 'age', 'gender', 'role'),
+        'optional': ('contact_number', 'emergency_contact', 'vehicle_number', 'parking_slot', 'username', 'password'),
+    },
+}
+MEMBER_GENDERS = ('Male', 'Female', 'Other')
+MEMBER_ROLES = ('Owner', 'Tenant')
+
+def _import_header(value):
+    return str(value or '').strip().lower().replace(' ', '_')
+
+def _import_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)  # Spreadsheets store numbers such as house numbers and phones as floats
+    return str(value).strip()
+
+def read_import_rows(path):
+    """Yield (row number, {column: text}) from a CSV or XLSX file, streaming rather than loading it whole"""
+    if path.lower().endswith('.xlsx'):
+        if openpyxl is None:
+            raise ValueError('XLSX import needs openpyxl (pip install openpyxl); save the sheet as CSV instead')
+        workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [_import_header(value) for value in next(rows, ())]
+            for number, values in enumerate(rows, start=2):
+                if any(value is not None for value in values):
+                    yield number, {name: _import_cell(value) for name, value in zip(header, values) if name}
+        finally:
+            workbook.close()
+        return
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = [_import_header(value) for value in next(reader, [])]
+        for number, values in enumerate(reader, start=2):
+            if any(value.strip() for value in values):
+                yield number, {name: value.strip() for name, value in zip(header, values) if name}
+
+def _import_text(row, name, column, required=True):
+    value = row.get(name, '')
+    if not value:
+        if required:
+            raise ValueError(f"'{name}' is required")
+        return None
+    if column.type.length and len(value) > column.type.length:
+        raise ValueError(f"'{name}' must be at most {column.type.length} characters")
+    return value
+
+def _import_int(row, name, default=None, minimum=0):
+    value = row.get(name, '')
+    if not value:
+        if default is None:
+            raise ValueError(f"'{name}' is required")
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"'{name}' must be a whole number")
+    if number < minimum:
+        raise ValueError(f"'{name}' must be at least {minimum}")
+    return number
+
+def _house_key(wing, number):
+    return wing.strip().lower(), number.strip().lower()
+
+def _existing_house_ids():
+    return {_house_key(wing, number): house_id for house_id, wing, number in
+            db.session.execute(select(House.id, House.building_wing, House.house_number))}
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+def _password_hash_pool():
+    """Process pool shared by every import, created on first use.
+
+    Workers are spawned, not forked: a fork of this threaded server could inherit a lock held by
+    the audit writer, live event broker or connection pool at that moment and hang on it.
+    """
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(max_workers=app.config['IMPORT_HASH_WORKERS'],
+                                             mp_context=multiprocessing.get_context('spawn'))
+        return _hash_pool
+
+def _hash_passwords(passwords):
+    """generate_password_hash for each password, spread over IMPORT_HASH_WORKERS processes"""
+    workers = min(app.config['IMPORT_HASH_WORKERS'], len(passwords))
+    if workers <= 1:
+        return [generate_password_hash(password) for password in passwords]
+    # PBKDF2 is deliberately slow and holds the GIL, so threads would not help
+    return list(_password_hash_pool().map(generate_password_hash, passwords,
+                                          chunksize=max(1, len(passwords) // (workers * 4))))
+
+class BulkImport:
+    """One import run: validates rows, inserts the valid ones in batches and collects per-row errors"""
+    def __init__(self, kind, path, source_name=None):
+        self.kind = kind
+        self.path = path
+        self.source_name = source_name or os.path.basename(path)  # Name shown in the audit log
+        self.columns = IMPORT_KINDS[kind]['required'] + IMPORT_KINDS[kind]['optional']
+        self.stats = {'kind': kind, 'rows': 0, 'imported': 0, 'logins': 0, 'errors': 0, 'error_file': None}
+        self.errors = []  # (row number, message, row)
+    
+    def run(self):
+        started = time.perf_counter()
+        rows = read_import_rows(self.path)
+        first = next(rows, None)
+        if first is not None:
+            missing = [name for name in IMPORT_KINDS[self.kind]['required'] if name not in first[1]]
+            if missing:
+                raise ValueError(f"Missing column(s): {', '.join(missing)}")
+            self.house_ids = _existing_house_ids()
+            if self.kind == 'houses':
+                self._import(self._house_values, [first], rows, self._insert_houses)
+            else:
+                self.member_keys = {(house_id, name.lower()) for house_id, name in
+                                    db.session.execute(select(Member.house_id, Member.name))}
+                self.usernames = set(db.session.execute(select(User.username)).scalars())
+                self._import(self._member_values, [first], rows, self._insert_members)
+        db.session.commit()
+        self.stats['errors'] = len(self.errors)
+        if self.errors:
+            self.stats['error_file'] = self._write_error_file()
+        self.stats['seconds'] = round(time.perf_counter() - started, 2)
+        return self.stats
+    
+    def _import(self, validate, head, rows, insert):
+        batch = []
+        for number, row in chain(head, rows):
+            self.stats['rows'] += 1
+            try:
+                batch.append(validate(row))
+            except ValueError as e:
+                self.errors.append((number, str(e), row))
+                continue
+            if len(batch) >= app.config['IMPORT_BATCH_SIZE']:
+                insert(batch)
+                batch = []
+        if batch:
+            insert(batch)
+    
+    def _house_values(self, row):
+        columns = House.__table__.c
+        values = {
+            'building_wing': _import_text(row, 'building_wing', columns.building_wing),
+            'house_number': _import_text(row, 'house_number', columns.house_number),
+            'owner_name': _import_text(row, 'owner_name', columns.owner_name),
+            'contact_number': _import_text(row, 'contact_number', columns.contact_number),
+            'email': _import_text(row, 'email', columns.email, required=False),
+            'number_of_occupants': _import_int(row, 'number_of_occupants', default=1, minimum=1),
+        }
+        key = _house_key(values['building_wing'], values['house_number'])
+        if key in self.house_ids:
+            raise ValueError(f"House {values['house_number']} in {values['building_wing']} already exists")
+        self.house_ids[key] = None  # Claimed, so a repeat later in the file is reported too
+        values['created_at'] = datetime.utcnow()
+        return values
+    
+    def _member_values(self, row):
+        columns = Member.__table__.c
+        house_id = self.house_ids.get(_house_key(row.get('building_wing', ''), row.get('house_number', '')))
+        if house_id is None:
+            raise ValueError(f"No house {row.get('house_number')} in {row.get('building_wing')}")
+        values = {
+            'house_id': house_id,
+            'name': _import_text(row, 'name', columns.name),
+            'age': _import_int(row, 'age'),
+            'gender': row.get('gender', '').capitalize(),
+            'role': row.get('role', '').capitalize(),
+            'contact_number': _import_text(row, 'contact_number', columns.contact_number, required=False),
+            'emergency_contact': _import_text(row, 'emergency_contact', columns.emergency_contact, required=False),
+            'vehicle_number': _import_text(row, 'vehicle_number', columns.vehicle_number, required=False),
+            'parking_slot': _import_text(row, 'parking_slot', columns.parking_slot, required=False),
+            'created_at': datetime.utcnow(),
+        }
+        if values['gender'] not in MEMBER_GENDERS:
+            raise ValueError(f"'gender' must be one of {', '.join(MEMBER_GENDERS)}")
+        if values['role'] not in MEMBER_ROLES:
+            raise ValueError(f"'role' must be one of {', '.join(MEMBER_ROLES)}")
+        member_key = (house_id, values['name'].lower())
+        if member_key in self.member_keys:
+            raise ValueError(f"{values['name']} is already a member of this house")
+        
+        username = _import_text(row, 'username', User.__table__.c.username, required=False)
+        password = row.get('password', '')
+        if username or password:
+            if not (username and password):
+                raise ValueError("'username' and 'password' must be given together")
+            if len(password) < 6:
+                raise ValueError('Password must be at least 6 characters long')
+            if username in self.usernames:
+                raise ValueError(f'Username "{username}" already exists')
+            self.usernames.add(username)
+        self.member_keys.add(member_key)
+        return values, (username, password) if username else None
+    
+    def _insert_houses(self, batch):
+        db.session.execute(House.__table__.insert(), batch)
+        self._commit_batch('house', len(batch))
+    
+    def _insert_members(self, batch):
+        db.session.execute(Member.__table__.insert(), [values for values, _ in batch])
+        logins = [(values, login) for values, login in batch if login]
+        if logins:
+            hashes = _hash_passwords([password for _, (_, password) in logins])
+            db.session.execute(User.__table__.insert(), [
+                {'username': username, 'password_hash': password_hash, 'is_admin': False, 'is_member': True,
+                 'house_id': values['house_id'], 'created_at': values['created_at']}
+                for (values, (username, _)), password_hash in zip(logins, hashes)
+            ])
+            self.stats['logins'] += len(logins)
+        self._commit_batch('member', len(batch), extra_tables=['user'] if logins else [])
+    
+    def _commit_batch(self, table_name, count, extra_tables=()):
+        # Core INSERTs skip the ORM flush hooks: bump cached listings and audit the batch here
+        mark_data_changed(db.session, [table_name, *extra_tables])
+        db.session.commit()
+        self.stats['imported'] += count
+        actor_id, actor_name, source, request_path = _audit_actor()
+        audit_writer.enqueue([{
+            'entity_type': table_name, 'entity_id': None, 'action': 'import',
+            'changes': json.dumps({'rows': count, 'file': self.source_name}),
+            'actor_id': actor_id, 'actor_name': actor_name, 'source': source, 'request_path': request_path,
+            'created_at': datetime.utcnow(),
+        }])
+    
+    def _write_error_file(self):
+        name = f"{self.kind}-errors-{datetime.utcnow():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:6]}.csv"
+        with open(os.path.join(app.config['IMPORT_FOLDER'], name), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            # Passwords are never written back out
+            columns = [name for name in self.columns if name != 'password']
+            writer.writerow(['row', 'error', *columns])
+            for number, message, row in self.errors:
+                writer.writerow([number, message, *(row.get(name, '') for name in columns)])
+        return name
+
+def import_records(kind, path, source_name=None):
+    """Import houses or members from a CSV/XLSX file; returns stats including the error report file name"""
+    return BulkImport(kind, path, source_name).run()
+
+@app.route('/import', methods=['GET', 'POST'])
+@admin_required
+def bulk_import():
+    result = None
+    if request.method == 'POST':
+        kind = request.form.get('kind')
+        file = request.files.get('file')
+        extension = os.path.splitext(file.filename)[1].lower() if file and file.filename else ''
+        if kind not in IMPORT_KINDS:
+            flash('Choose what to import', 'error')
+        elif extension not in ('.csv', '.xlsx'):
+            flash('Upload a .csv or .xlsx file', 'error')
+        else:
+            path = os.path.join(app.config['IMPORT_FOLDER'], f'upload-{uuid.uuid4().hex}{extension}')
+            file.save(path)
+            try:
+                result = import_records(kind, path, secure_filename(file.filename))
+            except (ValueError, OSError, csv.Error) as e:
+                db.session.rollback()
+                flash(f'Import failed: {str(e)}', 'error')
+            finally:
+                os.remove(path)
+            if result:
+                flash(f"Imported {result['imported']} of {result['rows']} {kind} in {result['seconds']}s"
+                      f"{' with ' + str(result['logins']) + ' logins' if result['logins'] else ''}.",
+                      'success' if not result['errors'] else 'warning')
+    return render_template('bulk_import.html', kinds=IMPORT_KINDS, result=result, xlsx_supported=openpyxl is not None)
+
+@app.route('/import/errors/<name>')
+@admin_required
+def import_error_file(name):
+    return send_from_directory(app.config['IMPORT_FOLDER'], secure_filename(name), as_attachment=True)
+
+# Archival
+ARCHIVE_MANIFEST = 'manifest.jsonl'
+
+class ArchiveTable:
+    """A hot table whose closed rows move to cold storage, one file set per calendar year"""
+    def __init__(self, model, title, closed_before, year_of):
+        self.model = model
+        self.title = title
+        self.closed_before = closed_before  # year -> filter for closed rows older than 1 January of that year
+        self.year_of = year_of  # serialized row -> calendar year it is archived under
+
+ARCHIVE_TABLES = {
+    'maintenance': ArchiveTable(
+        Maintenance, 'Maintenance Records',
+        lambda year: and_(Maintenance.payment_status == 'Paid', Maintenance.period < year * 12),
+        lambda row: row['period'] // 12,
+    ),
+    'complaint': ArchiveTable(
+        Complaint, 'Resolved Complaints',
+        lambda year: and_(Complaint.status == 'Resolved', Complaint.resolved_at < datetime(year, 1, 1)),
+        lambda row: int(row['resolved_at'][:4]),
+    ),
+    'expense': ArchiveTable(
+        Expense, 'Expenses',
+        lambda year: Expense.expense_date < date(year, 1, 1),
+        lambda row: int(row['expense_date'][:4]),
+    ),
+}
+
+def _archive_path(*parts):
+    return os.path.join(app.config['ARCHIVE_FOLDER'], *parts)
+
+def read_archive_manifest():
+    """Manifest entries in write order; a part is 'written' before its rows are deleted, then 'purged'"""
+    path = _archive_path(ARCHIVE_MANIFEST)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def archive_parts(table_name=None, year=None):
+    """Latest manifest entry per archive part, optionally for one table and year"""
+    parts = OrderedDict()
+    for entry in read_archive_manifest():
+        if (table_name is None or entry['table'] == table_name) and (year is None or entry['year'] == year):
+            parts[entry['file']] = entry
+    return list(parts.values())
+
+def _append_manifest(entry):
+    # Append-only: earlier lines are never rewritten, so a crash can at worst lose the last line
+    with open(_archive_path(ARCHIVE_MANIFEST), 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, sort_keys=True) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def iter_archive_rows(entry):
+    """Rows of one archive part, after checking its checksum"""
+    path = _archive_path(entry['file'])
+    if _file_sha256(path) != entry['sha256']:
+        raise ValueError(f"Checksum mismatch for archive {entry['file']}")
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+def verify_archives():
+    """(entry, problem) for every archive part that is missing or fails its checksum"""
+    problems = []
+    for entry in archive_parts():
+        path = _archive_path(entry['file'])
+        if not os.path.exists(path):
+            problems.append((entry, 'missing'))
+        elif _file_sha256(path) != entry['sha256']:
+            problems.append((entry, 'checksum mismatch'))
+    return problems
+
+def _purge_archived_rows(table, entry, closed_filter):
+    """Delete a written part's rows from the hot table in short batches, then mark it purged"""
+    model = table.model
+    ids = [row['id'] for row in iter_archive_rows(entry)]
+    batch_size = app.config['ARCHIVE_BATCH_SIZE']
+    deleted = 0
+    for start in range(0, len(ids), batch_size):
+        # Rows changed since they were read no longer match closed_filter and stay in the hot table
+        deleted += model.query.filter(model.id.in_(ids[start:start + batch_size]), closed_filter) \
+            .delete(synchronize_session=False)
+        db.session.commit()
+    _append_manifest({**entry, 'state': 'purged', 'deleted': deleted, 'purged_at': datetime.utcnow().isoformat()})
+    return deleted
+
+def archive_closed_records(before_year, dry_run=False):
+    """Move closed rows dated before 1 January of before_year into compressed JSONL archives.
+
+    Each table is streamed in id order into one gzip part per calendar year. Every part is
+    checksummed and recorded in the manifest before any row is deleted, and deletes run in
+    short batches. Parts left unpurged by an interrupted run are purged first.
+    Returns {table: (rows archived, rows deleted)}.
+    """
+    os.makedirs(app.config['ARCHIVE_FOLDER'], exist_ok=True)
+    batch_size = app.config['ARCHIVE_BATCH_SIZE']
+    results = {}
+    for table_name, table in ARCHIVE_TABLES.items():
+        model = table.model
+        columns = list(model.__table__.columns)
+        closed_filter = table.closed_before(before_year)
+        if dry_run:
+            results[table_name] = (db.session.query(func.count(model.id)).filter(closed_filter).scalar(), 0)
+            continue
+        
+        archived = deleted = 0
+        for entry in archive_parts(table_name):
+            if entry['state'] == 'written':
+                deleted += _purge_archived_rows(table, entry, table.closed_before(entry['before_year']))
+        
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+        writers = {}  # year -> (relative path, temporary path, gzip file, row count)
+        last_id = 0
+        try:
+            while True:
+                rows = db.session.execute(
+                    select(*columns).where(closed_filter, model.id > last_id).order_by(model.id).limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+                for row in _serialize_rows(columns, rows):
+                    year = table.year_of(row)
+                    if year not in writers:
+                        relative_path = os.path.join(table_name, str(year), f'part-{stamp}.jsonl.gz')
+                        os.makedirs(os.path.dirname(_archive_path(relative_path)), exist_ok=True)
+                        temporary_path = _archive_path(relative_path) + '.tmp'
+                        writers[year] = [relative_path, temporary_path, gzip.open(temporary_path, 'wt', encoding='utf-8'), 0]
+                    writer = writers[year]
+                    writer[2].write(json.dumps(row, sort_keys=True) + '\n')
+                    writer[3] += 1
+                    archived += 1
+                # Release the read snapshot between pages so long archive runs hold no locks
+                db.session.commit()
+        finally:
+            for writer in writers.values():
+                writer[2].close()
+        
+        for year, (relative_path, temporary_path, _, row_count) in sorted(writers.items()):
+            with open(temporary_path, 'rb') as f:
+                os.fsync(f.fileno())
+            os.replace(temporary_path, _archive_path(relative_path))
+            entry = {
+                'table': table_name, 'year': year, 'file': relative_path, 'rows': row_count,
+                'bytes': os.path.getsize(_archive_path(relative_path)),
+                'sha256': _file_sha256(_archive_path(relative_path)),
+                'before_year': before_year, 'created_at': datetime.utcnow().isoformat(), 'state': 'written',
+            }
+            _append_manifest(entry)
+            deleted += _purge_archived_rows(table, entry, closed_filter)
+        results[table_name] = (archived, deleted)
+    return results
+
+def archive_summary():
+    """{table: {year: {'rows', 'bytes', 'parts'}}} from the manifest, for the viewer"""
+    summary = {}
+    for entry in archive_parts():
+        year_summary = summary.setdefault(entry['table'], {}).setdefault(entry['year'], {'rows': 0, 'bytes': 0, 'parts': 0})
+        year_summary['rows'] += entry['rows']
+        year_summary['bytes'] += entry['bytes']
+        year_summary['parts'] += 1
+    return summary
+
+@app.route('/archives')
+@admin_required
+def archives():
+    summary = archive_summary()
+    return render_template('archives.html', summary=summary, tables=ARCHIVE_TABLES)
+
+@app.route('/archives/<table_name>/<int:year>')
+@admin_required
+def archive_view(table_name, year):
+    table = ARCHIVE_TABLES.get(table_name)
+    if table is None:
+        flash('Unknown archive', 'error')
+        return redirect(url_for('archives'))
+    
+    search = request.args.get('q', '').strip().lower()
+    page = max(1, request.args.get('page', 1, type=int))
+    page_size = app.config['ARCHIVE_PAGE_SIZE']
+    
+    # Parts are read in write order; a row archived twice (after a crash) keeps its latest copy
+    records = OrderedDict()
+    try:
+        for entry in archive_parts(table_name, year):
+            for row in iter_archive_rows(entry):
+                if not search or any(search in str(value).lower() for value in row.values()):
+                    records[row['id']] = row
+    except (OSError, ValueError) as e:
+        flash(f'Error reading archive: {str(e)}', 'error')
+        return redirect(url_for('archives'))
+    
+    rows = list(records.values())
+    columns = [column.name for column in table.model.__table__.columns]
+    total_pages = max(1, -(-len(rows) // page_size))
+    return render_template('archive_view.html', table_name=table_name, table=table, year=year, columns=columns,
+                           rows=rows[(page - 1) * page_size:page * page_size], total=len(rows), page=page,
+                           total_pages=total_pages, search=request.args.get('q', ''))
+
+@app.route('/audit')
+@admin_required
+def audit_log():
+    # Show entries still sitting in the write buffer too
+    audit_writer.flush()
+    
+    entity_type = request.args.get('entity_type', '').strip()
+    entity_id = request.args.get('entity_id', type=int)
+    actor_id = request.args.get('actor_id', type=int)
+    before = request.args.get('before', type=int)
+    page_size = app.config['AUDIT_PAGE_SIZE']
+    
+    # Keyset paging on id keeps every page an index range scan, however deep the history
+    query = AuditLog.query
+    if entity_type:
+        query = query.filter(AuditLog.entity_type == entity_type)
+        if entity_id is not None:
+            query = query.filter(AuditLog.entity_id == entity_id)
+    if actor_id is not None:
+        query = query.filter(AuditLog.actor_id == actor_id)
+    if before is not None:
+        query = query.filter(AuditLog.id < before)
+    entries = query.order_by(AuditLog.id.desc()).limit(page_size + 1).all()
+    next_before = entries[page_size - 1].id if len(entries) > page_size else None
+    
+    entity_types = sorted(table.name for table in db.metadata.sorted_tables if table.name not in AUDIT_EXCLUDED_TABLES)
+    return render_template('audit_log.html', entries=entries[:page_size], next_before=next_before,
+                           entity_types=entity_types, entity_type=entity_type, entity_id=entity_id, actor_id=actor_id)
+
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
@@ -2367,5 +6369,9 @@ if __name__ == '__main__':
                 admin_user.email = 'admin@society.com'
                 db.session.commit()
                 print("Updated existing admin user with email: admin@society.com")
+        
+        # Create the society fund up front so postings only ever lock it
+        Fund.get_fund()
+        db.session.commit()
     
     app.run(debug=True, host='0.0.0.0', port=5002)
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""
+Load-test benchmark for Society Maintenance App
+Replays realistic admin/member workloads against a disposable database
+and reports latency percentiles and throughput per scenario
+"""
+
+import argparse
+import gzip
+import json
+import os
+import platform
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then not reported
+    resource = None
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Shared password for every generated account; hashed once because PBKDF2 is deliberately slow
+BENCH_PASSWORD = 'bench123'
+
+
+class StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Accepts any login and message, counting delivered messages"""
+
+    def handle(self):
+        self.wfile.write(b'220 stub ESMTP ready\r\n')
+        in_data = False
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            if in_data:
+                if line.rstrip(b'\r\n') == b'.':
+                    in_data = False
+                    with self.server.lock:
+                        self.server.message_count += 1
+                    self.wfile.write(b'250 OK queued\r\n')
+                continue
+
+            command = line[:4].upper()
+            if command in (b'EHLO', b'HELO'):
+                self.wfile.write(b'250-stub\r\n250 AUTH PLAIN LOGIN\r\n')
+            elif command == b'AUTH':
+                self.wfile.write(b'235 Authentication successful\r\n')
+            elif command == b'DATA':
+                in_data = True
+                self.wfile.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+            elif command == b'QUIT':
+                self.wfile.write(b'221 Bye\r\n')
+                break
+            else:
+                self.wfile.write(b'250 OK\r\n')
+
+
+class StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), StubSMTPHandler)
+        self.lock = threading.Lock()
+        self.message_count = 0
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.server_address[1]
+
+
+class WSGIClient:
+    """requests-based client with the same get/post surface as the Flask test client"""
+
+    def __init__(self, base_url):
+        import requests
+        self.base_url = base_url
+        self.session = requests.Session()
+
+    def get(self, path, headers=None):
+        return self.session.get(self.base_url + path, headers=headers, allow_redirects=False)
+
+    def post(self, path, data=None, json=None, headers=None):
+        return self.session.post(self.base_url + path, data=data, json=json, headers=headers, allow_redirects=False)
+
+    def patch(self, path, json=None, headers=None):
+        return self.session.patch(self.base_url + path, json=json, headers=headers, allow_redirects=False)
+
+
+def response_json(response):
+    """Decoded JSON body of a requests or Flask test client response (the latter is not gunzipped for us)"""
+    if not hasattr(response, 'get_data'):
+        return response.json()
+    body = response.get_data()
+    if response.headers.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+def seed_database(app_module, houses, months, expenses, smtp_port):
+    """Populate the disposable database with a representative society"""
+    from werkzeug.security import generate_password_hash
+    A = app_module
+    db = A.db
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+
+    db.create_all()
+    db.session.add(A.User(username='admin', password_hash=password_hash, email='admin@society.test', is_admin=True))
+    db.session.add(A.Fund(total_amount=10_000_000.0, last_updated=datetime.utcnow()))
+    db.session.add(A.NotificationSettings(
+        notification_type='smtp', is_active=True,
+        smtp_server='127.0.0.1', smtp_port=smtp_port,
+        smtp_username='bench', smtp_password='bench', smtp_use_tls=False,
+        sender_name='Bench Society', sender_email='society@society.test'
+    ))
+
+    wings = ['A', 'B', 'C', 'D']
+    house_rows = []
+    for i in range(houses):
+        house_rows.append(A.House(
+            house_number=f'{wings[i % len(wings)]}-{100 + i}',
+            building_wing=f'Wing {wings[i % len(wings)]}',
+            owner_name=f'Owner {i}',
+            contact_number=f'98{i:08d}',
+            email=f'owner{i}@society.test',
+            number_of_occupants=1 + i % 5
+        ))
+    db.session.add_all(house_rows)
+    db.session.flush()
+
+    today = date.today()
+    for index, house in enumerate(house_rows):
+        db.session.add(A.User(username=f'member{index}', password_hash=password_hash, is_member=True, house_id=house.id))
+        for member_number in range(2):
+            db.session.add(A.Member(
+                house_id=house.id, name=f'Member {index}-{member_number}', age=20 + (index + member_number) % 50,
+                gender='Male' if member_number == 0 else 'Female', role='Owner' if member_number == 0 else 'Tenant',
+                vehicle_number=f'MH01AB{index:04d}', parking_slot=f'P{index}'
+            ))
+        for month_offset in range(months):
+            month_index = today.month - 1 - month_offset
+            year = today.year + month_index // 12
+            month = month_index % 12 + 1
+            # Older months are settled; the latest three stay open for the month-end run
+            paid = month_offset >= 3
+            db.session.add(A.Maintenance(
+                house_id=house.id, month_year=f'{year:04d}-{month:02d}', amount=2500.0,
+                paid_amount=2500.0 if paid else 0.0, payment_status='Paid' if paid else 'Pending',
+                payment_date=today if paid else None
+            ))
+
+    categories = ['Electricity', 'Security', 'Cleaning', 'Repairs', 'Water']
+    admin = A.User.query.filter_by(username='admin').first()
+    for i in range(expenses):
+        db.session.add(A.Expense(
+            category=categories[i % len(categories)], description=f'Expense {i}',
+            amount=100.0 + i % 900, expense_date=date(today.year, 1 + i % 12, 1 + i % 28), created_by=admin.id
+        ))
+    db.session.commit()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def run_scenario(name, make_client, login, request_fn, iterations, concurrency):
+    """Run request_fn(client, i) iterations times across concurrency workers"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(iterations))
+    counter_lock = threading.Lock()
+
+    def worker(worker_index):
+        client = make_client()
+        login(client, worker_index)
+        local_latencies = []
+        local_errors = 0
+        while True:
+            with counter_lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            start = time.perf_counter()
+            response = request_fn(client, i)
+            local_latencies.append(time.perf_counter() - start)
+            if response.status_code >= 500:
+                local_errors += 1
+        with lock:
+            latencies.extend(local_latencies)
+            errors.append(local_errors)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    wall_start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall_time = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'rps': round(len(latencies) / wall_time, 2) if wall_time else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+    }
+
+
+def build_scenarios(app_module, houses):
+    A = app_module
+    with A.app.app_context():
+        pending_ids = [row.id for row in A.Maintenance.query.filter_by(payment_status='Pending').order_by(A.Maintenance.id).all()]
+
+    def login_admin(client, worker_index):
+        client.post('/login', data={'username': 'admin', 'password': BENCH_PASSWORD, 'login_type': 'admin'})
+
+    def login_member(client, worker_index):
+        client.post('/login', data={'username': f'member{worker_index % houses}', 'password': BENCH_PASSWORD, 'login_type': 'member'})
+
+    def api_login(username, login_type):
+        def login(client, worker_index):
+            name = username if login_type == 'admin' else f'{username}{worker_index % houses}'
+            response = client.post('/api/v1/auth/token', json={'username': name, 'password': BENCH_PASSWORD, 'login_type': login_type})
+            client.api_headers = {'Authorization': f"Bearer {response_json(response)['token']}", 'Accept-Encoding': 'gzip'}
+        return login
+
+    def api_get_all(client, path):
+        """Follow next_cursor through every page, like the HTML page that lists everything at once"""
+        response = client.get(path, headers=client.api_headers)
+        while response.status_code == 200:
+            cursor = response_json(response)['next_cursor']
+            if not cursor:
+                break
+            response = client.get(f'{path}&cursor={cursor}', headers=client.api_headers)
+        return response
+
+    def admin_browse(client, i):
+        return client.get('/maintenance' if i % 2 == 0 else '/members')
+
+    def member_dashboard(client, i):
+        return client.get('/member/dashboard')
+
+    def month_end_mark_paid(client, i):
+        maintenance_id = pending_ids[i % len(pending_ids)]
+        return client.post(f'/maintenance/mark_paid/{maintenance_id}', data={'paid_amount': '2500', 'payment_method': 'Online'})
+
+    def complaint_burst(client, i):
+        return client.post('/member/complaints/raise', data={
+            'title': f'Water outage report {i}', 'description': 'No water supply since morning',
+            'category': 'plumbing', 'priority': 'Urgent' if i % 10 == 0 else 'High'
+        })
+
+    def api_browse(client, i):
+        if i % 2 == 0:
+            return api_get_all(client, '/api/v1/maintenance?limit=500')
+        return api_get_all(client, '/api/v1/members?limit=500')
+
+    def api_member_dues(client, i):
+        return client.get('/api/v1/maintenance?fields=month_year,amount,paid_amount,payment_status&limit=500',
+                          headers=client.api_headers)
+
+    def api_bulk_mark_paid(client, i):
+        batch = [pending_ids[(i * 10 + n) % len(pending_ids)] for n in range(10)]
+        return client.patch('/api/v1/maintenance/bulk', headers=client.api_headers, json={
+            'items': [{'id': maintenance_id, 'paid_amount': 2500, 'payment_method': 'Online'} for maintenance_id in batch]
+        })
+
+    def report_download(client, i):
+        if i % 2 == 0:
+            return client.get('/expenses/download_report')
+        return client.get('/expenses/report')
+
+    # (name, login, request, share of the base iteration count)
+    return [
+        ('admin_browse', login_admin, admin_browse, 1.0),
+        ('member_dashboard', login_member, member_dashboard, 1.0),
+        ('month_end_mark_paid', login_admin, month_end_mark_paid, min(1.0, len(pending_ids) / 100.0)),
+        ('complaint_burst', login_member, complaint_burst, 1.0),
+        ('report_download', login_admin, report_download, 0.5),
+        # JSON API equivalents of the HTML scenarios above
+        ('api_browse', api_login('admin', 'admin'), api_browse, 1.0),
+        ('api_member_dues', api_login('member', 'member'), api_member_dues, 1.0),
+        ('api_bulk_mark_paid', api_login('admin', 'admin'), api_bulk_mark_paid, min(1.0, len(pending_ids) / 1000.0)),
+    ]
+
+
+def benchmark_environment(database_url):
+    """Where a run happened; baselines are only comparable on a matching environment"""
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'database': database_url.split(':', 1)[0],
+    }
+
+
+def compare_with_baseline(results, baseline, tolerance):
+    """Return a list of human-readable regressions against the stored baseline"""
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous:
+            continue
+        if result['p95_ms'] > previous['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {previous['p95_ms']}ms -> {result['p95_ms']}ms")
+        if result['rps'] < previous['rps'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {previous['rps']} -> {result['rps']} req/s")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Society Maintenance App workloads')
+    parser.add_argument('--database-url', help='Disposable database URL (default: temporary SQLite file)')
+    parser.add_argument('--houses', type=int, default=200, help='Number of houses to seed')
+    parser.add_argument('--months', type=int, default=24, help='Months of maintenance history per house')
+    parser.add_argument('--expenses', type=int, default=2000, help='Number of expense rows to seed')
+    parser.add_argument('--iterations', type=int, default=200, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=4, help='Concurrent clients per scenario')
+    parser.add_argument('--scenario', action='append', help='Run only the named scenario (repeatable)')
+    parser.add_argument('--wsgi', action='store_true', help='Drive a real threaded WSGI server over HTTP instead of the Flask test client')
+    parser.add_argument('--save-baseline', action='store_true', help=f'Store results as the new baseline in {os.path.basename(BASELINE_FILE)}')
+    parser.add_argument('--tolerance', type=float, default=0.20, help='Allowed regression versus baseline (fraction, default 0.20)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit non-zero when a regression is detected')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='society-bench-')
+    database_url = args.database_url or f"sqlite:///{os.path.join(work_dir, 'bench.db')}"
+    if not args.database_url:
+        print(f"🗄️  Using disposable SQLite database in {work_dir}")
+    os.environ['DATABASE_URL'] = database_url
+
+    smtp_server = StubSMTPServer()
+    smtp_port = smtp_server.start()
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import app as app_module
+    app_module.app.config['UPLOAD_FOLDER'] = os.path.join(work_dir, 'uploads')
+
+    print(f"🌱 Seeding {args.houses} houses x {args.months} months, {args.expenses} expenses...")
+    with app_module.app.app_context():
+        seed_database(app_module, args.houses, args.months, args.expenses, smtp_port)
+
+    if args.wsgi:
+        import logging
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        http_server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+        base_url = f'http://127.0.0.1:{http_server.server_port}'
+        make_client = lambda: WSGIClient(base_url)
+    else:
+        make_client = app_module.app.test_client
+
+    results = {}
+    print("=" * 78)
+    print(f"{'Scenario':<22}{'Requests':>9}{'Errors':>8}{'Req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    print("-" * 78)
+    for name, login, request_fn, share in build_scenarios(app_module, args.houses):
+        if args.scenario and name not in args.scenario:
+            continue
+        iterations = max(1, int(args.iterations * share))
+        result = run_scenario(name, make_client, login, request_fn, iterations, args.concurrency)
+        results[name] = result
+        print(f"{name:<22}{result['requests']:>9}{result['errors']:>8}{result['rps']:>10}"
+              f"{result['p50_ms']:>10}{result['p95_ms']:>10}{result['p99_ms']:>10}")
+    print("=" * 78)
+    print(f"📧 Stub SMTP server received {smtp_server.message_count} messages")
+    if resource is not None:
+        # ru_maxrss is KiB on Linux; an embedded SQLite database counts here, a MySQL server does not
+        peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"🧠 Peak RSS of the app process: {peak_rss_mb:,.0f} MB ({database_url.split(':', 1)[0]})")
+
+    exit_code = 0
+    settings = {key: getattr(args, key) for key in ('houses', 'months', 'expenses', 'iterations', 'concurrency', 'wsgi')}
+    environment = benchmark_environment(database_url)
+    if args.save_baseline:
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump({
+                'recorded_at': datetime.utcnow().isoformat(timespec='seconds'),
+                'settings': settings,
+                'environment': environment,
+                'scenarios': results,
+            }, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline saved to {BASELINE_FILE}")
+    elif os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE) as f:
+            baseline = json.load(f)
+        for label, current, recorded in (('settings', settings, baseline.get('settings')),
+                                         ('environment', environment, baseline.get('environment'))):
+            differences = [f"{key} {recorded.get(key)} -> {value}" for key, value in current.items()
+                           if recorded is not None and recorded.get(key) != value]
+            if recorded is None or differences:
+                print(f"⚠️  Baseline {label} differ{': ' + ', '.join(differences) if differences else ' (not recorded)'}; "
+                      f"compare with care or re-record with --save-baseline")
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        if regressions:
+            print(f"⚠️  Regressions versus baseline recorded {baseline.get('recorded_at')}:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            if args.fail_on_regression:
+                exit_code = 1
+        else:
+            print(f"✅ No regressions versus baseline (tolerance {args.tolerance:.0%})")
+    else:
+        print("ℹ️  No baseline stored yet; run with --save-baseline to record one")
+
+    smtp_server.shutdown()
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
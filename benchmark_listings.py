@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Listing and export benchmark for Society Maintenance App
+Loads a large maintenance listing and expense export both as full ORM entities
+(the way the views used to) and through the column-projected read models, and
+reports the time and peak Python memory of each
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+CATEGORIES = ['Electricity', 'Water', 'Security', 'Cleaning', 'Repairs', 'Gardening']
+
+
+def seed_database(A, rows):
+    """rows maintenance records (twelve months per house) and rows expenses, inserted in Core batches"""
+    db = A.db
+    db.create_all()
+    db.session.add(A.User(username='admin', password_hash='-', email='admin@society.test', is_admin=True))
+    db.session.flush()
+    admin_id = db.session.query(A.User.id).scalar()
+    houses = -(-rows // 12)
+    db.session.execute(A.House.__table__.insert(), [
+        {'house_number': f'L-{100 + i}', 'building_wing': f'Wing {"ABCD"[i % 4]}', 'owner_name': f'Owner {i}',
+         'contact_number': f'95{i:08d}', 'number_of_occupants': 3} for i in range(houses)])
+    house_ids = [row[0] for row in db.session.query(A.House.id).order_by(A.House.id)]
+    today = date.today()
+    db.session.execute(A.Maintenance.__table__.insert(), [
+        {'house_id': house_ids[n // 12], 'month_year': f'2025-{n % 12 + 1:02d}', 'period': 2025 * 12 + n % 12,
+         'amount': 2500.0, 'paid_amount': 2500.0 if n % 3 else 0.0, 'payment_status': 'Paid' if n % 3 else 'Pending',
+         'payment_date': today if n % 3 else None, 'receipt_number': f'RCP{n:08d}' if n % 3 else None,
+         'payment_method': 'Cash', 'late_fee': 0.0} for n in range(rows)])
+    db.session.execute(A.Expense.__table__.insert(), [
+        {'category': CATEGORIES[n % len(CATEGORIES)], 'description': f'Invoice {n}, paid by cheque',
+         'amount': float(100 + n % 5000), 'expense_date': today - timedelta(days=n % 730), 'created_by': admin_id}
+        for n in range(rows)])
+    db.session.commit()
+
+
+def listing_with_entities(A):
+    records = A.Maintenance.query.join(A.House) \
+        .order_by(A.Maintenance.period.desc(), A.House.building_wing, A.House.house_number).all()
+    # The template reads the house through the relationship on every row
+    return sum(len(record.house.house_number) + len(record.payment_status) for record in records)
+
+
+def listing_with_read_model(A):
+    listing = A.maintenance_listing
+    records = listing.all(listing.select().select_from(A.Maintenance).join(A.House)
+                          .order_by(A.Maintenance.period.desc(), A.House.building_wing, A.House.house_number))
+    return sum(len(record.house_number) + len(record.payment_status) for record in records)
+
+
+def export_with_entities(A):
+    csv_content = "Date,Category,Description,Amount,Created By\n"
+    for expense in A.Expense.query.order_by(A.Expense.expense_date.desc()).all():
+        csv_content += f"{expense.expense_date},{expense.category},{expense.description},{expense.amount},{expense.creator.username}\n"
+    return len(csv_content)
+
+
+def export_with_read_model(A):
+    return len(A.expense_report_csv())
+
+
+def measure(A, fn, repeat):
+    """(best seconds, peak traced MB); every run starts from an empty session"""
+    timings = []
+    for _ in range(repeat):
+        A.db.session.remove()
+        gc.collect()
+        started = time.perf_counter()
+        fn(A)
+        timings.append(time.perf_counter() - started)
+    A.db.session.remove()
+    gc.collect()
+    tracemalloc.start()
+    fn(A)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    A.db.session.remove()
+    return min(timings), peak / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark ORM entities against read-model projections for listings and exports')
+    parser.add_argument('--rows', type=int, default=100_000, help='Maintenance records and expenses to seed')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per case (best is reported)')
+    parser.add_argument('--database-url', help='Disposable database URL (default: temporary SQLite file)')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='society-listings-')
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(work_dir, 'listings.db')}"
+    import app as A
+
+    print("🚀 Society App Listing and Export Benchmark")
+    print("=" * 70)
+    print(f"🌱 Seeding {args.rows:,} maintenance records and {args.rows:,} expenses...")
+    with A.app.app_context():
+        seed_database(A, args.rows)
+        print("=" * 70)
+        print(f"{'Case':<34}{'Seconds':>12}{'Peak MB':>12}{'Saved':>12}")
+        print("-" * 70)
+        for name, before, after in (('maintenance listing', listing_with_entities, listing_with_read_model),
+                                    ('expense CSV export', export_with_entities, export_with_read_model)):
+            before_seconds, before_mb = measure(A, before, args.repeat)
+            after_seconds, after_mb = measure(A, after, args.repeat)
+            print(f"{name + ' (ORM entities)':<34}{before_seconds:>12.3f}{before_mb:>12.1f}")
+            print(f"{name + ' (read model)':<34}{after_seconds:>12.3f}{after_mb:>12.1f}"
+                  f"{1 - after_mb / before_mb:>11.0%}")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
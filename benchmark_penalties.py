@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Late-fee engine benchmark for Society Maintenance App
+Times the vectorized penalty pass against the row-by-row reference on a
+synthetic ledger, and optionally end to end against a seeded database
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def synthetic_ledger(rows, seed, as_of):
+    """Ledger rows shaped like apply_late_fees() reads them: 10% pending, 5% partial, the rest paid"""
+    rng = random.Random(seed)
+    random_value = rng.random
+    houses = max(1, rows // 120)
+    months = []
+    month_index = as_of.year * 12 + as_of.month - 1
+    for offset in range(-(-rows // houses)):
+        index = month_index - offset
+        months.append((index, date(index // 12, index % 12 + 1, 1)))
+
+    ledger = []
+    for i in range(rows):
+        house_id, month_number = divmod(i, len(months))
+        period, month_start = months[month_number]
+        roll = random_value()
+        if roll < 0.10:
+            ledger.append((i + 1, house_id + 1, period, 2500.0, 0.0, None, 0.0))
+        elif roll < 0.15:
+            ledger.append((i + 1, house_id + 1, period, 2500.0, float(int(500 + random_value() * 1500)),
+                           month_start + timedelta(days=int(random_value() * 60)), 0.0))
+        else:
+            ledger.append((i + 1, house_id + 1, period, 2500.0, 2500.0,
+                           month_start + timedelta(days=int(random_value() * 40)), 0.0))
+    return ledger
+
+
+def benchmark_in_memory(A, rows, seed, as_of, skip_reference):
+    rules = A.app.config['LATE_FEE_RULES']
+    print(f"🧮 Generating {rows:,} ledger rows...")
+    ledger = synthetic_ledger(rows, seed, as_of)
+
+    if A.np is None:
+        print("⚠️  NumPy is not installed (pip install numpy); only the row-by-row engine can be timed")
+    else:
+        start = time.perf_counter()
+        columns = A.late_fee_columns(ledger)
+        columnar_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        fees = A.compute_late_fees(columns, rules, as_of)
+        vectorized_seconds = time.perf_counter() - start
+        print(f"⚡ Columnar load:      {columnar_seconds:8.3f}s ({rows / columnar_seconds:,.0f} rows/s)")
+        print(f"⚡ Vectorized penalty: {vectorized_seconds:8.3f}s ({rows / vectorized_seconds:,.0f} rows/s), "
+              f"{int((fees > 0).sum()):,} rows penalised, ₹{float(fees.sum()):,.2f} total")
+
+    if skip_reference:
+        return True
+    start = time.perf_counter()
+    reference = [A.late_fee_for_row(amount, paid, payment_date, period, rules, as_of)
+                 for _, _, period, amount, paid, payment_date, _ in ledger]
+    reference_seconds = time.perf_counter() - start
+    print(f"🐢 Row-by-row penalty: {reference_seconds:8.3f}s ({rows / reference_seconds:,.0f} rows/s)")
+
+    if A.np is None:
+        return True
+    # Rounding may differ by one paisa on exact half-paisa ties
+    mismatches = int((A.np.abs(fees - A.np.array(reference)) > 0.0101).sum())
+    print(f"📊 Speedup: {reference_seconds / vectorized_seconds:,.1f}x penalty pass, "
+          f"{reference_seconds / (vectorized_seconds + columnar_seconds):,.1f}x including columnar load")
+    if mismatches:
+        print(f"❌ {mismatches:,} rows differ from the row-by-row reference")
+        return False
+    print("✅ Vectorized results match the row-by-row reference")
+    return True
+
+
+def benchmark_database(A, rows, seed, as_of):
+    import seed_data
+    years = 10
+    houses = max(1, -(-rows // (years * 12)))
+    args = argparse.Namespace(seed=seed, houses=houses, members_per_house=0, member_logins=0, years=years,
+                              monthly_amount=2500.0, delinquency_rate=0.05, partial_rate=0.03,
+                              complaints_per_house_year=0, expenses_per_month=0, documents=0, as_of=as_of)
+    print(f"🌱 Seeding {houses:,} houses x {years * 12} months...")
+    seed_data.seed(seed_data.SeedConfig(args), 5000, False)
+
+    with A.app.app_context():
+        for label in ('First run', 'Re-run'):
+            stats = A.apply_late_fees(as_of=as_of)
+            total = stats['load_seconds'] + stats['compute_seconds'] + stats['write_seconds']
+            print(f"🗄️  {label} ({stats['engine']}): {stats['rows']:,} rows, {stats['updated']:,} updated in {total:.2f}s "
+                  f"(load {stats['load_seconds']:.2f}s, compute {stats['compute_seconds']:.2f}s, "
+                  f"write {stats['write_seconds']:.2f}s)")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the late-fee and interest engine')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Ledger rows to penalise')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for the synthetic ledger')
+    parser.add_argument('--as-of', type=date.fromisoformat, default=date.today(), help='Penalty date (YYYY-MM-DD)')
+    parser.add_argument('--skip-reference', action='store_true', help='Do not time the row-by-row reference')
+    parser.add_argument('--database', action='store_true',
+                        help='Also seed a database and time apply_late_fees() end to end, including write-back')
+    parser.add_argument('--database-url', help='Disposable database URL for --database (default: temporary SQLite file)')
+    args = parser.parse_args()
+
+    if args.database:
+        work_dir = tempfile.mkdtemp(prefix='society-penalties-')
+        os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(work_dir, 'penalties.db')}"
+    import app as app_module
+
+    print("🚀 Society App Late-Fee Benchmark")
+    print("=" * 60)
+    ok = benchmark_in_memory(app_module, args.rows, args.seed, args.as_of, args.skip_reference)
+    if args.database:
+        print("-" * 60)
+        ok = benchmark_database(app_module, args.rows, args.seed, args.as_of) and ok
+    print("=" * 60)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Payment webhook benchmark for Society Maintenance App
+A stub payment gateway fires signed webhook events (full and partial captures,
+overpayments, failed attempts, refunds, redeliveries and out-of-order events) at
+the ingest endpoint, reports ingest throughput and latency, then applies the
+queue and checks the ledger
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MONTHLY_AMOUNT = 2500.0
+STARTING_FUND = 100_000.0
+
+
+class StubGateway:
+    """Generates payments for each maintenance record the way a real gateway delivers its webhooks"""
+
+    def __init__(self, secret, rng, failed_rate, refund_rate, partial_rate, overpay_rate, duplicate_rate, reorder_window):
+        self.secret = secret
+        self.rng = rng
+        self.failed_rate = failed_rate
+        self.refund_rate = refund_rate
+        self.partial_rate = partial_rate
+        self.overpay_rate = overpay_rate
+        self.duplicate_rate = duplicate_rate
+        self.reorder_window = reorder_window
+
+    def _event(self, event_type, created, payment_id, maintenance_id, amount=MONTHLY_AMOUNT):
+        return {
+            'id': f'evt_{uuid.uuid4().hex[:24]}', 'type': event_type, 'created': created,
+            'data': {'payment_id': payment_id, 'maintenance_id': maintenance_id, 'amount': amount,
+                     'currency': 'INR', 'method': self.rng.choice(['UPI', 'Card', 'NetBanking'])},
+        }
+
+    def events(self, maintenance_ids):
+        """(events in delivery order, {maintenance id: amount that should end up paid}, captures to be rejected)"""
+        rng = self.rng
+        created = int(time.time()) - len(maintenance_ids)
+        events, expected, overpayments = [], {}, 0
+        for maintenance_id in maintenance_ids:
+            if rng.random() < self.failed_rate:
+                events.append(self._event('payment.failed', created, f'pay_{uuid.uuid4().hex[:14]}', maintenance_id))
+            if rng.random() < self.overpay_rate:
+                # More than the whole bill, so it is rejected whichever captures land first
+                events.append(self._event('payment.captured', created, f'pay_{uuid.uuid4().hex[:14]}', maintenance_id,
+                                          MONTHLY_AMOUNT + 500.0))
+                overpayments += 1
+            if rng.random() < self.partial_rate:
+                first = float(rng.randrange(1, int(MONTHLY_AMOUNT) // 100) * 100)
+                amounts = [first, MONTHLY_AMOUNT - first]
+            else:
+                amounts = [MONTHLY_AMOUNT]
+            payments = [(f'pay_{uuid.uuid4().hex[:14]}', amount) for amount in amounts]
+            for payment_id, amount in payments:
+                events.append(self._event('payment.captured', created, payment_id, maintenance_id, amount))
+            expected[maintenance_id] = MONTHLY_AMOUNT
+            if rng.random() < self.refund_rate:
+                # Refund the last installment; with a split payment the bill drops back to partially paid
+                payment_id, amount = payments[-1]
+                events.append(self._event('payment.refunded', created + 1, payment_id, maintenance_id, amount))
+                expected[maintenance_id] -= amount
+            created += 1
+
+        # Redeliveries repeat the exact body; some land well after the original
+        for event in [event for event in events if rng.random() < self.duplicate_rate]:
+            events.insert(rng.randrange(len(events) + 1), event)
+        # Deliveries race each other, so events arrive shuffled within a window
+        for start in range(0, len(events), self.reorder_window):
+            window = events[start:start + self.reorder_window]
+            rng.shuffle(window)
+            events[start:start + self.reorder_window] = window
+        return events, expected, overpayments
+
+    def deliver(self, sign_webhook, session, url, event):
+        body = json.dumps(event).encode()
+        started = time.perf_counter()
+        response = session.post(url, data=body, headers={
+            'Content-Type': 'application/json', 'X-Webhook-Signature': sign_webhook(self.secret, body)})
+        return response, time.perf_counter() - started
+
+
+def seed_database(A, payments):
+    """Pending maintenance records to be paid through the gateway, twelve months per house"""
+    db = A.db
+    db.create_all()
+    db.session.add(A.Fund(total_amount=STARTING_FUND, last_updated=datetime.utcnow()))
+    houses = [A.House(house_number=f'G-{100 + i}', building_wing='Wing G', owner_name=f'Owner {i}',
+                      contact_number=f'96{i:08d}', number_of_occupants=2) for i in range(-(-payments // 12))]
+    db.session.add_all(houses)
+    db.session.flush()
+    for n in range(payments):
+        db.session.add(A.Maintenance(house_id=houses[n // 12].id, month_year=f'2025-{n % 12 + 1:02d}',
+                                     amount=MONTHLY_AMOUNT))
+    db.session.commit()
+    return [row.id for row in A.Maintenance.query.order_by(A.Maintenance.id)]
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def fire(gateway, sign_webhook, url, events, threads):
+    import requests
+    local = threading.local()
+    statuses = Counter()
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(event):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        try:
+            response, elapsed = gateway.deliver(sign_webhook, local.session, url, event)
+            outcome = f"{response.status_code} {response.json().get('status', response.json().get('error'))}"
+        except Exception as e:
+            outcome, elapsed = f'error {type(e).__name__}', None
+        with lock:
+            statuses[outcome] += 1
+            if elapsed is not None:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, events))
+    return statuses, sorted(latencies), time.perf_counter() - started
+
+
+def check_ledger(A, expected):
+    """Problems in the final ledger; an empty list means every event was applied exactly once"""
+    problems = []
+    records = A.Maintenance.query.all()
+    wrong = [m.id for m in records if m.paid_amount != expected.get(m.id, 0.0)
+             or m.payment_status != A.maintenance_payment_status(m.paid_amount, m.amount)]
+    if wrong:
+        problems.append(f'{len(wrong)} maintenance record(s) in the wrong state, e.g. #{wrong[0]}')
+    # The fund takes a bill once it is fully paid and gives back refunds of what it took
+    miscredited = [m.id for m in records if m.credited_amount > m.paid_amount
+                   or (m.payment_status == 'Paid' and m.credited_amount != m.paid_amount)]
+    if miscredited:
+        problems.append(f'{len(miscredited)} maintenance record(s) credited to the fund wrongly, e.g. #{miscredited[0]}')
+    fund = A.Fund.get_fund().total_amount
+    expected_fund = STARTING_FUND + sum(m.credited_amount for m in records)
+    print(f"💰 Fund ₹{fund:,.2f}; expected ₹{expected_fund:,.2f}")
+    if abs(fund - expected_fund) > 0.005:
+        problems.append(f'fund is off by ₹{fund - expected_fund:,.2f}')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark payment webhook ingestion with a stub gateway')
+    parser.add_argument('--payments', type=int, default=5000, help='Maintenance records paid through the gateway')
+    parser.add_argument('--threads', type=int, default=16, help='Concurrent webhook deliveries')
+    parser.add_argument('--failed-rate', type=float, default=0.05, help='Share of payments with a failed first attempt')
+    parser.add_argument('--refund-rate', type=float, default=0.02, help='Share of payments refunded after capture')
+    parser.add_argument('--partial-rate', type=float, default=0.10, help='Share of bills paid in two partial captures')
+    parser.add_argument('--overpay-rate', type=float, default=0.02,
+                        help='Share of bills with a capture above the amount due, which must be rejected')
+    parser.add_argument('--duplicate-rate', type=float, default=0.10, help='Share of events delivered twice')
+    parser.add_argument('--reorder-window', type=int, default=50, help='Events shuffled within windows of this size')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--url', help='Webhook URL of a running app, e.g. http://localhost:5000/webhooks/payments/razorpay '
+                                      '(default: in-process server on a disposable SQLite database)')
+    parser.add_argument('--secret', default='stub-gateway-secret', help='Signing secret configured for the gateway')
+    parser.add_argument('--maintenance-ids', help='With --url: first-last maintenance ids to pay, e.g. 1-5000')
+    args = parser.parse_args()
+
+    if not args.url:
+        work_dir = tempfile.mkdtemp(prefix='society-webhooks-')
+        os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(work_dir, 'webhooks.db')}"
+    import app as app_module
+    A = app_module
+
+    print("🚀 Society App Payment Webhook Benchmark")
+    print("=" * 60)
+    if args.url:
+        url = args.url
+        first, last = (int(part) for part in (args.maintenance_ids or f'1-{args.payments}').split('-'))
+        maintenance_ids = list(range(first, last + 1))
+    else:
+        import logging
+        from werkzeug.serving import make_server
+        A.app.config['PAYMENT_WEBHOOK_SECRETS']['stub'] = args.secret
+        print(f"🌱 Seeding {args.payments:,} pending maintenance records...")
+        with A.app.app_context():
+            maintenance_ids = seed_database(A, args.payments)
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        logging.getLogger('society.slow_queries').setLevel(logging.ERROR)
+        http_server = make_server('127.0.0.1', 0, A.app, threaded=True)
+        threading.Thread(target=http_server.serve_forever, daemon=True).start()
+        url = f'http://127.0.0.1:{http_server.server_port}/webhooks/payments/stub'
+
+    gateway = StubGateway(args.secret, random.Random(args.seed), args.failed_rate, args.refund_rate, args.partial_rate,
+                          args.overpay_rate, args.duplicate_rate, args.reorder_window)
+    events, expected, overpayments = gateway.events(maintenance_ids)
+    print(f"📨 Delivering {len(events):,} signed events from {args.threads} threads...")
+    statuses, latencies, elapsed = fire(gateway, A.sign_webhook, url, events, args.threads)
+    print(f"⚡ Ingest: {len(events) / elapsed:,.0f} events/s; latency p50 {percentile(latencies, 0.50) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms")
+    for outcome, count in sorted(statuses.items()):
+        print(f"   {outcome:<24}{count:>8,}")
+    ok = all(outcome.startswith('200 ') for outcome in statuses)
+
+    if not args.url:
+        print("-" * 60)
+        with A.app.app_context():
+            started = time.perf_counter()
+            stats = A.process_payment_events()
+            elapsed = time.perf_counter() - started
+            print(f"⚙️  Worker: {stats['applied']:,} applied, {stats['ignored']:,} ignored, {stats['failed']:,} failed, "
+                  f"{stats['deferred']:,} deferred in {elapsed:.2f}s over {stats['passes']} pass(es)")
+            problems = check_ledger(A, expected)
+            if stats['failed'] != overpayments:
+                problems.append(f"{stats['failed']:,} event(s) failed; expected only the {overpayments:,} overpayment(s)")
+        http_server.shutdown()
+        for problem in problems:
+            print(f"❌ {problem}")
+        if not problems:
+            print("✅ Every payment applied exactly once; partial captures, overpayments, duplicates and "
+                  "out-of-order refunds handled")
+        ok = ok and not problems and not stats['deferred']
+    print("=" * 60)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == '__main__':
+    main()
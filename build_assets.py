@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Static asset pipeline for Society Maintenance App
+Vendors Bootstrap and Font Awesome locally, bundles them with the app
+stylesheet, fingerprints file names and precompresses to gzip/brotli
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+VENDOR_DIR = os.path.join(STATIC_DIR, 'vendor')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_FILE = os.path.join(DIST_DIR, 'manifest.json')
+
+BOOTSTRAP_CDN = 'https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist'
+FONTAWESOME_CDN = 'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0'
+
+# Local path under static/vendor -> pinned upstream URL
+VENDOR_FILES = {
+    'bootstrap/css/bootstrap.min.css': f'{BOOTSTRAP_CDN}/css/bootstrap.min.css',
+    'bootstrap/js/bootstrap.bundle.min.js': f'{BOOTSTRAP_CDN}/js/bootstrap.bundle.min.js',
+    'fontawesome/css/all.min.css': f'{FONTAWESOME_CDN}/css/all.min.css',
+}
+for font in ('fa-brands-400', 'fa-regular-400', 'fa-solid-900', 'fa-v4compatibility'):
+    for extension in ('woff2', 'ttf'):
+        VENDOR_FILES[f'fontawesome/webfonts/{font}.{extension}'] = f'{FONTAWESOME_CDN}/webfonts/{font}.{extension}'
+
+# Bundle name -> source files relative to static/, concatenated in order
+BUNDLES = {
+    'app.css': ['vendor/bootstrap/css/bootstrap.min.css', 'vendor/fontawesome/css/all.min.css', 'css/style.css'],
+    'app.js': ['vendor/bootstrap/js/bootstrap.bundle.min.js'],
+}
+
+# woff2, images and the like are already compressed
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.ttf', '.json', '.txt'}
+CSS_URL_PATTERN = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def fingerprint(name, content):
+    stem, extension = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{extension}"
+
+
+def vendor_assets():
+    """Download the pinned third-party files into static/vendor"""
+    import requests
+
+    for relative_path, url in VENDOR_FILES.items():
+        target = os.path.join(VENDOR_DIR, relative_path)
+        if os.path.exists(target):
+            print(f"ℹ️  {relative_path} already vendored")
+            continue
+        response = requests.get(url, timeout=60)
+        response.raise_for_status()
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        with open(target, 'wb') as f:
+            f.write(response.content)
+        print(f"✅ Vendored {relative_path} ({len(response.content):,} bytes)")
+
+
+def write_output(name, content, manifest):
+    """Write a fingerprinted file into dist and record it in the manifest"""
+    hashed_name = fingerprint(name, content)
+    with open(os.path.join(DIST_DIR, hashed_name), 'wb') as f:
+        f.write(content)
+    manifest[name] = hashed_name
+    return hashed_name
+
+
+def rewrite_css_urls(css, source_path, manifest):
+    """Copy files referenced by url() into dist under hashed names and point the CSS at them"""
+    source_dir = os.path.dirname(source_path)
+
+    def replace(match):
+        reference = match.group(2).strip()
+        if reference.startswith(('data:', 'http:', 'https:', '//', '#')):
+            return match.group(0)
+        path = reference.split('?', 1)[0].split('#', 1)[0]
+        asset_path = os.path.normpath(os.path.join(source_dir, path))
+        if not os.path.exists(asset_path):
+            print(f"⚠️  {os.path.relpath(source_path, STATIC_DIR)} references missing {reference}")
+            return match.group(0)
+        name = os.path.basename(asset_path)
+        if name not in manifest:
+            with open(asset_path, 'rb') as f:
+                write_output(name, f.read(), manifest)
+        suffix = reference[len(path):]
+        return f'url({manifest[name]}{suffix})'
+
+    return CSS_URL_PATTERN.sub(replace, css)
+
+
+def build_bundles():
+    manifest = {}
+    for bundle_name, sources in BUNDLES.items():
+        missing = [source for source in sources if not os.path.exists(os.path.join(STATIC_DIR, source))]
+        if missing:
+            print(f"⚠️  Skipping {bundle_name}: missing {', '.join(missing)} (run 'python build_assets.py vendor')")
+            continue
+
+        parts = []
+        for source in sources:
+            source_path = os.path.join(STATIC_DIR, source)
+            with open(source_path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            if bundle_name.endswith('.css'):
+                text = rewrite_css_urls(text, source_path, manifest)
+            parts.append(f"/* {source} */\n{text}")
+        hashed_name = write_output(bundle_name, '\n'.join(parts).encode('utf-8'), manifest)
+        print(f"✅ Built {bundle_name} -> {hashed_name}")
+    return manifest
+
+
+def precompress(manifest):
+    """Write .gz and .br siblings for compressible outputs that actually shrink"""
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+        print("ℹ️  brotli is not installed; writing gzip variants only (pip install brotli)")
+
+    for hashed_name in manifest.values():
+        if os.path.splitext(hashed_name)[1] not in COMPRESSIBLE_EXTENSIONS:
+            continue
+        path = os.path.join(DIST_DIR, hashed_name)
+        with open(path, 'rb') as f:
+            content = f.read()
+        variants = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli:
+            variants['.br'] = brotli.compress(content, quality=11)
+        for suffix, compressed in variants.items():
+            if len(compressed) < len(content):
+                with open(path + suffix, 'wb') as f:
+                    f.write(compressed)
+        sizes = ', '.join(f"{suffix[1:]} {len(data):,}" for suffix, data in variants.items())
+        print(f"   {hashed_name}: {len(content):,} bytes ({sizes})")
+
+
+def build_assets():
+    if os.path.exists(DIST_DIR):
+        shutil.rmtree(DIST_DIR)
+    os.makedirs(DIST_DIR)
+
+    manifest = build_bundles()
+    precompress(manifest)
+    with open(MANIFEST_FILE, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    print(f"📦 Wrote {len(manifest)} assets to {os.path.relpath(DIST_DIR)} (restart the app to pick them up)")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Vendor, bundle, fingerprint and precompress static assets')
+    parser.add_argument('command', nargs='?', default='all', choices=['vendor', 'build', 'all'],
+                        help="'vendor' downloads third-party files, 'build' works offline from static/vendor")
+    args = parser.parse_args()
+
+    print("🚀 Society App Asset Pipeline")
+    print("=" * 60)
+    if args.command in ('vendor', 'all'):
+        try:
+            vendor_assets()
+        except Exception as e:
+            print(f"❌ Failed to vendor assets: {e}")
+            sys.exit(1)
+    if args.command in ('build', 'all'):
+        build_assets()
+
+
+if __name__ == "__main__":
+    main()
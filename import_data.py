@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Bulk import for Society Maintenance App
+Loads houses or members from a CSV/XLSX file, the same way Houses -> Bulk Import does:
+    python import_data.py houses houses.csv
+    python import_data.py members members.xlsx --hash-workers 8
+"""
+
+import argparse
+import sys
+
+from app import app, import_records, IMPORT_KINDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import houses or members from a CSV/XLSX file')
+    parser.add_argument('kind', choices=sorted(IMPORT_KINDS), help='What the file contains (import houses first)')
+    parser.add_argument('path', help='CSV or XLSX file with a header row')
+    parser.add_argument('--hash-workers', type=int, help='Processes hashing member passwords (default: CPU count)')
+    args = parser.parse_args()
+    if args.hash_workers:
+        app.config['IMPORT_HASH_WORKERS'] = args.hash_workers
+
+    print(f"📥 Importing {args.kind} from {args.path}...")
+    with app.app_context():
+        try:
+            stats = import_records(args.kind, args.path)
+        except (ValueError, OSError) as e:
+            print(f"❌ Import failed: {e}")
+            sys.exit(1)
+    logins = f" with {stats['logins']:,} login(s)" if stats['logins'] else ''
+    print(f"✅ Imported {stats['imported']:,} of {stats['rows']:,} row(s) in {stats['seconds']}s{logins}")
+    if stats['errors']:
+        print(f"⚠️  {stats['errors']:,} row(s) skipped; see {app.config['IMPORT_FOLDER']}/{stats['error_file']}")
+    sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,8 +3,15 @@
 Database migration script to add new columns for member login functionality
 """
 
-import pymysql
+import os
+import sqlite3
 import sys
+import time
+
+try:
+    import pymysql
+except ImportError:  # Not needed for DATABASE_BACKEND=sqlite
+    pymysql = None
 
 # Database configuration
 DB_USERNAME = 'root'
@@ -13,6 +20,9 @@ DB_HOST = 'root'
 DB_PORT = 3306
 DB_NAME = 'society_app'
 
+# Rows per backfill transaction; small batches keep row locks short while the app stays online
+BACKFILL_BATCH_SIZE = 5000
+
 def migrate_database():
     """Add new columns to existing tables"""
     try:
@@ -85,6 +95,81 @@ def migrate_database():
             else:
                 print(f"❌ Error creating complaint table: {e}")
         
+        # Add complaint notification tracking
+        try:
+            cursor.execute("ALTER TABLE complaint ADD COLUMN notified_at DATETIME NULL")
+            cursor.execute("CREATE INDEX ix_complaint_notified_at ON complaint (notified_at)")
+            # Existing complaints predate digests; mark them notified so the first digest is not the whole history
+            cursor.execute("UPDATE complaint SET notified_at = created_at WHERE notified_at IS NULL")
+            print("✅ Added 'notified_at' column to complaint table")
+        except pymysql.Error as e:
+            if "Duplicate column name" in str(e):
+                print("ℹ️  'notified_at' column already exists in complaint table")
+            else:
+                print(f"❌ Error adding 'notified_at' column: {e}")
+        
+        # Add late fee column maintained by the penalty engine
+        try:
+            cursor.execute("ALTER TABLE maintenance ADD COLUMN late_fee FLOAT NOT NULL DEFAULT 0")
+            print("✅ Added 'late_fee' column to maintenance table")
+        except pymysql.Error as e:
+            if "Duplicate column name" in str(e):
+                print("ℹ️  'late_fee' column already exists in maintenance table")
+            else:
+                print(f"❌ Error adding 'late_fee' column: {e}")
+        
+        # Track how much of each payment the fund holds, so refunds and deletions debit only that
+        try:
+            cursor.execute("ALTER TABLE maintenance ADD COLUMN credited_amount FLOAT NOT NULL DEFAULT 0")
+            # Until now the fund took a record's whole paid amount once it was paid
+            cursor.execute("UPDATE maintenance SET credited_amount = paid_amount WHERE payment_status = 'Paid'")
+            print("✅ Added 'credited_amount' column to maintenance table")
+        except pymysql.Error as e:
+            if "Duplicate column name" in str(e):
+                print("ℹ️  'credited_amount' column already exists in maintenance table")
+            else:
+                print(f"❌ Error adding 'credited_amount' column: {e}")
+        
+        # Add the member's own phone number; announcements reach tenants on it
+        try:
+            cursor.execute("ALTER TABLE member ADD COLUMN contact_number VARCHAR(15) NULL")
+            print("✅ Added 'contact_number' column to member table")
+        except pymysql.Error as e:
+            if "Duplicate column name" in str(e):
+                print("ℹ️  'contact_number' column already exists in member table")
+            else:
+                print(f"❌ Error adding 'contact_number' column: {e}")
+        
+        # Add integer period column (year * 12 + month - 1) replacing string comparisons on month_year
+        try:
+            cursor.execute("ALTER TABLE maintenance ADD COLUMN period INT NULL")
+            print("✅ Added 'period' column to maintenance table")
+        except pymysql.Error as e:
+            if "Duplicate column name" in str(e):
+                print("ℹ️  'period' column already exists in maintenance table")
+            else:
+                print(f"❌ Error adding 'period' column: {e}")
+        connection.commit()
+        backfill_maintenance_periods(connection, cursor)
+        
+        try:
+            cursor.execute("CREATE INDEX ix_maintenance_house_period ON maintenance (house_id, period)")
+            print("✅ Created index ix_maintenance_house_period")
+        except pymysql.Error as e:
+            if "Duplicate key name" in str(e):
+                print("ℹ️  Index ix_maintenance_house_period already exists")
+            else:
+                print(f"❌ Error creating index ix_maintenance_house_period: {e}")
+        
+        try:
+            cursor.execute("CREATE INDEX ix_complaint_status_created ON complaint (status, created_at)")
+            print("✅ Created index ix_complaint_status_created")
+        except pymysql.Error as e:
+            if "Duplicate key name" in str(e):
+                print("ℹ️  Index ix_complaint_status_created already exists")
+            else:
+                print(f"❌ Error creating index ix_complaint_status_created: {e}")
+        
         # Commit changes
         connection.commit()
         print("✅ Database migration completed successfully!")
@@ -98,14 +183,83 @@ def migrate_database():
         print(f"❌ Database migration failed: {e}")
         return False
 
+def backfill_maintenance_periods(connection, cursor):
+    """Fill maintenance.period from month_year in short id-range transactions.
+
+    Safe to run while the app is serving traffic and to re-run after an interruption:
+    only rows whose period is still NULL are touched.
+    """
+    cursor.execute("SELECT MIN(id), MAX(id) FROM maintenance WHERE period IS NULL")
+    first_id, last_id = cursor.fetchone()
+    if first_id is None:
+        print("ℹ️  Maintenance periods already backfilled")
+        return
+    
+    updated = 0
+    start = time.time()
+    for batch_start in range(first_id, last_id + 1, BACKFILL_BATCH_SIZE):
+        cursor.execute("""
+            UPDATE maintenance
+            SET period = CAST(LEFT(month_year, 4) AS UNSIGNED) * 12 + CAST(SUBSTRING(month_year, 6, 2) AS UNSIGNED) - 1
+            WHERE id BETWEEN %s AND %s AND period IS NULL
+              AND month_year REGEXP '^[0-9]{4}-(0[1-9]|1[0-2])$'
+        """, (batch_start, batch_start + BACKFILL_BATCH_SIZE - 1))
+        updated += cursor.rowcount
+        connection.commit()
+    print(f"✅ Backfilled period for {updated} maintenance records in {time.time() - start:.1f}s")
+    
+    cursor.execute("SELECT id, month_year FROM maintenance WHERE period IS NULL LIMIT 20")
+    malformed = cursor.fetchall()
+    if malformed:
+        print("⚠️  These records have a malformed month_year and were left without a period; fix them and re-run:")
+        for record_id, month_year in malformed:
+            print(f"   maintenance #{record_id}: {month_year!r}")
+
+def migrate_sqlite_database():
+    """Add columns introduced after SQLite deployments were supported; app.py creates everything else"""
+    from setup_database import sqlite_database_path
+    path = sqlite_database_path()
+    if not os.path.exists(path):
+        print(f"ℹ️  Nothing to migrate: {path} does not exist yet; app.py creates it with every column and index")
+        return True
+    try:
+        connection = sqlite3.connect(path)
+        try:
+            migrated = False
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(member)")}
+            if columns and 'contact_number' not in columns:
+                connection.execute("ALTER TABLE member ADD COLUMN contact_number VARCHAR(15)")
+                connection.commit()
+                print("✅ Added 'contact_number' column to member table")
+                migrated = True
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(maintenance)")}
+            if columns and 'credited_amount' not in columns:
+                connection.execute("ALTER TABLE maintenance ADD COLUMN credited_amount FLOAT NOT NULL DEFAULT 0")
+                # Until now the fund took a record's whole paid amount once it was paid
+                connection.execute("UPDATE maintenance SET credited_amount = paid_amount WHERE payment_status = 'Paid'")
+                connection.commit()
+                print("✅ Added 'credited_amount' column to maintenance table")
+                migrated = True
+            if not migrated:
+                print("ℹ️  Nothing to migrate: the SQLite database is up to date")
+        finally:
+            connection.close()
+        return True
+    except sqlite3.Error as e:
+        print(f"❌ SQLite migration failed: {e}")
+        return False
+
 def main():
     print("🚀 Society App Database Migration")
     print("=" * 50)
     
+    if os.environ.get('DATABASE_BACKEND') == 'sqlite':
+        if not migrate_sqlite_database():
+            sys.exit(1)
+        return
+    
     # Check if PyMySQL is installed
-    try:
-        import pymysql
-    except ImportError:
+    if pymysql is None:
         print("❌ PyMySQL is not installed. Please install it first:")
         print("   pip install PyMySQL")
         sys.exit(1)
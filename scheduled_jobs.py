@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Scheduled jobs for Society Maintenance App
+Run these from cron, for example:
+    */15 * * * *  cd /path/to/society-app && python scheduled_jobs.py complaint-digest
+    0 9 * * 1     cd /path/to/society-app && python scheduled_jobs.py dues-reminders
+    30 1 * * *    cd /path/to/society-app && python scheduled_jobs.py late-fees
+    0 3 15 1 *    cd /path/to/society-app && python scheduled_jobs.py archive --keep-years 2
+    * * * * *     cd /path/to/society-app && python scheduled_jobs.py payment-events
+    */5 * * * *   cd /path/to/society-app && python scheduled_jobs.py announcements
+or keep a worker running with: python scheduled_jobs.py payment-events --follow
+"""
+
+import argparse
+import sys
+import time
+from datetime import date
+
+from app import (app, send_pending_complaint_digest, send_dues_reminders, apply_late_fees, archive_closed_records,
+                 verify_archives, process_payment_events, resume_announcement_broadcasts,
+                 rebuild_complaint_stats)
+
+
+def complaint_digest(args):
+    """Email admins one digest of every complaint raised since the last run"""
+    success, count, message = send_pending_complaint_digest()
+    if not success:
+        print(f"❌ {message}")
+    elif count:
+        print(f"✅ {message} ({count} complaint(s))")
+    else:
+        print(f"ℹ️  {message}")
+    return success
+
+
+def dues_reminders(args):
+    """Remind every house with overdue maintenance on each active notification channel"""
+    stats = send_dues_reminders(cycle=args.cycle, dry_run=args.dry_run)
+    print(f"📊 {stats['overdue_houses']} house(s) with overdue dues")
+    if args.dry_run:
+        print(f"ℹ️  Dry run: {stats['pending']} reminder(s) would be sent, {stats['skipped']} already sent this cycle")
+        return True
+    print(f"✅ Sent {stats['sent']} reminder(s), skipped {stats['skipped']} already sent, "
+          f"{stats['no_contact']} without contact details")
+    if stats['failed']:
+        print(f"❌ {stats['failed']} reminder(s) failed; re-run the job to retry them")
+    return stats['failed'] == 0
+
+
+def late_fees(args):
+    """Recompute late fees and interest on past months' maintenance dues"""
+    stats = apply_late_fees(as_of=args.as_of)
+    print(f"✅ Penalised {stats['rows']:,} ledger rows with the {stats['engine']} engine, {stats['updated']:,} updated "
+          f"(load {stats['load_seconds']:.2f}s, compute {stats['compute_seconds']:.2f}s, write {stats['write_seconds']:.2f}s)")
+    return True
+
+
+def archive(args):
+    """Move closed maintenance, complaints and expenses from past years into compressed archives"""
+    if args.verify:
+        problems = verify_archives()
+        for entry, problem in problems:
+            print(f"❌ {entry['file']}: {problem}")
+        if not problems:
+            print("✅ All archive files match their checksums")
+        return not problems
+
+    before_year = args.before_year or date.today().year - args.keep_years + 1
+    print(f"📦 Archiving closed records dated before {before_year}-01-01{' (dry run)' if args.dry_run else ''}")
+    for table_name, (archived, deleted) in archive_closed_records(before_year, dry_run=args.dry_run).items():
+        if args.dry_run:
+            print(f"   {table_name}: {archived:,} record(s) would be archived")
+        else:
+            print(f"   {table_name}: {archived:,} archived, {deleted:,} removed from the live table")
+    return True
+
+
+def payment_events(args):
+    """Apply queued payment gateway webhook events to maintenance records and the fund"""
+    while True:
+        started = time.perf_counter()
+        stats = process_payment_events()
+        handled = stats['applied'] + stats['ignored'] + stats['failed']
+        if handled or not args.follow:
+            print(f"✅ {stats['applied']} event(s) applied, {stats['ignored']} ignored, {stats['failed']} failed "
+                  f"in {time.perf_counter() - started:.2f}s")
+            if stats['deferred']:
+                print(f"ℹ️  {stats['deferred']} refund(s) wait for their capture event")
+        if not args.follow:
+            return stats['failed'] == 0
+        time.sleep(args.interval)
+
+
+def announcements(args):
+    """Send queued announcement broadcasts and resume any interrupted mid-way"""
+    results = resume_announcement_broadcasts()
+    for announcement_id, stats in results.items():
+        print(f"📢 Announcement #{announcement_id}: {stats['sent']} message(s) sent, {stats['failed']} failed")
+    if not results:
+        print("ℹ️  No broadcasts waiting")
+    return all(not stats['failed'] for stats in results.values())
+
+
+def complaint_sla(args):
+    """Recount complaint SLA counters from every live and archived complaint"""
+    started = time.perf_counter()
+    counted = rebuild_complaint_stats()
+    print(f"✅ Recounted SLA statistics from {counted:,} complaint(s) in {time.perf_counter() - started:.2f}s")
+    return True
+
+
+JOBS = {
+    'complaint-digest': complaint_digest,
+    'dues-reminders': dues_reminders,
+    'late-fees': late_fees,
+    'archive': archive,
+    'payment-events': payment_events,
+    'announcements': announcements,
+    'complaint-sla': complaint_sla,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a Society Maintenance App scheduled job')
+    subparsers = parser.add_subparsers(dest='job', required=True)
+    subparsers.add_parser('complaint-digest', help=complaint_digest.__doc__)
+    reminders_parser = subparsers.add_parser('dues-reminders', help=dues_reminders.__doc__)
+    reminders_parser.add_argument('--cycle', help='Reminder cycle key; a house is reminded once per cycle (default: today)')
+    reminders_parser.add_argument('--dry-run', action='store_true', help='Report what would be sent without sending')
+    late_fees_parser = subparsers.add_parser('late-fees', help=late_fees.__doc__)
+    late_fees_parser.add_argument('--as-of', type=date.fromisoformat, default=None,
+                                  help='Compute penalties as of this date, YYYY-MM-DD (default: today)')
+    archive_parser = subparsers.add_parser('archive', help=archive.__doc__)
+    archive_parser.add_argument('--keep-years', type=int, default=2,
+                                help='Calendar years kept live, including the current one (default: 2)')
+    archive_parser.add_argument('--before-year', type=int, help='Archive records dated before 1 January of this year')
+    archive_parser.add_argument('--dry-run', action='store_true', help='Count what would be archived')
+    archive_parser.add_argument('--verify', action='store_true', help='Only check archive files against their checksums')
+    events_parser = subparsers.add_parser('payment-events', help=payment_events.__doc__)
+    events_parser.add_argument('--follow', action='store_true', help='Keep running, polling the queue for new events')
+    events_parser.add_argument('--interval', type=float, default=1.0, help='Seconds between polls with --follow')
+    subparsers.add_parser('announcements', help=announcements.__doc__)
+    subparsers.add_parser('complaint-sla', help=complaint_sla.__doc__)
+    args = parser.parse_args()
+
+    with app.app_context():
+        ok = JOBS[args.job](args)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
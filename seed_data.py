@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Synthetic data seeder for Society Maintenance App
+Generates deterministic, seedable society data at scale and loads it with
+multi-row bulk inserts (or LOAD DATA LOCAL INFILE on MySQL)
+"""
+
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+WINGS = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H']
+FIRST_NAMES = ['Aarav', 'Vivaan', 'Aditya', 'Ishaan', 'Reyansh', 'Ananya', 'Diya', 'Saanvi', 'Priya', 'Kavya',
+               'Rohan', 'Arjun', 'Meera', 'Neha', 'Sanjay', 'Farhan', 'Zoya', 'Imran', 'Sarah', 'John']
+LAST_NAMES = ['Sharma', 'Patel', 'Shaikh', 'Iyer', 'Reddy', 'Gupta', 'Khan', 'Desai', 'Nair', 'Joshi',
+              'Mehta', 'Kulkarni', 'Fernandes', 'Singh', 'Bose']
+EXPENSE_CATEGORIES = ['Electricity', 'Water', 'Security', 'Cleaning', 'Repairs', 'Gardening', 'Lift Maintenance']
+COMPLAINT_CATEGORIES = ['plumbing', 'electric', 'security', 'other']
+DOCUMENT_TYPES = ['Legal', 'Financial', 'Meeting Minutes', 'Notice', 'Other']
+DOCUMENT_EXTENSIONS = ['pdf', 'docx', 'xlsx', 'jpg', 'txt']
+PAYMENT_METHODS = ['Cash', 'Online', 'Cheque', 'UPI']
+
+
+class SeedConfig:
+    """Distribution knobs for the generated society"""
+
+    def __init__(self, args):
+        self.seed = args.seed
+        self.houses = args.houses
+        self.members_per_house = args.members_per_house
+        self.years = args.years
+        self.monthly_amount = args.monthly_amount
+        self.delinquency_rate = args.delinquency_rate
+        self.partial_rate = args.partial_rate
+        self.complaints_per_house_year = args.complaints_per_house_year
+        self.expenses_per_month = args.expenses_per_month
+        self.documents = args.documents
+        self.member_logins = args.member_logins
+        self.as_of = args.as_of
+
+
+def month_starts(years, as_of):
+    """First day of each month covering the `years` years up to as_of, oldest first"""
+    months = []
+    for offset in range(years * 12 - 1, -1, -1):
+        month_index = as_of.year * 12 + as_of.month - 1 - offset
+        months.append(date(month_index // 12, month_index % 12 + 1, 1))
+    return months
+
+
+class TemporalFormatter:
+    """Converts dates for the target driver once per distinct value.
+
+    PyMySQL takes date objects directly; SQLite gets the string layout
+    SQLAlchemy itself writes, so the ORM reads seeded rows back unchanged.
+    """
+
+    def __init__(self, dialect_name):
+        self.native = dialect_name != 'sqlite'
+        self._cache = {}
+
+    def __call__(self, value):
+        if value is None or self.native:
+            return value
+        formatted = self._cache.get(value)
+        if formatted is None:
+            if isinstance(value, datetime):
+                formatted = value.strftime('%Y-%m-%d %H:%M:%S.%f')
+            else:
+                formatted = value.strftime('%Y-%m-%d')
+            self._cache[value] = formatted
+        return formatted
+
+
+HOUSE_COLUMNS = ('id', 'house_number', 'building_wing', 'owner_name', 'contact_number', 'email',
+                 'number_of_occupants', 'created_at')
+USER_COLUMNS = ('id', 'username', 'password_hash', 'email', 'is_admin', 'is_member', 'house_id', 'created_at')
+MEMBER_COLUMNS = ('id', 'house_id', 'name', 'age', 'gender', 'role', 'contact_number', 'emergency_contact',
+                  'vehicle_number', 'parking_slot', 'created_at')
+MAINTENANCE_COLUMNS = ('id', 'house_id', 'month_year', 'period', 'amount', 'paid_amount', 'payment_status', 'payment_date',
+                       'receipt_number', 'payment_method', 'late_fee', 'credited_amount', 'created_at')
+EXPENSE_COLUMNS = ('id', 'category', 'description', 'amount', 'expense_date', 'created_at', 'created_by')
+COMPLAINT_COLUMNS = ('id', 'title', 'description', 'category', 'status', 'priority', 'created_by', 'house_id',
+                     'created_at', 'updated_at', 'resolved_at', 'admin_notes', 'notified_at')
+DOCUMENT_COLUMNS = ('id', 'title', 'description', 'document_type', 'file_name', 'original_file_name', 'file_size',
+                    'file_extension', 'upload_date', 'uploaded_by')
+
+
+def history_start(months):
+    return datetime.combine(months[0], datetime.min.time())
+
+
+def generate_houses(config, rng, months, first_id, fmt):
+    wing_size = max(1, config.houses // len(WINGS) + 1)
+    created_at = fmt(history_start(months))
+    for i in range(config.houses):
+        wing = WINGS[i // wing_size % len(WINGS)]
+        floor, flat = divmod(i % wing_size, 8)
+        first_name = rng.choice(FIRST_NAMES)
+        yield (first_id + i, f"{wing}-{floor + 1}{flat + 1:02d}", f"Wing {wing}",
+               f"{first_name} {rng.choice(LAST_NAMES)}", f"9{rng.randrange(10**8, 10**9)}",
+               f"{first_name.lower()}.{first_id + i}@society.test", rng.randint(1, 6), created_at)
+
+
+def generate_users(config, house_ids, months, password_hash, first_id, fmt):
+    created_at = fmt(history_start(months))
+    for i, house_id in enumerate(house_ids[:config.member_logins]):
+        yield (first_id + i, f"resident{house_id}", password_hash, None, False, True, house_id, created_at)
+
+
+def generate_members(config, rng, house_ids, months, first_id, fmt):
+    created_at = fmt(history_start(months))
+    random = rng.random
+    member_id = first_id
+    for house_id in house_ids:
+        for n in range(config.members_per_house):
+            yield (member_id, house_id, f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", rng.randint(1, 90),
+                   'Male' if random() < 0.5 else 'Female', 'Owner' if n == 0 or random() < 0.5 else 'Tenant',
+                   f"7{rng.randrange(10**8, 10**9)}", f"8{rng.randrange(10**8, 10**9)}",
+                   f"MH{int(random() * 50) + 1:02d}AB{int(random() * 9000) + 1000}" if random() < 0.6 else None,
+                   f"P-{house_id}-{n}" if random() < 0.5 else None, created_at)
+            member_id += 1
+
+
+def generate_maintenance(config, rng, house_ids, months, first_id, fmt):
+    # Everything that only depends on the month is formatted once, not once per house
+    month_rows = []
+    for month_start in months:
+        payment_dates = [fmt(month_start + timedelta(days=day)) for day in range(41)]
+        month_rows.append((month_start.strftime('%Y-%m'), month_start.year * 12 + month_start.month - 1, payment_dates,
+                           fmt(datetime.combine(month_start, datetime.min.time()))))
+
+    random = rng.random
+    amount = config.monthly_amount
+    pending_cutoff = config.delinquency_rate
+    partial_cutoff = config.delinquency_rate + config.partial_rate
+    methods = PAYMENT_METHODS
+    method_count = len(methods)
+    maintenance_id = first_id
+    for house_id in house_ids:
+        for month_year, period, payment_dates, created_at in month_rows:
+            roll = random()
+            if roll < pending_cutoff:
+                yield (maintenance_id, house_id, month_year, period, amount, 0.0, 'Pending', None, None,
+                       methods[int(random() * method_count)], 0.0, 0.0, created_at)
+            elif roll < partial_cutoff:
+                yield (maintenance_id, house_id, month_year, period, amount, float(round(amount * (0.2 + random() * 0.6))),
+                       'Partial', payment_dates[int(random() * 41)], None, methods[int(random() * method_count)],
+                       0.0, 0.0, created_at)
+            else:
+                yield (maintenance_id, house_id, month_year, period, amount, amount, 'Paid', payment_dates[int(random() * 41)],
+                       f"RCP-{maintenance_id:06d}", methods[int(random() * method_count)], 0.0, amount, created_at)
+            maintenance_id += 1
+
+
+def generate_expenses(config, rng, months, admin_id, first_id, fmt):
+    expense_id = first_id
+    for month_start in months:
+        label = month_start.strftime('%b %Y')
+        for _ in range(config.expenses_per_month):
+            expense_date = month_start + timedelta(days=rng.randint(0, 27))
+            category = rng.choice(EXPENSE_CATEGORIES)
+            yield (expense_id, category, f"{category} charges for {label}", float(rng.randint(500, 50000)),
+                   fmt(expense_date), fmt(datetime.combine(expense_date, datetime.min.time())), admin_id)
+            expense_id += 1
+
+
+def generate_complaints(config, rng, user_houses, months, first_id, fmt):
+    complaint_id = first_id
+    expected_per_month = config.complaints_per_house_year / 12.0
+    month_starts_at = [datetime.combine(month_start, datetime.min.time()) for month_start in months]
+    hours = [timedelta(hours=hour) for hour in range(24 * 27 + 1)]
+    titles = {category: f"{category.title()} issue" for category in COMPLAINT_CATEGORIES}
+    random = rng.random
+    for user_id, house_id in user_houses:
+        for month_start in month_starts_at:
+            # Bernoulli per month keeps the expected yearly rate without drawing a Poisson variate
+            if random() >= expected_per_month:
+                continue
+            created_at = month_start + hours[int(random() * 24 * 27)]
+            # Status 85/10/5 and priority 30/45/20/5 weights, drawn without rng.choices overhead
+            status_roll = random()
+            status = 'Resolved' if status_roll < 0.85 else 'In Progress' if status_roll < 0.95 else 'Open'
+            priority_roll = random()
+            priority = ('Low' if priority_roll < 0.30 else 'Medium' if priority_roll < 0.75
+                        else 'High' if priority_roll < 0.95 else 'Urgent')
+            resolved_at = created_at + hours[1 + int(random() * 24 * 14)] if status == 'Resolved' else None
+            category = COMPLAINT_CATEGORIES[int(random() * len(COMPLAINT_CATEGORIES))]
+            yield (complaint_id, titles[category], f"Reported {category} problem in house {house_id}",
+                   category, status, priority, user_id, house_id,
+                   fmt(created_at), fmt(resolved_at or created_at), fmt(resolved_at),
+                   'Resolved by maintenance staff' if resolved_at else None, fmt(created_at))
+            complaint_id += 1
+
+
+def generate_documents(config, rng, months, admin_id, first_id, fmt):
+    start = history_start(months)
+    span_days = (config.as_of - months[0]).days
+    for i in range(config.documents):
+        document_id = first_id + i
+        extension = rng.choice(DOCUMENT_EXTENSIONS)
+        uploaded = start + timedelta(days=rng.randint(0, span_days))
+        yield (document_id, f"{rng.choice(DOCUMENT_TYPES)} document {document_id}", None, rng.choice(DOCUMENT_TYPES),
+               f"seed_{document_id}.{extension}", f"document_{document_id}.{extension}",
+               rng.randint(10_000, 5_000_000), extension, fmt(uploaded), admin_id)
+
+
+class BulkLoader:
+    """Writes row tuples to a table in fixed-size batches through the raw driver"""
+
+    def __init__(self, engine, batch_size, use_load_data):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.use_load_data = use_load_data
+        self.placeholder = '?' if engine.dialect.paramstyle == 'qmark' else '%s'
+        self.stats = []
+
+    def load(self, table_name, columns, rows):
+        start = time.perf_counter()
+        total = 0
+        quote = self.engine.dialect.identifier_preparer.quote
+        statement = (f"INSERT INTO {quote(table_name)} ({', '.join(quote(column) for column in columns)}) "
+                     f"VALUES ({', '.join([self.placeholder] * len(columns))})")
+        with self.engine.begin() as connection:
+            self._prepare_session(connection)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) >= self.batch_size:
+                    total += self._flush(connection, table_name, columns, statement, batch)
+                    batch = []
+            if batch:
+                total += self._flush(connection, table_name, columns, statement, batch)
+        elapsed = time.perf_counter() - start
+        self.stats.append((table_name, total, elapsed))
+        print(f"   {table_name:<12} {total:>10,} rows  {elapsed:7.2f}s  {total / elapsed if elapsed else 0:>12,.0f} rows/s")
+        return total
+
+    def _prepare_session(self, connection):
+        if self.engine.dialect.name == 'sqlite':
+            # Seeding is restartable, so trade crash durability for speed on this connection
+            connection.exec_driver_sql('PRAGMA synchronous = OFF')
+        elif self.engine.dialect.name == 'mysql':
+            connection.exec_driver_sql('SET unique_checks = 0, foreign_key_checks = 0')
+
+    def _flush(self, connection, table_name, columns, statement, batch):
+        if self.use_load_data:
+            return self._load_data_infile(connection, table_name, columns, batch)
+        # Bypasses SQLAlchemy bind processing; PyMySQL rewrites executemany into multi-row INSERTs
+        connection.exec_driver_sql(statement, batch)
+        return len(batch)
+
+    @staticmethod
+    def _load_data_infile(connection, table_name, columns, batch):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            for row in batch:
+                writer.writerow([r'\N' if value is None else int(value) if isinstance(value, bool) else value
+                                 for value in row])
+            path = f.name
+        try:
+            connection.exec_driver_sql(
+                f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE `{table_name}` "
+                f"FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\n' "
+                f"({', '.join(f'`{column}`' for column in columns)})"
+            )
+        finally:
+            os.remove(path)
+        return len(batch)
+
+
+def next_id(connection, table):
+    from sqlalchemy import func, select
+    return (connection.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+def seed(config, batch_size, use_load_data):
+    from sqlalchemy import create_engine, func, select
+    from werkzeug.security import generate_password_hash
+    import app as app_module
+    A = app_module
+    rng = random.Random(config.seed)
+
+    with A.app.app_context():
+        A.db.create_all()
+        engine = A.db.engine
+        if use_load_data:
+            if engine.dialect.name != 'mysql':
+                print("❌ --load-data is only supported on MySQL")
+                sys.exit(1)
+            engine = create_engine(engine.url, connect_args={'local_infile': True})
+        fmt = TemporalFormatter(engine.dialect.name)
+
+        admin = A.User.query.filter_by(username='admin').first()
+        if not admin:
+            admin = A.User(username='admin', password_hash=generate_password_hash('admin123'),
+                           email='admin@society.com', is_admin=True)
+            A.db.session.add(admin)
+            A.db.session.commit()
+        admin_id = admin.id
+        # The loader writes through other connections; on SQLite (WAL) an open read transaction
+        # here would be left on a stale snapshot and could not update the fund afterwards
+        A.db.session.commit()
+
+        with engine.connect() as connection:
+            first_ids = {model: next_id(connection, model.__table__) for model in
+                         (A.House, A.User, A.Member, A.Maintenance, A.Expense, A.Complaint, A.Document)}
+
+        loader = BulkLoader(engine, batch_size, use_load_data)
+        months = month_starts(config.years, config.as_of)
+        house_ids = list(range(first_ids[A.House], first_ids[A.House] + config.houses))
+        # One hash for all generated logins; hashing each one would dominate the run
+        password_hash = generate_password_hash('resident123')
+        user_houses = [(first_ids[A.User] + i, house_id) for i, house_id in enumerate(house_ids[:config.member_logins])]
+
+        print(f"🌱 Seeding with seed={config.seed}, as of {config.as_of.isoformat()}, batch size {batch_size}"
+              f"{' via LOAD DATA LOCAL INFILE' if use_load_data else ''}")
+        start = time.perf_counter()
+        loader.load('house', HOUSE_COLUMNS, generate_houses(config, rng, months, first_ids[A.House], fmt))
+        loader.load('user', USER_COLUMNS, generate_users(config, house_ids, months, password_hash, first_ids[A.User], fmt))
+        loader.load('member', MEMBER_COLUMNS, generate_members(config, rng, house_ids, months, first_ids[A.Member], fmt))
+        loader.load('maintenance', MAINTENANCE_COLUMNS,
+                    generate_maintenance(config, rng, house_ids, months, first_ids[A.Maintenance], fmt))
+        loader.load('expense', EXPENSE_COLUMNS, generate_expenses(config, rng, months, admin_id, first_ids[A.Expense], fmt))
+        if user_houses:
+            loader.load('complaint', COMPLAINT_COLUMNS,
+                        generate_complaints(config, rng, user_houses, months, first_ids[A.Complaint], fmt))
+        loader.load('document', DOCUMENT_COLUMNS, generate_documents(config, rng, months, admin_id, first_ids[A.Document], fmt))
+        elapsed = time.perf_counter() - start
+
+        # Raw driver inserts bypass the ORM hooks, so invalidate cached listings explicitly
+        with engine.begin() as connection:
+            A.bump_data_versions(connection, [name for name, _, _ in loader.stats])
+
+        # Keep the society fund consistent with the generated ledger
+        with engine.connect() as connection:
+            collected = connection.execute(select(func.coalesce(func.sum(A.Maintenance.__table__.c.credited_amount), 0))).scalar()
+            spent = connection.execute(select(func.coalesce(func.sum(A.Expense.__table__.c.amount), 0))).scalar()
+        fund = A.Fund.get_fund()
+        fund.total_amount = float(collected) - float(spent)
+        fund.last_updated = datetime.combine(config.as_of, datetime.min.time())
+        A.db.session.commit()
+
+    total_rows = sum(rows for _, rows, _ in loader.stats)
+    return total_rows, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Seed the Society Maintenance App database with synthetic data')
+    parser.add_argument('--seed', type=int, default=42,
+                        help='Random seed; the same seed and --as-of produce the same data')
+    parser.add_argument('--as-of', type=date.fromisoformat, default=None,
+                        help='Date the generated history ends on, YYYY-MM-DD (default: today); '
+                             'every generated date is derived from it')
+    parser.add_argument('--houses', type=int, default=5000)
+    parser.add_argument('--members-per-house', type=int, default=4)
+    parser.add_argument('--member-logins', type=int, default=None, help='Houses that get a resident login (default: all)')
+    parser.add_argument('--years', type=int, default=10, help='Years of monthly maintenance history')
+    parser.add_argument('--monthly-amount', type=float, default=2500.0)
+    parser.add_argument('--delinquency-rate', type=float, default=0.05, help='Share of maintenance rows left Pending')
+    parser.add_argument('--partial-rate', type=float, default=0.03, help='Share of maintenance rows paid partially')
+    parser.add_argument('--complaints-per-house-year', type=float, default=1.5)
+    parser.add_argument('--expenses-per-month', type=int, default=40)
+    parser.add_argument('--documents', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+    parser.add_argument('--load-data', action='store_true', help='Use LOAD DATA LOCAL INFILE (MySQL only)')
+    parser.add_argument('--database-url', help='Target database (default: DATABASE_URL or the MySQL settings in app.py)')
+    args = parser.parse_args()
+    if args.member_logins is None:
+        args.member_logins = args.houses
+    if args.as_of is None:
+        args.as_of = date.today()
+    if args.delinquency_rate + args.partial_rate > 1:
+        parser.error('--delinquency-rate and --partial-rate must add up to at most 1')
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+
+    print("🚀 Society App Synthetic Data Seeder")
+    print("=" * 60)
+    total_rows, elapsed = seed(SeedConfig(args), args.batch_size, args.load_data)
+    print("=" * 60)
+    print(f"✅ Inserted {total_rows:,} rows in {elapsed:.2f}s ({total_rows / elapsed if elapsed else 0:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 """
 Database setup script for Society Maintenance App
-This script creates the MySQL database and tables
+This script creates the MySQL database and tables, or with DATABASE_BACKEND=sqlite
+the local SQLite database file
 """
 
-import pymysql
+import sqlite3
 import sys
 import os
 
+try:
+    import pymysql
+except ImportError:  # Not needed for DATABASE_BACKEND=sqlite
+    pymysql = None
+
 # Database configuration
 DB_USERNAME = 'root'
 DB_PASSWORD = 'root'  # Change this to your MySQL password
@@ -15,6 +21,10 @@ DB_HOST = 'localhost'
 DB_PORT = 3306
 DB_NAME = 'society_app'
 
+# SQLite deployment; must match the app's environment (a relative path lives in the instance folder)
+DATABASE_BACKEND = os.environ.get('DATABASE_BACKEND', 'mysql')
+SQLITE_PATH = os.environ.get('SQLITE_PATH', 'society.db')
+
 def create_database():
     """Create the MySQL database if it doesn't exist"""
     try:
@@ -68,14 +78,44 @@ def test_connection():
         print(f"❌ Error connecting to database: {e}")
         return False
 
+def sqlite_database_path():
+    if os.path.isabs(SQLITE_PATH):
+        return SQLITE_PATH
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', SQLITE_PATH)
+
+def create_sqlite_database():
+    """Create the SQLite database file in WAL mode; the app creates its tables on first start"""
+    path = sqlite_database_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        connection = sqlite3.connect(path)
+        journal_mode = connection.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        connection.close()
+        print(f"✅ SQLite {sqlite3.sqlite_version} database ready at {path} (journal mode: {journal_mode})")
+        return True
+    except (sqlite3.Error, OSError) as e:
+        print(f"❌ Error creating SQLite database: {e}")
+        return False
+
+def setup_sqlite():
+    print("🚀 Setting up SQLite database for Society Maintenance App")
+    print("=" * 60)
+    if not create_sqlite_database():
+        sys.exit(1)
+    print("=" * 60)
+    print("🎉 You can now run the Flask application:")
+    print("   DATABASE_BACKEND=sqlite python app.py")
+
 def main():
+    if DATABASE_BACKEND == 'sqlite':
+        setup_sqlite()
+        return
+    
     print("🚀 Setting up MySQL database for Society Maintenance App")
     print("=" * 60)
     
     # Check if PyMySQL is installed
-    try:
-        import pymysql
-    except ImportError:
+    if pymysql is None:
         print("❌ PyMySQL is not installed. Please install it first:")
         print("   pip install PyMySQL")
         sys.exit(1)
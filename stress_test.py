@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for Society Maintenance App
+Hammers the payment, expense and bulk API endpoints from many threads,
+replaying duplicate submissions with and without idempotency keys, then
+checks that the society fund still balances against the ledger
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+from benchmark import BENCH_PASSWORD, WSGIClient, response_json
+
+STARTING_FUND = 50_000.0
+MONTHLY_AMOUNT = 1000.0
+
+
+def seed_database(A, houses):
+    """Two pending months per house: the first is paid through the web form, the second through the bulk API"""
+    from werkzeug.security import generate_password_hash
+    db = A.db
+    db.create_all()
+    db.session.add(A.User(username='admin', password_hash=generate_password_hash(BENCH_PASSWORD),
+                          email='admin@society.test', is_admin=True))
+    db.session.add(A.Fund(total_amount=STARTING_FUND, last_updated=datetime.utcnow()))
+    house_rows = [A.House(house_number=f'S-{100 + i}', building_wing='Wing S', owner_name=f'Owner {i}',
+                          contact_number=f'97{i:08d}', number_of_occupants=2) for i in range(houses)]
+    db.session.add_all(house_rows)
+    db.session.flush()
+    for house in house_rows:
+        for month_year in ('2026-01', '2026-02'):
+            db.session.add(A.Maintenance(house_id=house.id, month_year=month_year, amount=MONTHLY_AMOUNT))
+    db.session.commit()
+    web_ids = [m.id for m in A.Maintenance.query.filter_by(month_year='2026-01').order_by(A.Maintenance.id)]
+    api_ids = [m.id for m in A.Maintenance.query.filter_by(month_year='2026-02').order_by(A.Maintenance.id)]
+    return web_ids, api_ids
+
+
+def build_tasks(web_ids, api_ids, expenses, bulk_batches, duplicates, rng):
+    """Every posting is sent `duplicates` times with one key; payments are also sent once without a key"""
+    tasks = []
+    for maintenance_id in web_ids:
+        key = uuid.uuid4().hex
+        tasks += [('pay', maintenance_id, key)] * duplicates + [('pay', maintenance_id, None)]
+    for _ in range(expenses):
+        key = uuid.uuid4().hex
+        amount = float(rng.randint(100, 5000))
+        tasks += [('expense', amount, key)] * duplicates
+    for batch_start in range(0, len(api_ids), 10):
+        key = uuid.uuid4().hex
+        batch = api_ids[batch_start:batch_start + 10]
+        tasks += [('bulk_pay', batch, key)] * duplicates + [('bulk_pay', batch, None)]
+    for _ in range(bulk_batches):
+        key = uuid.uuid4().hex
+        amounts = [float(rng.randint(50, 500)) for _ in range(5)]
+        tasks += [('bulk_expense', amounts, key)] * duplicates
+    rng.shuffle(tasks)
+    return tasks
+
+
+class StressClient:
+    """One logged-in admin per worker thread, over both the web forms and the API"""
+
+    def __init__(self, base_url):
+        self.client = WSGIClient(base_url)
+        self.client.post('/login', data={'username': 'admin', 'password': BENCH_PASSWORD, 'login_type': 'admin'})
+        # Restored before each request so unread flash messages do not pile up in the session cookie
+        self.cookies = self.client.session.cookies.copy()
+        token = response_json(self.client.post('/api/v1/auth/token', json={
+            'username': 'admin', 'password': BENCH_PASSWORD, 'login_type': 'admin'}))['token']
+        self.api_headers = {'Authorization': f'Bearer {token}'}
+
+    def run(self, task):
+        kind, payload, key = task
+        self.client.session.cookies = self.cookies.copy()
+        if kind == 'pay':
+            data = {'paid_amount': str(MONTHLY_AMOUNT), 'payment_method': 'Cash'}
+            if key:
+                data['idempotency_key'] = key
+            return self.client.post(f'/maintenance/mark_paid/{payload}', data=data)
+        if kind == 'expense':
+            return self.client.post('/expenses/add', data={
+                'category': 'Repairs', 'description': f'stress {key}', 'amount': str(payload),
+                'expense_date': date.today().isoformat(), 'idempotency_key': key})
+        headers = dict(self.api_headers, **({'Idempotency-Key': key} if key else {}))
+        if kind == 'bulk_pay':
+            return self.client.patch('/api/v1/maintenance/bulk', headers=headers, json={'items': [
+                {'id': maintenance_id, 'paid_amount': MONTHLY_AMOUNT} for maintenance_id in payload]})
+        return self.client.post('/api/v1/expenses/bulk', headers=headers, json={'items': [
+            {'category': 'Supplies', 'description': f'stress bulk {key} #{n}', 'amount': amount,
+             'expense_date': date.today().isoformat()} for n, amount in enumerate(payload)]})
+
+
+def run_tasks(base_url, tasks, threads):
+    local = threading.local()
+    outcomes = Counter()
+    lock = threading.Lock()
+
+    def worker(task):
+        if not hasattr(local, 'client'):
+            local.client = StressClient(base_url)
+        try:
+            response = local.client.run(task)
+            status = response.status_code
+            outcome = 'replayed' if response.headers.get('Idempotent-Replayed') else \
+                ('ok' if status < 400 else f'http {status}')
+        except Exception as e:
+            outcome = f'error {type(e).__name__}'
+        with lock:
+            outcomes[(task[0], outcome)] += 1
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, tasks))
+    return outcomes
+
+
+def check_invariants(A):
+    """Problems found in the final ledger; an empty list means the fund balances"""
+    problems = []
+    fund = A.Fund.get_fund().total_amount
+    credited = A.db.session.query(A.db.func.coalesce(A.db.func.sum(A.Maintenance.paid_amount), 0.0)) \
+        .filter(A.Maintenance.payment_status == 'Paid').scalar()
+    spent = A.db.session.query(A.db.func.coalesce(A.db.func.sum(A.Expense.amount), 0.0)).scalar()
+    expected = STARTING_FUND + credited - spent
+    print(f"💰 Fund ₹{fund:,.2f}; expected ₹{STARTING_FUND:,.2f} + ₹{credited:,.2f} collected - ₹{spent:,.2f} spent "
+          f"= ₹{expected:,.2f}")
+    if abs(fund - expected) > 0.005:
+        problems.append(f'fund is off by ₹{fund - expected:,.2f}')
+    if fund < 0:
+        problems.append('fund is overdrawn')
+
+    duplicated = A.db.session.query(A.Expense.description).group_by(A.Expense.description) \
+        .having(A.db.func.count() > 1).count()
+    if duplicated:
+        problems.append(f'{duplicated} expense(s) were recorded more than once for one idempotency key')
+    overpaid = A.Maintenance.query.filter(A.Maintenance.paid_amount > A.Maintenance.amount).count()
+    if overpaid:
+        problems.append(f'{overpaid} maintenance record(s) are overpaid')
+    unpaid = A.Maintenance.query.filter(A.Maintenance.payment_status != 'Paid').count()
+    if unpaid:
+        print(f"ℹ️  {unpaid} maintenance record(s) stayed unpaid (every submission for them failed)")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrency stress test for payments, expenses and bulk API writes')
+    parser.add_argument('--database-url', help='Disposable database URL (default: temporary SQLite file; '
+                                               'use MySQL to exercise SELECT ... FOR UPDATE)')
+    parser.add_argument('--houses', type=int, default=100, help='Houses to seed (two pending months each)')
+    parser.add_argument('--expenses', type=int, default=100, help='Expense form submissions (before duplicates)')
+    parser.add_argument('--bulk-batches', type=int, default=20, help='Bulk API expense batches of 5 (before duplicates)')
+    parser.add_argument('--duplicates', type=int, default=3, help='Times each keyed request is submitted')
+    parser.add_argument('--threads', type=int, default=16, help='Concurrent client threads')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for amounts and ordering')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='society-stress-')
+    os.environ['DATABASE_URL'] = args.database_url or f"sqlite:///{os.path.join(work_dir, 'stress.db')}"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import app as app_module
+    from werkzeug.serving import make_server
+
+    print("🚀 Society App Concurrency Stress Test")
+    print("=" * 60)
+    if not args.database_url:
+        print(f"🗄️  Using disposable SQLite database in {work_dir}")
+        print("ℹ️  SQLite has no row locks, so postings serialize on the database write lock; use MySQL to test FOR UPDATE")
+    with app_module.app.app_context():
+        web_ids, api_ids = seed_database(app_module, args.houses)
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    logging.getLogger('society.slow_queries').setLevel(logging.ERROR)  # Lock waits are expected here
+    http_server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+    threading.Thread(target=http_server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{http_server.server_port}'
+
+    tasks = build_tasks(web_ids, api_ids, args.expenses, args.bulk_batches, args.duplicates, random.Random(args.seed))
+    print(f"🔨 Sending {len(tasks):,} requests from {args.threads} threads...")
+    start = time.perf_counter()
+    outcomes = run_tasks(base_url, tasks, args.threads)
+    elapsed = time.perf_counter() - start
+    print(f"⏱️  {len(tasks) / elapsed:,.0f} requests/s over {elapsed:.1f}s")
+    for (kind, outcome), count in sorted(outcomes.items()):
+        print(f"   {kind:<14}{outcome:<24}{count:>6}")
+
+    print("-" * 60)
+    with app_module.app.app_context():
+        problems = check_invariants(app_module)
+    http_server.shutdown()
+    print("=" * 60)
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("✅ Fund balances and no posting was applied twice")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()